@@ -0,0 +1,3 @@
+"""
+Бенчмарки загрузки и запросов на синтетических данных в формате hh.ru.
+"""
\ No newline at end of file
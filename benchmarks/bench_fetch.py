@@ -0,0 +1,228 @@
+"""
+Сквозной бенчмарк загрузки данных без доступа к сети.
+
+Поднимает локальный MockHHServer и прогоняет через него fetch_and_save_data
+целиком: HeadHunterAPI (ограничитель частоты, параллельная загрузка),
+конвейер подготовки и запись в БД. С флагом --no-db измеряется только
+сетевая часть - обход страниц вакансий. С --client async те же замеры
+выполняются асинхронным клиентом AsyncHeadHunterAPI.
+
+Запуск:
+    python -m benchmarks.bench_fetch --employers 20 --vacancies 1000 --latency 0.05
+    python -m benchmarks.bench_fetch --client async --concurrency 200 --employers 500
+    python -m benchmarks.bench_fetch --profile ingest_profile.json --cprofile
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import List, Optional
+
+from benchmarks.mock_hh_server import MockHHServer
+from benchmarks.run_benchmarks import (
+    BenchmarkRecorder, git_commit, load_manager_class, print_table, quiet
+)
+from main import fetch_and_save_data
+from src.api import HeadHunterAPI
+from src.config import Config
+from src.pipeline import run_vacancy_pipeline_async
+from src.profiling import IngestProfiler
+from src.utils import prepare_employer_data
+
+
+def bench_pages(recorder: BenchmarkRecorder, api: HeadHunterAPI, employer_ids: List[int],
+                size: int, concurrent: bool):
+    """Замер обхода страниц вакансий без записи в БД."""
+    latencies = []
+    rows = 0
+    started = time.perf_counter()
+    last = started
+    with quiet():
+        for _, _, items in api.iter_vacancy_pages(employer_ids, concurrent=concurrent):
+            now = time.perf_counter()
+            latencies.append(now - last)
+            last = now
+            rows += len(items)
+    elapsed = time.perf_counter() - started
+    mode = 'concurrent' if concurrent else 'sequential'
+    recorder.record(f'iter_vacancy_pages[{mode}]', size, rows, latencies, elapsed)
+
+
+def bench_fetch_and_save(recorder: BenchmarkRecorder, db_manager, api: HeadHunterAPI,
+                         employer_ids: List[int], size: int, concurrent: bool,
+                         profiler: Optional[IngestProfiler] = None):
+    """Замер fetch_and_save_data на чистых таблицах (с профилем стадий, если задан profiler)."""
+    with quiet():
+        db_manager.drop_tables()
+        db_manager.create_tables()
+
+    started = time.perf_counter()
+    with quiet(), profiler or nullcontext():
+        fetch_and_save_data(db_manager, concurrent=concurrent, api=api, employer_ids=employer_ids)
+    elapsed = time.perf_counter() - started
+    if profiler is not None:
+        profiler.report()
+        profiler.write()
+    rows = db_manager.count_rows('vacancies')
+    mode = 'concurrent' if concurrent else 'sequential'
+    recorder.record(f'fetch_and_save_data[{mode}]', size, rows, [elapsed], elapsed)
+
+
+async def _fetch_and_save_async(db_manager, api, employer_ids: List[int]):
+    """Асинхронный аналог fetch_and_save_data."""
+    employers = await api.get_employers(employer_ids)
+    db_manager.bulk_insert_employers([prepare_employer_data(emp) for emp in employers])
+    await run_vacancy_pipeline_async(api, db_manager, [int(emp['id']) for emp in employers])
+    db_manager.refresh_statistics()
+
+
+def bench_async(recorder: BenchmarkRecorder, db_manager, base_url: str, employer_ids: List[int],
+                size: int, args: argparse.Namespace) -> dict:
+    """
+    Замер асинхронного клиента: обход страниц или загрузка в БД.
+
+    Returns:
+        dict: Статистика транспорта клиента
+    """
+    from src.async_api import AsyncHeadHunterAPI
+
+    async def pages() -> int:
+        rows = 0
+        async for _, _, items in api.iter_vacancy_pages(employer_ids):
+            rows += len(items)
+        return rows
+
+    async def run():
+        async with api:
+            if db_manager is None:
+                return await pages()
+            await _fetch_and_save_async(db_manager, api, employer_ids)
+            return db_manager.count_rows('vacancies')
+
+    api = AsyncHeadHunterAPI(max_concurrency=args.concurrency, requests_per_second=args.rps,
+                             base_url=base_url)
+    if db_manager is not None:
+        with quiet():
+            db_manager.drop_tables()
+            db_manager.create_tables()
+
+    started = time.perf_counter()
+    with quiet():
+        rows = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    operation = 'iter_vacancy_pages[async]' if db_manager is None else 'fetch_and_save_data[async]'
+    recorder.record(operation, size, rows, [elapsed], elapsed)
+    return api.transport_stats()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Сквозной бенчмарк загрузки через тестовый сервер hh.ru')
+    parser.add_argument('--employers', type=int, default=10, help='Количество работодателей')
+    parser.add_argument('--vacancies', type=int, default=500, help='Вакансий у каждого работодателя')
+    parser.add_argument('--latency', type=float, default=0.02, help='Задержка ответа сервера, с')
+    parser.add_argument('--jitter', type=float, default=0.01, help='Случайная добавка к задержке, с')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Доля ответов 503')
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help='Лимит сервера, запросов/с (сверх него - 429)')
+    parser.add_argument('--rps', type=float, default=50.0, help='Лимит частоты клиента, запросов/с')
+    parser.add_argument('--workers', type=int, default=8, help='Потоков загрузки у клиента')
+    parser.add_argument('--client', choices=('sync', 'async'), default='sync',
+                        help='Клиент API: HeadHunterAPI или AsyncHeadHunterAPI')
+    parser.add_argument('--concurrency', type=int, default=100,
+                        help='Запросов в работе у асинхронного клиента')
+    parser.add_argument('--sequential', action='store_true', help='Также замерить последовательную загрузку')
+    parser.add_argument('--manager', default='src.db_manager:PooledDBManager',
+                        help="Класс менеджера БД в виде 'module:Class'")
+    parser.add_argument('--db-name', default=None,
+                        help='Имя базы для бенчмарка (по умолчанию <DB_NAME>_bench)')
+    parser.add_argument('--no-db', action='store_true', help='Только загрузка страниц, без БД')
+    parser.add_argument('--output', default='bench_fetch.json', help='Файл для результатов JSON')
+    parser.add_argument('--profile', default=None, metavar='PATH',
+                        help='Профиль стадий параллельной загрузки в БД: трасса Chrome Trace в PATH')
+    parser.add_argument('--cprofile', action='store_true', help='С --profile: также профиль cProfile')
+    parser.add_argument('--tracemalloc', action='store_true', help='С --profile: также статистика памяти')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    recorder = BenchmarkRecorder()
+    size = args.employers * args.vacancies
+    modes = [True, False] if args.sequential else [True]
+
+    db_manager = None
+    if not args.no_db:
+        config = Config()
+        config.db_name = args.db_name or f'{config.db_name}_bench'
+        db_manager = load_manager_class(args.manager)(config)
+        with quiet():
+            db_manager.create_database()
+
+    server = MockHHServer(args.employers, args.vacancies, args.latency, args.jitter,
+                          args.error_rate, args.rate_limit)
+    transport = {}
+    with server:
+        print(f"▶ Тестовый сервер: {server.base_url}, вакансий: {size}")
+        if args.client == 'async':
+            transport['async'] = bench_async(recorder, db_manager, server.base_url,
+                                             server.employer_ids, size, args)
+            modes = []
+        for concurrent in modes:
+            api = HeadHunterAPI(max_workers=args.workers, requests_per_second=args.rps,
+                                base_url=server.base_url)
+            if db_manager is None:
+                bench_pages(recorder, api, server.employer_ids, size, concurrent)
+            else:
+                profiler = None
+                if args.profile and concurrent:
+                    profiler = IngestProfiler(args.profile, cprofile=args.cprofile,
+                                              trace_memory=args.tracemalloc)
+                bench_fetch_and_save(recorder, db_manager, api, server.employer_ids, size,
+                                     concurrent, profiler)
+            transport['concurrent' if concurrent else 'sequential'] = api.transport_stats()
+        server_stats = dict(server.stats)
+
+    if db_manager is not None:
+        db_manager.close()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'manager': None if args.no_db else args.manager,
+            'server': {
+                'employers': args.employers,
+                'vacancies_per_employer': args.vacancies,
+                'latency': args.latency,
+                'jitter': args.jitter,
+                'error_rate': args.error_rate,
+                'rate_limit': args.rate_limit,
+            },
+            'client': {'type': args.client, 'workers': args.workers,
+                       'concurrency': args.concurrency, 'requests_per_second': args.rps},
+            'server_stats': server_stats,
+            'transport': transport,
+        },
+        'results': recorder.results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    print()
+    print_table(recorder.results)
+    print(f"\nЗапросов к серверу: {server_stats['requests']}, ошибок 503: {server_stats['errors']}, "
+          f"ответов 429: {server_stats['throttled']}")
+    for mode, stats in transport.items():
+        print(f"Клиент [{mode}]: повторов {stats['retries']}, частота {stats['rate']} запросов/с, "
+              f"p95 попытки {stats['p95_ms']} мс")
+    print(f"\n✅ Результаты сохранены в {args.output}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
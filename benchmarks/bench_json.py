@@ -0,0 +1,130 @@
+"""
+Микробенчмарк разбора страниц /vacancies.
+
+Сравнивает построчную подготовку после json.loads (стандартный модуль
+и orjson) с типизированным декодированием msgspec сразу в колонки.
+Замеряется путь от байтов ответа до данных для записи в БД.
+
+Запуск:
+    python -m benchmarks.bench_json --size 100000 --output bench_json.json
+"""
+
+import argparse
+import json
+import platform
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.run_benchmarks import BenchmarkRecorder, git_commit, print_table
+from benchmarks.synthetic import generate_employers, iter_vacancy_pages
+from src import fast_json
+from src.utils import prepare_vacancy_data
+
+# Поля полного ответа hh.ru, которые не сохраняются в БД
+_EXTRA_FIELDS = {
+    'address': {'city': 'Москва', 'street': 'Льва Толстого', 'building': '16',
+                'lat': 55.733974, 'lng': 37.587093, 'metro_stations': []},
+    'contacts': None,
+    'professional_roles': [{'id': '96', 'name': 'Программист, разработчик'}],
+    'accept_temporary': False,
+    'working_days': [],
+    'working_time_intervals': [],
+    'working_time_modes': [],
+    'relations': [],
+    'url': 'https://api.hh.ru/vacancies/0?host=hh.ru',
+    'apply_alternate_url': 'https://hh.ru/applicant/vacancy_response?vacancyId=0',
+}
+
+
+def build_pages(size: int, employers: int) -> List[Tuple[Any, bytes]]:
+    """Сырые страницы синтетических вакансий с полным набором полей."""
+    pages = []
+    for page in iter_vacancy_pages(generate_employers(employers), size):
+        for item in page['items']:
+            item.update(_EXTRA_FIELDS)
+        pages.append((page['employer_id'], json.dumps(page, ensure_ascii=False).encode('utf-8')))
+    return pages
+
+
+def prepare_rows(decode: Callable[[bytes], Dict[str, Any]]) -> Callable[[bytes, Any], int]:
+    """Построчная подготовка после разбора ответа в словари."""
+    def run(raw: bytes, employer_id: Any) -> int:
+        items = decode(raw)['items']
+        for vacancy in items:
+            prepare_vacancy_data(vacancy, employer_id)
+        return len(items)
+    return run
+
+
+def typed_columns(raw: bytes, employer_id: Any) -> int:
+    """Типизированное декодирование сразу в колонки."""
+    return len(fast_json.decode_vacancy_columns(raw, employer_id)['id'])
+
+
+def bench_path(recorder: BenchmarkRecorder, name: str, func: Callable[[bytes, Any], int],
+               pages: List[Tuple[Any, bytes]], size: int, repeat: int):
+    """Замер одного способа разбора на всех страницах."""
+    best = None
+    for _ in range(repeat):
+        latencies = []
+        rows = 0
+        for employer_id, raw in pages:
+            started = time.perf_counter()
+            rows += func(raw, employer_id)
+            latencies.append(time.perf_counter() - started)
+        if best is None or sum(latencies) < sum(best[1]):
+            best = (rows, latencies)
+    recorder.record(name, size, best[0], best[1], sum(best[1]))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Микробенчмарк разбора JSON-ответов hh.ru')
+    parser.add_argument('--size', type=int, default=50000, help='Количество вакансий')
+    parser.add_argument('--employers', type=int, default=10, help='Количество работодателей')
+    parser.add_argument('--repeat', type=int, default=3, help='Повторы (берётся лучший)')
+    parser.add_argument('--output', default='bench_json.json', help='Файл для результатов JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    recorder = BenchmarkRecorder()
+    pages = build_pages(args.size, args.employers)
+    total_bytes = sum(len(raw) for _, raw in pages)
+    print(f"▶ Страниц: {len(pages)}, объём: {total_bytes / 1024 / 1024:.1f} МБ, "
+          f"декодер: {fast_json.BACKEND}")
+
+    paths = [('json.loads+prepare_vacancy_data', prepare_rows(json.loads))]
+    if fast_json.orjson is not None:
+        paths.append(('orjson.loads+prepare_vacancy_data', prepare_rows(fast_json.orjson.loads)))
+    if fast_json.msgspec is not None:
+        paths.append(('msgspec typed columns', typed_columns))
+    else:
+        print("ℹ️ msgspec не установлен: типизированный путь не замеряется")
+
+    for name, func in paths:
+        bench_path(recorder, name, func, pages, args.size, args.repeat)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'backend': fast_json.BACKEND,
+            'pages': len(pages),
+            'bytes': total_bytes,
+        },
+        'results': recorder.results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    print()
+    print_table(recorder.results)
+    print(f"\n✅ Результаты сохранены в {args.output}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+Локальный тестовый сервер, имитирующий API hh.ru.
+
+Отдаёт /employers/{id}, /employers?text=, /vacancies?employer_id=&page=&per_page=
+и справочник валют /dictionaries из синтетических данных. Успешные ответы содержат ETag,
+на условный запрос с тем же ETag отвечает 304. Позволяет настроить задержку, долю ошибок,
+ограничение частоты (ответы 429) и количество страниц, чтобы нагружать
+HeadHunterAPI без доступа к сети и без риска упереться в лимиты hh.ru.
+
+Запуск отдельным процессом:
+    python -m benchmarks.mock_hh_server --port 8080 --latency 0.05 --error-rate 0.02
+    HH_API_URL=http://127.0.0.1:8080/ python main.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import CURRENCY_DICTIONARY, generate_employers, generate_vacancy
+
+
+class _Throttle:
+    """Неблокирующий token bucket: решает, отвечать ли 429."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class MockHHServer:
+    """Тестовый HTTP-сервер с данными в формате hh.ru."""
+
+    def __init__(self, employers: int = 10, vacancies_per_employer: int = 500,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: Optional[float] = None, retry_after: int = 1,
+                 depth_limit: int = 2000, seed: int = 42,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Инициализация сервера.
+
+        Args:
+            employers: Количество работодателей
+            vacancies_per_employer: Количество вакансий у каждого работодателя
+            latency: Базовая задержка ответа в секундах
+            jitter: Случайная добавка к задержке (от 0 до jitter секунд)
+            error_rate: Доля ответов 503
+            rate_limit: Допустимое число запросов в секунду (сверх него - 429)
+            retry_after: Значение заголовка Retry-After для ответов 429
+            depth_limit: Максимум вакансий, доступных через пагинацию (как у hh.ru)
+            seed: Зерно генератора данных
+            host: Адрес для прослушивания
+            port: Порт (0 - выбрать свободный)
+        """
+        self.employers = {emp['id']: emp for emp in generate_employers(employers, seed)}
+        self._ordinal = {emp_id: idx for idx, emp_id in enumerate(self.employers)}
+        for emp in self.employers.values():
+            emp['open_vacancies'] = vacancies_per_employer
+        self.vacancies_per_employer = vacancies_per_employer
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.depth_limit = depth_limit
+        self.seed = seed
+        self._throttle = _Throttle(rate_limit) if rate_limit else None
+        self._random = random.Random(seed)
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0, 'not_found': 0,
+                      'not_modified': 0}
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Адрес сервера для HeadHunterAPI(base_url=...)."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    @property
+    def employer_ids(self) -> List[int]:
+        """ID работодателей, известных серверу."""
+        return [int(emp_id) for emp_id in self.employers]
+
+    def start(self) -> 'MockHHServer':
+        """Запуск сервера в фоновом потоке."""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='mock-hh', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Остановка сервера."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockHHServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _vacancy_page(self, employer: Dict[str, Any], page: int, per_page: int) -> Dict[str, Any]:
+        """Детерминированная генерация страницы вакансий работодателя."""
+        found = self.vacancies_per_employer
+        available = min(found, self.depth_limit)
+        pages = (available + per_page - 1) // per_page
+        start_index = page * per_page
+        count = max(0, min(per_page, available - start_index))
+
+        # Одинаковые параметры всегда дают одинаковые вакансии
+        rng = random.Random(f'{self.seed}:{employer["id"]}:{page}:{per_page}')
+        # ID вакансий не пересекаются между работодателями и помещаются в INTEGER
+        base_id = 10_000_000 + self._ordinal[employer['id']] * available
+        origin = datetime(2024, 1, 1, 9, 0, 0)
+        items = [
+            generate_vacancy(base_id + start_index + idx, employer, rng,
+                             origin + timedelta(minutes=rng.randint(0, 60 * 24 * 90)))
+            for idx in range(count)
+        ]
+        return {
+            'items': items,
+            'found': found,
+            'pages': pages,
+            'page': page,
+            'per_page': per_page,
+        }
+
+    def _route(self, path: str, query: Dict[str, List[str]]) -> Tuple[int, Dict[str, Any]]:
+        """Выбор ответа по пути и параметрам запроса."""
+        def param(name: str, default: str) -> str:
+            return query.get(name, [default])[0]
+
+        if path.startswith('/employers/'):
+            employer = self.employers.get(path.rsplit('/', 1)[-1])
+            if employer is None:
+                return 404, {'errors': [{'type': 'not_found'}]}
+            return 200, employer
+
+        if path == '/employers':
+            text = param('text', '').lower()
+            per_page = int(param('per_page', '20'))
+            items = [emp for emp in self.employers.values() if text in emp['name'].lower()]
+            return 200, {'items': items[:per_page], 'found': len(items), 'pages': 1,
+                         'page': 0, 'per_page': per_page}
+
+        if path == '/vacancies':
+            employer = self.employers.get(param('employer_id', ''))
+            page = int(param('page', '0'))
+            per_page = min(int(param('per_page', '20')), 100)
+            if employer is None:
+                return 200, {'items': [], 'found': 0, 'pages': 0, 'page': page, 'per_page': per_page}
+            if page * per_page >= self.depth_limit:
+                return 400, {'errors': [{'type': 'bad_argument', 'value': 'page'}]}
+            return 200, self._vacancy_page(employer, page, per_page)
+
+        if path == '/dictionaries':
+            return 200, {'currency': CURRENCY_DICTIONARY}
+
+        if path == '/':
+            return 200, {'hh': {'version': 'mock'}}
+
+        return 404, {'errors': [{'type': 'not_found'}]}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Dict[str, Any], headers: Dict[str, str] = None):
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                if status == 200:
+                    etag = f'"{hashlib.md5(payload).hexdigest()}"'
+                    if self.headers.get('If-None-Match') == etag:
+                        server._count('not_modified')
+                        status, payload = 304, b''
+                    headers = dict(headers or {}, ETag=etag)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                server._count('requests')
+
+                delay = server.latency + (server._random.uniform(0, server.jitter) if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+
+                if server._throttle is not None and not server._throttle.allow():
+                    server._count('throttled')
+                    self._reply(429, {'errors': [{'type': 'too_many_requests'}]},
+                                {'Retry-After': str(server.retry_after)})
+                    return
+
+                if server.error_rate and server._random.random() < server.error_rate:
+                    server._count('errors')
+                    self._reply(503, {'errors': [{'type': 'service_unavailable'}]})
+                    return
+
+                url = urlparse(self.path)
+                status, body = server._route(url.path, parse_qs(url.query))
+                if status == 404:
+                    server._count('not_found')
+                self._reply(status, body)
+
+            def do_POST(self):
+                # Тело не используется: POST обрабатывается как GET (для проверки повторов)
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                self.do_GET()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Локальный тестовый сервер API hh.ru')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--employers', type=int, default=10)
+    parser.add_argument('--vacancies', type=int, default=500, help='Вакансий у каждого работодателя')
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=None)
+    args = parser.parse_args()
+
+    server = MockHHServer(args.employers, args.vacancies, args.latency, args.jitter,
+                          args.error_rate, args.rate_limit, host=args.host, port=args.port)
+    print(f"Тестовый сервер hh.ru: {server.base_url}")
+    print(f"ID работодателей: {', '.join(map(str, server.employer_ids))}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
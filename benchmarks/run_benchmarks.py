@@ -0,0 +1,458 @@
+"""
+Бенчмарки загрузки и запросов на синтетических данных hh.ru.
+
+Данные проходят через те же функции utils и методы DBManager, что и при
+реальной загрузке. Результаты (пропускная способность, задержки p50/p95/p99,
+пиковый RSS) сохраняются в JSON, который удобно сравнивать между версиями.
+
+Запуск:
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 100000 --output bench.json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import generate_employers, iter_vacancy_pages
+from src import export
+from src.config import Config
+from src.models import Vacancy
+from src.normalize import normalize_pages
+from src.utils import prepare_employer_data, prepare_vacancy_data
+
+INGEST_METHODS = ('insert_vacancies', 'execute_values', 'copy')
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Перцентиль с линейной интерполяцией.
+
+    Args:
+        values: Значения
+        q: Уровень от 0 до 100
+
+    Returns:
+        float: Значение перцентиля (0, если значений нет)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_mb() -> float:
+    """
+    Пиковый RSS процесса в мегабайтах.
+
+    Returns:
+        float: Максимальный объём резидентной памяти с момента запуска
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux возвращает килобайты, macOS - байты
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+@contextmanager
+def quiet():
+    """Подавление вывода print внутри измеряемых операций."""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        yield
+
+
+class BenchmarkRecorder:
+    """Накопитель результатов измерений."""
+
+    def __init__(self):
+        self.results: List[Dict[str, Any]] = []
+
+    def record(self, operation: str, size: int, rows: int,
+               latencies: List[float], seconds: float):
+        """
+        Сохранение результата операции.
+
+        Args:
+            operation: Название операции
+            size: Размер набора данных (количество вакансий)
+            rows: Количество обработанных строк
+            latencies: Длительности отдельных вызовов в секундах
+            seconds: Общее время операции
+        """
+        self.results.append({
+            'operation': operation,
+            'size': size,
+            'calls': len(latencies),
+            'rows': rows,
+            'seconds': round(seconds, 4),
+            'rows_per_second': round(rows / seconds, 1) if seconds else 0.0,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'peak_rss_mb': peak_rss_mb(),
+        })
+
+    def measure(self, operation: str, size: int, func: Callable[[], int], repeat: int):
+        """
+        Многократный вызов функции с замером каждого вызова.
+
+        Args:
+            operation: Название операции
+            size: Размер набора данных
+            func: Функция, возвращающая количество обработанных строк
+            repeat: Количество вызовов
+        """
+        latencies = []
+        rows = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            with quiet():
+                rows += func()
+            latencies.append(time.perf_counter() - started)
+        self.record(operation, size, rows, latencies, sum(latencies))
+
+
+def load_manager_class(path: str):
+    """
+    Загрузка класса менеджера БД по пути вида 'module:Class'.
+
+    Args:
+        path: Путь к классу
+
+    Returns:
+        type: Класс менеджера базы данных
+    """
+    module_name, _, class_name = path.partition(':')
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def bench_prepare(recorder: BenchmarkRecorder, size: int, employers_count: int,
+                  processes: int = 2):
+    """Замер подготовки данных работодателей и вакансий."""
+    employers = generate_employers(employers_count)
+
+    latencies = []
+    for employer in employers:
+        started = time.perf_counter()
+        prepare_employer_data(employer)
+        latencies.append(time.perf_counter() - started)
+    recorder.record('prepare_employer_data', size, len(employers), latencies, sum(latencies))
+
+    latencies = []
+    rows = 0
+    for page in iter_vacancy_pages(employers, size):
+        started = time.perf_counter()
+        for vacancy in page['items']:
+            prepare_vacancy_data(vacancy, page['employer_id'])
+        latencies.append(time.perf_counter() - started)
+        rows += len(page['items'])
+    recorder.record('prepare_vacancy_data', size, rows, latencies, sum(latencies))
+
+    # Разбор JSON входит в замер: построчная подготовка против пакетной
+    raw_pages = [(page['employer_id'], page['page'], json.dumps(page).encode('utf-8'))
+                 for page in iter_vacancy_pages(employers, size)]
+
+    latencies = []
+    for emp_id, _, raw in raw_pages:
+        started = time.perf_counter()
+        for vacancy in json.loads(raw)['items']:
+            prepare_vacancy_data(vacancy, emp_id)
+        latencies.append(time.perf_counter() - started)
+    recorder.record('json+prepare_vacancy_data', size, rows, latencies, sum(latencies))
+
+    for workers in sorted({0, processes}):
+        started = time.perf_counter()
+        normalized = sum(len(columns['id']) for _, _, columns in normalize_pages(raw_pages, workers))
+        elapsed = time.perf_counter() - started
+        recorder.record(f'normalize_pages[processes={workers}]', size, normalized,
+                        [elapsed], elapsed)
+
+
+def allocated_bytes(build: Callable[[], Any]) -> int:
+    """
+    Объём памяти, выделенной при построении объекта и удерживаемой им.
+
+    Args:
+        build: Функция, строящая объект
+
+    Returns:
+        int: Количество байт
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+        del result
+        return allocated
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(size: int, employers_count: int, row_limit: int) -> Dict[str, Any]:
+    """
+    Память на строку: подготовленные записи против словарей.
+
+    Значения полей общие для обоих вариантов, поэтому разница
+    показывает накладные расходы контейнера строки.
+
+    Returns:
+        Dict[str, Any]: Байт на строку по вариантам
+    """
+    employers = generate_employers(employers_count)
+    items = [(vacancy, page['employer_id'])
+             for page in iter_vacancy_pages(employers, min(size, row_limit))
+             for vacancy in page['items']]
+    records = [prepare_vacancy_data(vacancy, emp_id) for vacancy, emp_id in items]
+    employer_records = [prepare_employer_data(emp) for emp in employers]
+
+    def per_row(build: Callable[[], Any], count: int) -> float:
+        return round(allocated_bytes(build) / count, 1) if count else 0.0
+
+    return {
+        'rows': len(records),
+        'vacancy_dict': per_row(lambda: [vac._asdict() for vac in records], len(records)),
+        'vacancy_record': per_row(lambda: [prepare_vacancy_data(vacancy, emp_id)
+                                           for vacancy, emp_id in items], len(records)),
+        'employer_dict': per_row(lambda: [emp._asdict() for emp in employer_records],
+                                 len(employer_records)),
+        'employer_record': per_row(lambda: [prepare_employer_data(emp) for emp in employers],
+                                   len(employer_records)),
+    }
+
+
+def bench_ingest(recorder: BenchmarkRecorder, db_manager, size: int, employers_count: int,
+                 method: str, batch_size: int, row_limit: int):
+    """
+    Замер загрузки вакансий одним из способов на чистые таблицы.
+
+    Генерация и подготовка данных не входят в замер - учитывается
+    только время вызова метода DBManager на каждый пакет.
+    """
+    with quiet():
+        db_manager.drop_tables()
+        db_manager.create_tables()
+
+    employers = generate_employers(employers_count)
+    prepared_employers = [prepare_employer_data(emp) for emp in employers]
+    started = time.perf_counter()
+    with quiet():
+        db_manager.bulk_insert_employers(prepared_employers)
+    elapsed = time.perf_counter() - started
+    recorder.record(f'ingest_employers[{method}]', size, len(employers), [elapsed], elapsed)
+
+    limit = min(size, row_limit) if method == 'insert_vacancies' else size
+
+    def flush(batch: List[Vacancy]) -> float:
+        started = time.perf_counter()
+        with quiet():
+            if method == 'insert_vacancies':
+                db_manager.insert_vacancies(batch)
+            else:
+                db_manager.bulk_insert_vacancies(batch, use_copy=(method == 'copy'))
+        return time.perf_counter() - started
+
+    latencies = []
+    batch: List[Vacancy] = []
+    rows = 0
+    for page in iter_vacancy_pages(employers, limit):
+        batch.extend(prepare_vacancy_data(vac, page['employer_id']) for vac in page['items'])
+        if len(batch) >= batch_size:
+            latencies.append(flush(batch))
+            rows += len(batch)
+            batch = []
+    if batch:
+        latencies.append(flush(batch))
+        rows += len(batch)
+
+    recorder.record(f'ingest[{method}]', size, rows, latencies, sum(latencies))
+
+
+def bench_queries(recorder: BenchmarkRecorder, db_manager, size: int, repeat: int):
+    """Замер методов чтения DBManager на загруженных данных."""
+    recorder.measure('refresh_statistics', size, lambda: db_manager.refresh_statistics() or 0, 1)
+
+    heavy = max(1, min(repeat, 3))
+
+    def first_pages() -> int:
+        rows = 0
+        key = None
+        for _ in range(10):
+            page, key = db_manager.get_vacancies_page(key, limit=100)
+            rows += len(page)
+            if key is None:
+                break
+        return rows
+
+    queries = [
+        ('get_companies_and_vacancies_count', lambda: len(db_manager.get_companies_and_vacancies_count()), repeat),
+        ('get_avg_salary', lambda: 1 if db_manager.get_avg_salary() is not None else 0, repeat),
+        ('get_vacancies_with_keyword', lambda: len(db_manager.get_vacancies_with_keyword('python')), repeat),
+        ('search_vacancies', lambda: len(db_manager.search_vacancies('разработчик python')), repeat),
+        ('get_vacancies_page[10 pages]', first_pages, repeat),
+        ('get_salary_percentiles', lambda: len(db_manager.get_salary_percentiles()), repeat),
+        ('get_salary_histogram', lambda: sum(db_manager.get_salary_histogram().counts), repeat),
+        ('get_employer_salary_stats', lambda: len(db_manager.get_employer_salary_stats()), repeat),
+        ('get_top_salaries', lambda: len(db_manager.get_top_salaries()), repeat),
+        ('get_vacancies_with_higher_salary', lambda: len(db_manager.get_vacancies_with_higher_salary()), heavy),
+        ('get_all_vacancies', lambda: len(db_manager.get_all_vacancies()), heavy),
+        ('iter_all_vacancies', lambda: sum(1 for _ in db_manager.iter_all_vacancies()), heavy),
+    ]
+    for name, func, times in queries:
+        recorder.measure(name, size, func, times)
+
+
+def bench_export(recorder: BenchmarkRecorder, db_manager, size: int):
+    """Замер выгрузки снимка в Parquet/Arrow и его загрузки обратно через COPY."""
+    if export.pyarrow is None:
+        print("ℹ️ pyarrow не установлен: выгрузка в Parquet/Arrow не замеряется")
+        return
+
+    directory = tempfile.mkdtemp(prefix='hh_export_')
+    try:
+        for fmt in export.FORMATS:
+            with quiet():
+                exported = export.export_table(db_manager, 'vacancies', directory, fmt,
+                                               fetch_date=fmt)
+            recorder.record(f'export[{fmt}]', size, exported['rows'],
+                            [exported['seconds']], exported['seconds'])
+            print(f"  {fmt}: {exported['bytes'] / max(exported['rows'], 1):.1f} байт на вакансию")
+
+            with quiet():
+                imported = export.import_table(db_manager, 'vacancies', directory, fmt)
+            recorder.record(f'import[{fmt}]', size, imported['rows'],
+                            [imported['seconds']], imported['seconds'])
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def git_commit() -> Optional[str]:
+    """Короткий хэш текущего коммита (если доступен)."""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results: List[Dict[str, Any]]):
+    """Вывод результатов таблицей."""
+    header = f"{'операция':<38}{'размер':>9}{'строк/с':>13}{'p50 мс':>11}{'p95 мс':>11}{'p99 мс':>11}{'RSS МБ':>9}"
+    print(header)
+    print('-' * len(header))
+    for item in results:
+        print(f"{item['operation']:<38}{item['size']:>9}{item['rows_per_second']:>13}"
+              f"{item['p50_ms']:>11}{item['p95_ms']:>11}{item['p99_ms']:>11}{item['peak_rss_mb']:>9}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Бенчмарки загрузки и запросов DBManager')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help='Количество вакансий в наборах данных')
+    parser.add_argument('--employers', type=int, default=10, help='Количество работодателей')
+    parser.add_argument('--methods', nargs='+', default=list(INGEST_METHODS),
+                        choices=INGEST_METHODS, help='Способы загрузки вакансий')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Размер пакета записи')
+    parser.add_argument('--row-limit', type=int, default=20000,
+                        help='Максимум вакансий для insert_vacancies')
+    parser.add_argument('--repeat', type=int, default=20, help='Повторы каждого запроса')
+    parser.add_argument('--processes', type=int, default=2,
+                        help='Процессов для замера пакетной нормализации')
+    parser.add_argument('--manager', default='src.db_manager:DBManager',
+                        help="Класс менеджера БД в виде 'module:Class'")
+    parser.add_argument('--db-name', default=None,
+                        help='Имя базы для бенчмарка (по умолчанию <DB_NAME>_bench)')
+    parser.add_argument('--no-db', action='store_true', help='Только подготовка данных, без БД')
+    parser.add_argument('--no-prepare', action='store_true',
+                        help='Выполнять запросы без подготовки на сервере')
+    parser.add_argument('--metrics', default=None,
+                        help='Файл для гистограмм запросов (.json - JSON, иначе формат Prometheus)')
+    parser.add_argument('--output', default='bench_results.json', help='Файл для результатов JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    recorder = BenchmarkRecorder()
+
+    db_manager = None
+    if not args.no_db:
+        config = Config()
+        config.db_name = args.db_name or f'{config.db_name}_bench'
+        config.db_prepare_statements = not args.no_prepare
+        db_manager = load_manager_class(args.manager)(config)
+        with quiet():
+            db_manager.create_database()
+
+    # Загрузка COPY выполняется последней, чтобы запросы шли по полному набору
+    methods = [m for m in INGEST_METHODS if m in args.methods]
+    memory: Dict[int, Dict[str, Any]] = {}
+
+    for size in args.sizes:
+        print(f"▶ Набор данных: {size} вакансий")
+        bench_prepare(recorder, size, args.employers, args.processes)
+        memory[size] = bench_memory(size, args.employers, args.row_limit)
+
+        if db_manager is None:
+            continue
+
+        for method in methods:
+            bench_ingest(recorder, db_manager, size, args.employers, method,
+                         args.batch_size, args.row_limit)
+
+        with quiet():
+            db_manager.execute_query('ANALYZE')
+        bench_queries(recorder, db_manager, size, args.repeat)
+        bench_export(recorder, db_manager, size)
+
+    if db_manager is not None:
+        db_manager.close()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'manager': None if args.no_db else args.manager,
+            'backend': None if db_manager is None else db_manager.BACKEND,
+            'sizes': args.sizes,
+            'employers': args.employers,
+            'batch_size': args.batch_size,
+            'prepare_statements': None if db_manager is None else db_manager.statements.prepare,
+        },
+        'results': recorder.results,
+        'statements': {} if db_manager is None else db_manager.statement_stats(),
+        'queries': {} if db_manager is None else db_manager.metrics.to_dict(),
+        'memory_per_row': memory,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+    if args.metrics and db_manager is not None:
+        db_manager.metrics.write(args.metrics)
+
+    print()
+    print_table(recorder.results)
+    print()
+    for size, item in memory.items():
+        print(f"Память на строку [{size}]: вакансия {item['vacancy_dict']} → {item['vacancy_record']} байт, "
+              f"работодатель {item['employer_dict']} → {item['employer_record']} байт (dict → запись)")
+    print(f"\n✅ Результаты сохранены в {args.output}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Генератор синтетических данных в формате ответов API hh.ru.
+Работодатели и вакансии повторяют структуру /employers/{id} и /vacancies,
+поэтому проходят через те же функции подготовки данных, что и реальные.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List
+
+_POSITIONS = [
+    'Python-разработчик', 'Java-разработчик', 'Аналитик данных', 'DevOps-инженер',
+    'Тестировщик', 'Frontend-разработчик', 'Системный администратор',
+    'Руководитель проекта', 'Бизнес-аналитик', 'Data Scientist',
+    'Специалист поддержки', 'Менеджер по продажам', 'Дизайнер интерфейсов',
+]
+_LEVELS = ['Младший', 'Ведущий', 'Старший', 'Главный', '']
+_DUTIES = [
+    'Разработка и поддержка <highlighttext>сервисов</highlighttext>',
+    'Проектирование архитектуры и ревью кода',
+    'Анализ требований и подготовка отчётов',
+    'Автоматизация процессов и настройка CI/CD',
+    'Работа с базами данных PostgreSQL и очередями сообщений',
+    'Общение с клиентами и сопровождение сделок',
+]
+_CURRENCIES = ['RUR'] * 16 + ['USD', 'EUR', 'KZT']
+
+# Справочник валют в формате /dictionaries: единиц валюты в одном рубле
+CURRENCY_DICTIONARY = [
+    {'code': 'RUR', 'abbr': '₽', 'name': 'Рубли', 'default': True, 'rate': 1.0, 'in_use': True},
+    {'code': 'USD', 'abbr': '$', 'name': 'Доллары', 'default': False, 'rate': 0.0112, 'in_use': True},
+    {'code': 'EUR', 'abbr': '€', 'name': 'Евро', 'default': False, 'rate': 0.0104, 'in_use': True},
+    {'code': 'KZT', 'abbr': '₸', 'name': 'Тенге', 'default': False, 'rate': 5.61, 'in_use': True},
+]
+_CURRENCY_RATES = {item['code']: item['rate'] for item in CURRENCY_DICTIONARY}
+
+
+def generate_employers(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Генерация работодателей в формате /employers/{id}.
+
+    Args:
+        count: Количество работодателей
+        seed: Зерно генератора случайных чисел
+
+    Returns:
+        List[Dict[str, Any]]: Данные работодателей
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            'id': str(100000 + idx),
+            'name': f'Компания {idx}',
+            'type': 'company',
+            'description': f'<p>Описание компании {idx}</p>',
+            'site_url': f'https://company{idx}.example.ru',
+            'alternate_url': f'https://hh.ru/employer/{100000 + idx}',
+            'open_vacancies': rng.randint(10, 5000),
+            'area': {'id': '1', 'name': 'Москва'},
+        }
+        for idx in range(count)
+    ]
+
+
+def generate_vacancy(vacancy_id: int, employer: Dict[str, Any], rng: random.Random,
+                     published: datetime) -> Dict[str, Any]:
+    """
+    Генерация одной вакансии в формате элемента items из /vacancies.
+
+    Args:
+        vacancy_id: ID вакансии
+        employer: Данные работодателя
+        rng: Генератор случайных чисел
+        published: Дата публикации
+
+    Returns:
+        Dict[str, Any]: Данные вакансии
+    """
+    salary = None
+    if rng.random() < 0.6:
+        base = rng.randrange(30000, 500000, 5000)
+        salary_from = base if rng.random() < 0.8 else None
+        salary_to = base + rng.randrange(0, 150000, 5000) if rng.random() < 0.6 else None
+        if salary_from is None and salary_to is None:
+            salary_from = base
+        salary = {
+            'from': salary_from,
+            'to': salary_to,
+            'currency': rng.choice(_CURRENCIES),
+            'gross': rng.random() < 0.5,
+        }
+        # Суммы в валюте соответствуют рублёвым по курсу справочника
+        rate = _CURRENCY_RATES[salary['currency']]
+        if rate != 1.0:
+            for bound in ('from', 'to'):
+                if salary[bound] is not None:
+                    salary[bound] = max(1, int(round(salary[bound] * rate, -1)))
+
+    name = f'{rng.choice(_LEVELS)} {rng.choice(_POSITIONS)}'.strip()
+    return {
+        'id': str(vacancy_id),
+        'premium': False,
+        'name': name,
+        'department': None,
+        'has_test': False,
+        'area': {'id': '1', 'name': 'Москва'},
+        'salary': salary,
+        'type': {'id': 'open', 'name': 'Открытая'},
+        'published_at': published.strftime('%Y-%m-%dT%H:%M:%S+0300'),
+        'created_at': published.strftime('%Y-%m-%dT%H:%M:%S+0300'),
+        'archived': False,
+        'alternate_url': f'https://hh.ru/vacancy/{vacancy_id}',
+        'employer': {
+            'id': employer['id'],
+            'name': employer['name'],
+            'alternate_url': employer['alternate_url'],
+        },
+        'snippet': {
+            'requirement': 'Опыт работы от 3 лет. Знание <highlighttext>SQL</highlighttext>.',
+            'responsibility': rng.choice(_DUTIES),
+        },
+        'schedule': {'id': 'fullDay', 'name': 'Полный день'},
+        'experience': {'id': 'between3And6', 'name': 'От 3 до 6 лет'},
+        'employment': {'id': 'full', 'name': 'Полная занятость'},
+    }
+
+
+def iter_vacancy_pages(employers: List[Dict[str, Any]], total: int, per_page: int = 100,
+                       seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """
+    Генерация страниц /vacancies для работодателей.
+
+    Вакансии распределяются между работодателями равномерно, страницы
+    создаются лениво, поэтому можно генерировать миллионы вакансий.
+
+    Args:
+        employers: Данные работодателей
+        total: Общее количество вакансий
+        per_page: Количество вакансий на странице
+        seed: Зерно генератора случайных чисел
+
+    Yields:
+        Dict[str, Any]: Страница ответа (items, found, pages, page, per_page)
+            с дополнительным полем employer_id
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    vacancy_id = 10_000_000
+
+    for idx, employer in enumerate(employers):
+        count = total // len(employers) + (1 if idx < total % len(employers) else 0)
+        pages = max(1, (count + per_page - 1) // per_page)
+
+        for page in range(pages):
+            size = min(per_page, count - page * per_page)
+            items = []
+            for _ in range(size):
+                vacancy_id += 1
+                published = start + timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+                items.append(generate_vacancy(vacancy_id, employer, rng, published))
+
+            yield {
+                'employer_id': employer['id'],
+                'items': items,
+                'found': count,
+                'pages': pages,
+                'page': page,
+                'per_page': per_page,
+            }
\ No newline at end of file
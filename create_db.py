@@ -3,7 +3,7 @@
 Можно запускать отдельно от основной программы.
 """
 
-from src.db_manager import DBManager
+from src.db_manager import create_db_manager
 from src.config import Config
 
 
@@ -14,7 +14,7 @@ def init_database():
     print("=" * 60)
 
     config = Config()
-    db_manager = DBManager(config)
+    db_manager = create_db_manager(config)
 
     # Создаем базу данных
     print(f"\n1. Проверка базы данных '{config.db_name}'...")
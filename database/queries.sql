@@ -1,5 +1,8 @@
 -- Примеры SQL запросов для анализа данных
 
+-- Зарплаты сравниваются по колонке salary_rub (в рублях на руки): колонка salary
+-- хранит среднее вилки в валюте вакансии и до вычета налогов, если так указано
+
 -- 1. Компании и количество вакансий
 SELECT
     e.name AS "Компания",
@@ -13,42 +16,56 @@ ORDER BY COUNT(v.id) DESC;
 SELECT
     e.name AS "Компания",
     v.name AS "Вакансия",
-    v.salary AS "Зарплата",
+    v.salary_rub AS "Зарплата, руб.",
     v.url AS "Ссылка"
 FROM vacancies v
 JOIN employers e ON v.employer_id = e.id
-ORDER BY v.salary DESC NULLS LAST;
+ORDER BY v.salary_rub DESC NULLS LAST;
 
 -- 3. Средняя зарплата по вакансиям
 SELECT
-    ROUND(AVG(salary), 2) AS "Средняя зарплата"
+    ROUND(AVG(salary_rub), 2) AS "Средняя зарплата, руб."
 FROM vacancies
-WHERE salary IS NOT NULL;
+WHERE salary_rub IS NOT NULL;
 
 -- 4. Вакансии с зарплатой выше средней
 WITH avg_salary AS (
-    SELECT AVG(salary) as avg_sal
+    SELECT AVG(salary_rub) as avg_sal
     FROM vacancies
-    WHERE salary IS NOT NULL
+    WHERE salary_rub IS NOT NULL
 )
 SELECT
     e.name AS "Компания",
     v.name AS "Вакансия",
-    v.salary AS "Зарплата",
+    v.salary_rub AS "Зарплата, руб.",
     v.url AS "Ссылка"
 FROM vacancies v
 JOIN employers e ON v.employer_id = e.id
 CROSS JOIN avg_salary
-WHERE v.salary > avg_salary.avg_sal
-ORDER BY v.salary DESC;
+WHERE v.salary_rub > avg_salary.avg_sal
+ORDER BY v.salary_rub DESC;
 
 -- 5. Поиск вакансий по ключевому слову
 SELECT
     e.name AS "Компания",
     v.name AS "Вакансия",
-    v.salary AS "Зарплата",
+    v.salary_rub AS "Зарплата, руб.",
     v.url AS "Ссылка"
 FROM vacancies v
 JOIN employers e ON v.employer_id = e.id
 WHERE LOWER(v.name) LIKE '%python%'
-ORDER BY v.salary DESC;
\ No newline at end of file
+ORDER BY v.salary_rub DESC NULLS LAST;
+
+-- 6. Полнотекстовый поиск по названию и описанию (индекс idx_vacancies_search)
+SELECT
+    e.name AS "Компания",
+    v.name AS "Вакансия",
+    v.salary_rub AS "Зарплата, руб.",
+    v.url AS "Ссылка",
+    ts_rank_cd(v.search_vector, q) AS "Релевантность"
+FROM vacancies v
+JOIN employers e ON v.employer_id = e.id
+CROSS JOIN websearch_to_tsquery('russian', 'python "ведущий разработчик"') q
+WHERE v.search_vector @@ q
+ORDER BY ts_rank_cd(v.search_vector, q) DESC
+LIMIT 20 OFFSET 0;
\ No newline at end of file
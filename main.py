@@ -3,13 +3,18 @@
 Точка входа для взаимодействия с пользователем.
 """
 
+import argparse
 import sys
+from typing import List, Optional, Sequence
 from src.api import HeadHunterAPI
-from src.db_manager import DBManager
+from src.db_manager import create_db_manager
+from src.http_cache import ResponseCache
 from src.config import Config
+from src.currency import refresh_rates
+from src.pipeline import run_checkpointed_pipeline, run_incremental_sync
+from src.profiling import IngestProfiler, span
 from src.utils import (
     prepare_employer_data,
-    prepare_vacancy_data,
     EMPLOYER_IDS
 )
 
@@ -26,7 +31,7 @@ def setup_database():
     print("=" * 50)
 
     config = Config()
-    db_manager = DBManager(config)
+    db_manager = create_db_manager(config)
 
     # Проверяем существование базы данных
     if not db_manager.database_exists():
@@ -49,7 +54,7 @@ def reset_database():
     print("=" * 50)
 
     config = Config()
-    db_manager = DBManager(config)
+    db_manager = create_db_manager(config)
 
     # Спрашиваем подтверждение
     response = input(f"Вы уверены, что хотите удалить базу данных {config.db_name}? (да/нет): ")
@@ -67,47 +72,110 @@ def reset_database():
     return db_manager
 
 
-def fetch_and_save_data(db_manager):
-    """Получение данных с API и сохранение в БД."""
+def fetch_and_save_data(db_manager, concurrent: bool = True, incremental: bool = False,
+                        api: HeadHunterAPI = None, employer_ids: List[int] = None,
+                        profiler: Optional[IngestProfiler] = None):
+    """
+    Получение данных с API и сохранение в БД.
+
+    Args:
+        db_manager: Менеджер базы данных
+        concurrent: Загружать работодателей и страницы вакансий параллельно
+        incremental: Загружать только вакансии, изменившиеся с прошлой синхронизации
+        api: Готовый клиент API (по умолчанию создаётся по настройкам Config)
+        employer_ids: ID работодателей (по умолчанию EMPLOYER_IDS)
+        profiler: Профилировщик стадий загрузки; после загрузки выводится
+                  таблица стадий и сохраняется трасса (см. src.profiling)
+    """
+    if profiler is not None:
+        with profiler:
+            result = fetch_and_save_data(db_manager, concurrent, incremental, api, employer_ids)
+        profiler.report()
+        profiler.write()
+        return result
+
     print("\n" + "=" * 50)
     print("ПОЛУЧЕНИЕ ДАННЫХ С HH.RU")
     print("=" * 50)
 
-    api = HeadHunterAPI()
+    if api is None:
+        config = db_manager.config
+        cache = None
+        if config.hh_cache_path:
+            cache = ResponseCache(config.hh_cache_path, config.hh_cache_ttl,
+                                  config.hh_cache_max_mb * 1024 * 1024)
+        api = HeadHunterAPI(cache=cache, base_url=config.hh_api_url or None)
+    employer_ids = employer_ids or EMPLOYER_IDS
 
     # Получение данных о работодателях
     print("\n1. Получение информации о работодателях...")
-    employers_data = api.get_employers(EMPLOYER_IDS)
+    with span('employers', 'phase'):
+        if concurrent:
+            employers_data = api.get_employers_concurrent(employer_ids)
+        else:
+            employers_data = api.get_employers(employer_ids)
 
     if not employers_data:
         print("❌ Не удалось получить данные о работодателях")
         return False
 
     print(f"✅ Получено данных о {len(employers_data)} работодателях")
+    missing = set(map(int, employer_ids)) - {int(emp['id']) for emp in employers_data}
+    if missing:
+        print(f"⚠️ Не удалось получить работодателей: {', '.join(map(str, sorted(missing)))}")
 
     # Подготовка и сохранение работодателей
-    prepared_employers = [prepare_employer_data(emp) for emp in employers_data]
-    db_manager.insert_employers(prepared_employers)
+    with span('save_employers', 'phase'):
+        prepared_employers = [prepare_employer_data(emp) for emp in employers_data]
+        db_manager.bulk_insert_employers(prepared_employers)
 
-    # Получение и сохранение вакансий
+    # Курсы валют для перевода зарплат в рубли
+    config = db_manager.config
+    with span('currency_rates', 'phase'):
+        refresh_rates(api, config.currency_rates_path, config.currency_rates_ttl)
+
+    # Получение и сохранение вакансий: каждая страница фиксируется вместе
+    # с отметкой, поэтому прерванная загрузка продолжается с места остановки
     print("\n2. Получение вакансий...")
-    all_vacancies = []
-    total_companies = len(employers_data)
+    found_ids = [int(emp['id']) for emp in employers_data]
+    with span('vacancies', 'phase'):
+        if incremental:
+            stats = run_incremental_sync(api, db_manager, employers_data, concurrent=concurrent,
+                                         processes=db_manager.config.normalize_processes)
+        else:
+            stats = run_checkpointed_pipeline(api, db_manager, found_ids, concurrent=concurrent,
+                                              processes=db_manager.config.normalize_processes)
+            if stats['resumed']:
+                print(f"↻ Продолжение загрузки #{stats['run_id']}: "
+                      f"пропущено сохранённых страниц: {stats['skipped_pages']}")
+            db_manager.update_sync_state([emp_id for emp_id in found_ids
+                                          if emp_id not in stats['failed']])
 
+    total_companies = len(employers_data)
     for idx, employer in enumerate(employers_data, 1):
-        emp_id = employer['id']
-        emp_name = employer['name']
-        print(f"   [{idx}/{total_companies}] {emp_name}...")
-
-        vacancies = api.get_vacancies(emp_id)
-        prepared_vacancies = [prepare_vacancy_data(vac, emp_id) for vac in vacancies]
-        all_vacancies.extend(prepared_vacancies)
-
-        print(f"      → Найдено вакансий: {len(vacancies)}")
-
-    if all_vacancies:
-        db_manager.insert_vacancies(all_vacancies)
-        print(f"\n✅ Всего сохранено вакансий: {len(all_vacancies)}")
+        print(f"   [{idx}/{total_companies}] {employer['name']}...")
+        print(f"      → Найдено вакансий: {stats['per_employer'].get(int(employer['id']), 0)}")
+
+    # Агрегаты пересчитываются один раз на загрузку, а не при каждом чтении
+    with span('refresh_statistics', 'phase'):
+        db_manager.refresh_statistics()
+
+    if api.cache is not None:
+        cache_stats = api.cache_stats()
+        print(f"\n🗄️ Кэш: попаданий {cache_stats['hits']}, промахов {cache_stats['misses']}, "
+              f"перепроверок {cache_stats['revalidations']}")
+
+    transport = api.transport_stats()
+    print(f"\n🌐 Запросов: {transport['requests']}, повторов: {transport['retries']}, "
+          f"ответов 429: {transport['throttled']}, p95: {transport['p95_ms']} мс")
+    if stats['failed']:
+        print(f"⚠️ Вакансии получены не полностью для: {', '.join(map(str, sorted(stats['failed'])))}")
+
+    if incremental:
+        print(f"\n✅ Новых и обновлённых вакансий: {stats['vacancies']}, "
+              f"удалено закрытых: {stats['deleted']}")
+    elif stats['vacancies'] or stats.get('skipped_pages'):
+        print(f"\n✅ Всего сохранено вакансий: {stats['vacancies']}")
     else:
         print("\n❌ Не удалось получить данные о вакансиях")
         return False
@@ -128,7 +196,7 @@ def print_companies_and_vacancies(db_manager):
         return
 
     for item in data:
-        print(f"🏢 {item['company']}: {item['count']} вакансий")
+        print(f"🏢 {item.company}: {item.count} вакансий")
 
 
 def print_all_vacancies(db_manager):
@@ -137,18 +205,18 @@ def print_all_vacancies(db_manager):
     print("ВСЕ ВАКАНСИИ")
     print("=" * 50)
 
-    data = db_manager.get_all_vacancies()
+    # Вакансии выводятся по мере чтения с сервера, без загрузки всей таблицы
+    shown = 0
+    for item in db_manager.iter_all_vacancies():
+        salary = f"{item.salary} руб." if item.salary else "Не указана"
+        print(f"\n🏢 {item.company}")
+        print(f"📋 {item.vacancy}")
+        print(f"💰 Зарплата: {salary}")
+        print(f"🔗 {item.url}")
+        shown += 1
 
-    if not data:
+    if not shown:
         print("Нет данных для отображения")
-        return
-
-    for item in data:
-        salary = f"{item['salary']} руб." if item['salary'] else "Не указана"
-        print(f"\n🏢 {item['company']}")
-        print(f"📋 {item['vacancy']}")
-        print(f"💰 Зарплата: {salary}")
-        print(f"🔗 {item['url']}")
 
 
 def print_avg_salary(db_manager):
@@ -174,37 +242,80 @@ def print_vacancies_higher_salary(db_manager):
         return
 
     for item in data:
-        print(f"\n🏢 {item['company']}")
-        print(f"📋 {item['vacancy']}")
-        print(f"💰 Зарплата: {item['salary']} руб.")
-        print(f"🔗 {item['url']}")
+        print(f"\n🏢 {item.company}")
+        print(f"📋 {item.vacancy}")
+        print(f"💰 Зарплата: {item.salary} руб.")
+        print(f"🔗 {item.url}")
 
 
-def search_vacancies_by_keyword(db_manager):
-    """Поиск вакансий по ключевому слову."""
+def print_salary_distribution(db_manager, buckets: int = 10, top: int = 10):
+    """Вывод распределения зарплат: перцентили, гистограмма, статистика компаний."""
+    print("\n" + "=" * 50)
+    print("РАСПРЕДЕЛЕНИЕ ЗАРПЛАТ (РУБ. НА РУКИ)")
+    print("=" * 50)
+
+    levels = db_manager.PERCENTILE_LEVELS
+    values = db_manager.get_salary_percentiles(levels)
+    if values[0] is None:
+        print("Нет данных для отображения")
+        return
+
+    for level, value in zip(levels, values):
+        print(f"📊 {int(level * 100)}-й перцентиль: {round(value)} руб.")
+
+    histogram = db_manager.get_salary_histogram(buckets)
+    widest = max(histogram.counts) or 1
+    print()
+    for index, count in enumerate(histogram.counts):
+        bar = '█' * round(count * 30 / widest)
+        print(f"{round(histogram.edges[index]):>10} - {round(histogram.edges[index + 1]):<10} {count:>6} {bar}")
+
+    print()
+    for item in db_manager.get_employer_salary_stats():
+        print(f"🏢 {item.company}: медиана {round(item.median)} руб., "
+              f"90-й перцентиль {round(item.p90)} руб. ({item.vacancies} вакансий)")
+
+    print(f"\nТоп-{top} вакансий по зарплате:")
+    for item in db_manager.get_top_salaries(top):
+        print(f"💰 {item.salary} руб. - {item.vacancy} ({item.company})")
+
+
+def search_vacancies_by_keyword(db_manager, page_size: int = 20):
+    """Поиск вакансий по ключевым словам в названии и описании."""
     print("\n" + "=" * 50)
     print("ПОИСК ВАКАНСИЙ ПО КЛЮЧЕВОМУ СЛОВУ")
     print("=" * 50)
 
-    keyword = input("Введите ключевое слово для поиска: ").strip()
+    keyword = input("Введите ключевые слова (фразу можно взять в кавычки): ").strip()
 
     if not keyword:
         print("❌ Ключевое слово не может быть пустым")
         return
 
-    data = db_manager.get_vacancies_with_keyword(keyword)
+    offset = 0
+    while True:
+        data = db_manager.search_vacancies(keyword, limit=page_size, offset=offset)
 
-    if not data:
-        print(f"\n❌ Вакансии с ключевым словом '{keyword}' не найдены")
-        return
+        if not data:
+            if offset == 0:
+                print(f"\n❌ Вакансии с ключевым словом '{keyword}' не найдены")
+            return
 
-    print(f"\n✅ Найдено вакансий: {len(data)}")
-    for item in data:
-        salary = f"{item['salary']} руб." if item['salary'] else "Не указана"
-        print(f"\n🏢 {item['company']}")
-        print(f"📋 {item['vacancy']}")
-        print(f"💰 Зарплата: {salary}")
-        print(f"🔗 {item['url']}")
+        print(f"\n✅ Вакансии {offset + 1}-{offset + len(data)}:")
+        for item in data:
+            salary = f"{item.salary} руб." if item.salary else "Не указана"
+            print(f"\n🏢 {item.company}")
+            print(f"📋 {item.vacancy}")
+            print(f"💰 Зарплата: {salary}")
+            print(f"🔗 {item.url}")
+
+        if len(data) < page_size:
+            return
+
+        more = input("\nПоказать ещё? (да/нет): ").strip().lower()
+        if more not in ['да', 'yes', 'y']:
+            return
+        offset += page_size
 
 
 def print_menu():
@@ -220,6 +331,7 @@ def print_menu():
     print("6. Обновить данные с hh.ru")
     print("7. Сбросить базу данных (удалить и создать заново)")
     print("8. Проверить статус базы данных")
+    print("9. Показать распределение зарплат")
     print("0. Выход")
     print("-" * 50)
 
@@ -236,45 +348,48 @@ def check_database_status(db_manager):
 
     if exists:
         # Проверяем наличие таблиц
-        db_manager.connect()
-        cursor = db_manager.conn.cursor()
-
-        try:
-            # Проверяем таблицу employers
-            cursor.execute("""
-                SELECT COUNT(*) FROM information_schema.tables 
-                WHERE table_name = 'employers'
-            """)
-            employers_table = cursor.fetchone()[0] > 0
-            print(f"📋 Таблица 'employers': {'✅ существует' if employers_table else '❌ не существует'}")
-
-            # Проверяем таблицу vacancies
-            cursor.execute("""
-                SELECT COUNT(*) FROM information_schema.tables 
-                WHERE table_name = 'vacancies'
-            """)
-            vacancies_table = cursor.fetchone()[0] > 0
-            print(f"📋 Таблица 'vacancies': {'✅ существует' if vacancies_table else '❌ не существует'}")
-
-            if employers_table:
-                cursor.execute("SELECT COUNT(*) FROM employers")
-                employers_count = cursor.fetchone()[0]
-                print(f"👥 Количество работодателей: {employers_count}")
-
-            if vacancies_table:
-                cursor.execute("SELECT COUNT(*) FROM vacancies")
-                vacancies_count = cursor.fetchone()[0]
-                print(f"📝 Количество вакансий: {vacancies_count}")
-
-        except Exception as e:
-            print(f"Ошибка при проверке таблиц: {e}")
-        finally:
-            cursor.close()
-            db_manager.close()
-
-
-def main():
+        employers_table = db_manager.table_exists('employers')
+        print(f"📋 Таблица 'employers': {'✅ существует' if employers_table else '❌ не существует'}")
+
+        vacancies_table = db_manager.table_exists('vacancies')
+        print(f"📋 Таблица 'vacancies': {'✅ существует' if vacancies_table else '❌ не существует'}")
+
+        if employers_table:
+            print(f"👥 Количество работодателей: {db_manager.count_rows('employers')}")
+
+        if vacancies_table:
+            print(f"📝 Количество вакансий: {db_manager.count_rows('vacancies')}")
+
+    # Статистика пула помогает подобрать DB_POOL_MIN/DB_POOL_MAX
+    stats = db_manager.pool_stats()
+    print(f"🔌 Пул соединений: {stats['in_use']}/{stats['maxconn']} занято, "
+          f"выдач: {stats['checkouts']}, "
+          f"ожидание: среднее {stats['wait_avg_seconds']} с, максимум {stats['wait_max_seconds']} с")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Разбор аргументов командной строки (argv - по умолчанию sys.argv)."""
+    parser = argparse.ArgumentParser(description='Загрузка вакансий работодателей с hh.ru и запросы к ним')
+    parser.add_argument('--profile', nargs='?', const='ingest_profile.json', default=None,
+                        metavar='PATH',
+                        help='Профилировать загрузку: таблица стадий и трасса Chrome Trace в PATH')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='С --profile: также профиль функций cProfile (<PATH>.prof)')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='С --profile: также статистика памяти tracemalloc')
+    return parser.parse_args(argv)
+
+
+def create_profiler(args: argparse.Namespace) -> Optional[IngestProfiler]:
+    """Профилировщик загрузки по аргументам командной строки (None - без профилирования)."""
+    if not args.profile:
+        return None
+    return IngestProfiler(args.profile, cprofile=args.cprofile, trace_memory=args.tracemalloc)
+
+
+def main(argv: Optional[Sequence[str]] = None):
     """Главная функция программы."""
+    args = parse_args(argv)
     print("Добро пожаловать в программу для работы с вакансиями hh.ru!")
     print("Автор: Курсовая работа по базам данных\n")
 
@@ -285,17 +400,12 @@ def main():
         return
 
     # Проверяем, есть ли данные в БД
-    db_manager.connect()
-    cursor = db_manager.conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM employers")
-    employers_count = cursor.fetchone()[0]
-    cursor.close()
-    db_manager.close()
+    employers_count = db_manager.count_rows('employers')
 
     # Если данных нет, загружаем
     if employers_count == 0:
         print("\nБаза данных пуста. Выполняется загрузка данных...")
-        if not fetch_and_save_data(db_manager):
+        if not fetch_and_save_data(db_manager, profiler=create_profiler(args)):
             print("❌ Не удалось загрузить данные. Проверьте подключение к интернету.")
             return
     else:
@@ -319,13 +429,15 @@ def main():
             search_vacancies_by_keyword(db_manager)
         elif choice == '6':
             print("\n🔄 Обновление данных...")
-            fetch_and_save_data(db_manager)
+            fetch_and_save_data(db_manager, incremental=True, profiler=create_profiler(args))
         elif choice == '7':
             db_manager = reset_database()
             print("\n🔄 Загрузка данных в новую базу...")
-            fetch_and_save_data(db_manager)
+            fetch_and_save_data(db_manager, profiler=create_profiler(args))
         elif choice == '8':
             check_database_status(db_manager)
+        elif choice == '9':
+            print_salary_distribution(db_manager)
         elif choice == '0':
             print("\n👋 Спасибо за использование программы! До свидания!")
             break
@@ -0,0 +1,130 @@
+"""
+Статистика распределения зарплат по колонкам значений.
+
+Используется, когда аналитику нельзя посчитать средствами SQL (например,
+в базе без percentile_cont): зарплаты читаются колонками в компактные
+массивы и обрабатываются NumPy, а без него - на чистом Python.
+Перцентили интерполируются линейно, как percentile_cont в PostgreSQL.
+
+Установка необязательной зависимости: pip install numpy
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - зависимость необязательная
+    numpy = None
+
+BACKEND = 'numpy' if numpy is not None else 'python'
+
+
+def to_array(values: Iterable[float], integer: bool = False):
+    """
+    Компактный массив значений.
+
+    Args:
+        values: Значения
+        integer: Целочисленный массив (для ключей групп)
+
+    Returns:
+        numpy.ndarray или array: Массив 64-битных чисел
+    """
+    if numpy is not None:
+        return numpy.fromiter(values, dtype=numpy.int64 if integer else numpy.float64)
+    return array('q' if integer else 'd', values)
+
+
+def _sorted_percentile(ordered: Sequence[float], level: float) -> float:
+    position = (len(ordered) - 1) * level
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def percentiles(values, levels: Sequence[float]) -> Tuple[Optional[float], ...]:
+    """
+    Перцентили значений.
+
+    Args:
+        values: Значения
+        levels: Уровни от 0 до 1
+
+    Returns:
+        Tuple[Optional[float], ...]: Перцентили по уровням (None, если значений нет)
+    """
+    if not len(values):
+        return tuple(None for _ in levels)
+    if numpy is not None:
+        return tuple(float(value) for value in
+                     numpy.percentile(numpy.asarray(values, dtype=numpy.float64),
+                                      [level * 100 for level in levels]))
+    ordered = sorted(values)
+    return tuple(_sorted_percentile(ordered, level) for level in levels)
+
+
+def histogram(values, buckets: int, low: float, high: float) -> Tuple[int, ...]:
+    """
+    Количество значений в равных интервалах [low, high].
+
+    Как и width_bucket, интервалы полуоткрыты, но high попадает в последний.
+    Значения вне диапазона не учитываются.
+
+    Args:
+        values: Значения
+        buckets: Количество интервалов
+        low: Нижняя граница
+        high: Верхняя граница
+
+    Returns:
+        Tuple[int, ...]: Количество значений по интервалам
+    """
+    width = (high - low) / buckets
+    if numpy is not None:
+        data = numpy.asarray(values, dtype=numpy.float64)
+        data = data[(data >= low) & (data <= high)]
+        index = numpy.minimum(((data - low) / width).astype(numpy.int64), buckets - 1)
+        return tuple(int(count) for count in numpy.bincount(index, minlength=buckets))
+
+    counts = [0] * buckets
+    for value in values:
+        if low <= value <= high:
+            counts[min(int((value - low) / width), buckets - 1)] += 1
+    return tuple(counts)
+
+
+def group_percentiles(keys, values, levels: Sequence[float]) -> Dict[int, Tuple[int, Tuple[float, ...]]]:
+    """
+    Количество значений и перцентили по группам.
+
+    Args:
+        keys: Ключ группы для каждого значения
+        values: Значения
+        levels: Уровни от 0 до 1
+
+    Returns:
+        Dict[int, Tuple[int, Tuple[float, ...]]]: Количество и перцентили по ключу группы
+    """
+    result = {}
+    if numpy is not None:
+        keys = numpy.asarray(keys)
+        values = numpy.asarray(values, dtype=numpy.float64)
+        # Одна сортировка по (ключ, значение) вместо отдельной на каждую группу
+        order = numpy.lexsort((values, keys))
+        keys, values = keys[order], values[order]
+        bounds = numpy.flatnonzero(numpy.diff(keys)) + 1
+        for start, end in zip(numpy.r_[0, bounds], numpy.r_[bounds, len(keys)]):
+            if end > start:
+                group = values[start:end]
+                result[int(keys[start])] = (int(end - start), tuple(
+                    float(_sorted_percentile(group, level)) for level in levels))
+        return result
+
+    groups: Dict[int, List[float]] = {}
+    for key, value in zip(keys, values):
+        groups.setdefault(key, []).append(value)
+    for key, group in groups.items():
+        group.sort()
+        result[key] = (len(group), tuple(_sorted_percentile(group, level) for level in levels))
+    return result
\ No newline at end of file
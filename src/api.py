@@ -4,9 +4,18 @@
 """
 
 import requests
-import time
-from typing import List, Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Optional, Iterator, Set, Tuple, Union
 from abc import ABC, abstractmethod
+from src.http_cache import ResponseCache, CachingAdapter
+from src.currency import CurrencyRates
+from src.fast_json import decode_employer, loads
+from src.normalize import page_count
+from src.profiling import span
+from src.transport import (
+    TokenBucket, RateLimitedAdapter, RetryAdapter, CircuitBreaker, TransportStats
+)
 
 
 class BaseAPIClient(ABC):
@@ -27,9 +36,31 @@ class HeadHunterAPI(BaseAPIClient):
     """Класс для работы с API HeadHunter."""
 
     BASE_URL = 'https://api.hh.ru/'
+    PER_PAGE = 100
+    # hh.ru отдаёт через пагинацию не больше MAX_DEPTH вакансий одного запроса
+    MAX_DEPTH = 2000
+
+    def __init__(self, max_workers: int = 8, requests_per_second: float = 5.0,
+                 cache: Optional[ResponseCache] = None, base_url: Optional[str] = None,
+                 max_retries: int = 5):
+        """
+        Инициализация клиента API.
+
+        Args:
+            max_workers: Количество потоков для параллельной загрузки
+            requests_per_second: Общий лимит частоты запросов для всех потоков
+            cache: Дисковый кэш ответов (None - без кэширования)
+            base_url: Адрес API (например, локального тестового сервера);
+                      по умолчанию BASE_URL
+            max_retries: Количество повторов запроса при ошибках 429/5xx и сбоях сети
+        """
+        self.base_url = (base_url or self.BASE_URL).rstrip('/') + '/'
+        self.max_workers = max_workers
+        self.rate_limiter = TokenBucket(requests_per_second)
+        self.circuit_breaker = CircuitBreaker()
+        self.stats = TransportStats()
+        self.cache = cache
 
-    def __init__(self):
-        """Инициализация клиента API."""
         self.session = requests.Session()
         # Важно! Используем корректный User-Agent
         self.session.headers.update({
@@ -37,6 +68,75 @@ class HeadHunterAPI(BaseAPIClient):
             'Accept': 'application/json',
             'Accept-Language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7'
         })
+        # Все запросы к API проходят через общий ограничитель частоты
+        # и повторяются при временных ошибках, а ответы из кэша отдаются до них
+        adapter = RateLimitedAdapter(
+            self.rate_limiter,
+            pool_connections=1,
+            pool_maxsize=max_workers
+        )
+        adapter = RetryAdapter(adapter, self.rate_limiter, max_retries=max_retries,
+                               breaker=self.circuit_breaker, stats=self.stats)
+        if cache is not None:
+            adapter = CachingAdapter(adapter, cache)
+        self.session.mount(self.base_url, adapter)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Счётчики дискового кэша ответов.
+
+        Returns:
+            Dict[str, Any]: Попадания, промахи и перепроверки (пусто без кэша)
+        """
+        return self.cache.stats() if self.cache else {}
+
+    def transport_stats(self) -> Dict[str, Any]:
+        """
+        Статистика сетевых запросов.
+
+        Returns:
+            Dict[str, Any]: Запросы, попытки, повторы, ответы 429, ошибки,
+                задержки p50/p95/p99, текущая частота и состояние выключателя
+        """
+        stats = self.stats.snapshot()
+        stats['rate'] = round(self.rate_limiter.rate, 2)
+        stats['circuit'] = self.circuit_breaker.state
+        return stats
+
+    def get_employer(self, emp_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получение информации об одном работодателе.
+
+        Args:
+            emp_id: ID работодателя
+
+        Returns:
+            Optional[Dict[str, Any]]: Данные работодателя или None при ошибке
+        """
+        try:
+            url = f'{self.base_url}employers/{emp_id}'
+            print(f"Запрос к: {url}")
+
+            response = self.session.get(url)
+
+            print(f"Статус код: {response.status_code}")
+
+            if response.status_code == 200:
+                data = decode_employer(response.content)
+                print(f"✅ Успешно: {data.get('name', 'Неизвестно')}")
+                return data
+            elif response.status_code == 404:
+                print(f"❌ Работодатель {emp_id} не найден (404)")
+            else:
+                print(f"❌ Ошибка {response.status_code} для работодателя {emp_id}")
+                print(f"Ответ: {response.text[:200]}")
+
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Ошибка при получении данных о работодателе {emp_id}: {e}")
+        except Exception as e:
+            print(f"❌ Неожиданная ошибка: {e}")
+
+        return None
 
     def get_employers(self, employer_ids: List[int]) -> List[Dict[str, Any]]:
         """
@@ -50,33 +150,71 @@ class HeadHunterAPI(BaseAPIClient):
         """
         employers = []
         for emp_id in employer_ids:
-            try:
-                # Добавляем задержку между запросами
-                time.sleep(0.5)
+            data = self.get_employer(emp_id)
+            if data:
+                employers.append(data)
+
+        return employers
 
-                url = f'{self.BASE_URL}employers/{emp_id}'
-                print(f"Запрос к: {url}")
+    def get_employers_concurrent(self, employer_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Параллельное получение информации о работодателях.
 
-                response = self.session.get(url)
+        Args:
+            employer_ids: Список ID работодателей
 
-                print(f"Статус код: {response.status_code}")
+        Returns:
+            List[Dict[str, Any]]: Список данных о работодателях (в порядке ID)
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(self.get_employer, employer_ids)
+            return [data for data in results if data]
 
-                if response.status_code == 200:
-                    data = response.json()
-                    employers.append(data)
-                    print(f"✅ Успешно: {data.get('name', 'Неизвестно')}")
-                elif response.status_code == 404:
-                    print(f"❌ Работодатель {emp_id} не найден (404)")
-                else:
-                    print(f"❌ Ошибка {response.status_code} для работодателя {emp_id}")
-                    print(f"Ответ: {response.text[:200]}")
+    def get_vacancy_page(self, employer_id: int, page: int,
+                         date_from: Optional[str] = None,
+                         raw: bool = False) -> Optional[Union[Dict[str, Any], bytes]]:
+        """
+        Получение одной страницы вакансий работодателя.
 
-            except requests.exceptions.RequestException as e:
-                print(f"❌ Ошибка при получении данных о работодателе {emp_id}: {e}")
-            except Exception as e:
-                print(f"❌ Неожиданная ошибка: {e}")
+        Args:
+            employer_id: ID работодателя
+            page: Номер страницы (с нуля)
+            date_from: Только вакансии, опубликованные не раньше этой даты (ISO 8601)
+            raw: Вернуть тело ответа без разбора JSON
 
-        return employers
+        Returns:
+            Optional[Union[Dict[str, Any], bytes]]: Ответ API (items, pages, ...)
+                или его тело при raw=True; None при ошибке
+        """
+        params = {
+            'employer_id': employer_id,
+            'page': page,
+            'per_page': self.PER_PAGE,
+            'only_with_salary': False
+        }
+        if date_from:
+            params['date_from'] = date_from
+
+        try:
+            with span('http', employer_id=employer_id, page=page):
+                response = self.session.get(
+                    f'{self.base_url}vacancies',
+                    params=params
+                )
+                content = response.content
+
+            if response.status_code != 200:
+                print(f"Ошибка при получении вакансий: {response.status_code}")
+                return None
+
+            if raw:
+                return content
+            with span('decode', employer_id=employer_id, page=page, bytes=len(content)):
+                return loads(content)
+
+        except requests.exceptions.RequestException as e:
+            print(f"Ошибка при получении вакансий для работодателя {employer_id}: {e}")
+            return None
 
     def get_vacancies(self, employer_id: int) -> List[Dict[str, Any]]:
         """
@@ -90,45 +228,157 @@ class HeadHunterAPI(BaseAPIClient):
         """
         vacancies = []
         page = 0
-        per_page = 100
 
-        try:
-            while True:
-                params = {
-                    'employer_id': employer_id,
-                    'page': page,
-                    'per_page': per_page,
-                    'only_with_salary': False
-                }
+        while True:
+            data = self.get_vacancy_page(employer_id, page)
+            if not data:
+                break
 
-                response = self.session.get(
-                    f'{self.BASE_URL}vacancies',
-                    params=params
-                )
+            items = data.get('items', [])
+            if not items:
+                break
 
-                if response.status_code != 200:
-                    print(f"Ошибка при получении вакансий: {response.status_code}")
-                    break
+            vacancies.extend(items)
+            page += 1
 
-                data = response.json()
-                items = data.get('items', [])
+            if page >= data.get('pages', 1):
+                break
 
-                if not items:
-                    break
+        return vacancies
 
-                vacancies.extend(items)
-                page += 1
+    def iter_vacancy_pages(self, employer_ids: List[int], concurrent: bool = True,
+                           date_from: Optional[Dict[Any, str]] = None,
+                           failed: Optional[Set[Any]] = None,
+                           page_counts: Optional[Dict[Any, int]] = None,
+                           resume: Optional[Dict[Any, Tuple[int, Set[int]]]] = None,
+                           raw: bool = False
+                           ) -> Iterator[Tuple[int, int, Union[List[Dict[str, Any]], bytes]]]:
+        """
+        Постраничная выдача вакансий нескольких работодателей.
 
-                if page >= data.get('pages', 1):
-                    break
+        В параллельном режиме первая страница каждого работодателя запрашивается
+        сразу, а остальные страницы ставятся в очередь, как только ответ сообщит
+        их количество. Число запросов в работе ограничено, а новые запросы
+        отправляются только когда потребитель забирает готовые страницы,
+        поэтому объём памяти не зависит от количества работодателей.
 
-                # Задержка между страницами
-                time.sleep(0.3)
+        Args:
+            employer_ids: Список ID работодателей
+            concurrent: Загружать страницы параллельно
+            date_from: Нижняя граница даты публикации по ID работодателя
+            failed: Множество, в которое добавляются ID работодателей,
+                    для которых не удалось получить хотя бы одну страницу
+            page_counts: Словарь, в который записывается количество страниц
+                    работодателя при получении его первой страницы
+            resume: Уже сохранённые страницы по ID работодателя (количество
+                    страниц и их номера) - такие страницы не запрашиваются
+            raw: Выдавать тела ответов без разбора JSON вместо списков вакансий
+                 (количество страниц читается из тела без полного разбора)
+
+        Yields:
+            Tuple[int, int, Union[List[Dict[str, Any]], bytes]]: ID работодателя,
+                номер страницы, вакансии или тело ответа
+        """
+        date_from = date_from or {}
+        resume = resume or {}
+
+        def pages_of(data) -> int:
+            return page_count(data) if raw else data.get('pages', 0)
+
+        def payload(data):
+            return data if raw else data.get('items', [])
+
+        # Оставшиеся страницы работодателей, для которых известно их количество
+        remaining = {
+            emp_id: [page for page in range(resume[emp_id][0]) if page not in resume[emp_id][1]]
+            for emp_id in employer_ids if emp_id in resume
+        }
+
+        if not concurrent:
+            for emp_id in employer_ids:
+                if emp_id in remaining:
+                    for page in remaining[emp_id]:
+                        data = self.get_vacancy_page(emp_id, page, date_from.get(emp_id), raw)
+                        if data is None:
+                            if failed is not None:
+                                failed.add(emp_id)
+                            continue
+                        yield emp_id, page, payload(data)
+                    continue
+
+                page = 0
+                while True:
+                    data = self.get_vacancy_page(emp_id, page, date_from.get(emp_id), raw)
+                    if data is None:
+                        if failed is not None:
+                            failed.add(emp_id)
+                        break
+                    pages = pages_of(data)
+                    if page == 0 and page_counts is not None:
+                        page_counts[emp_id] = pages
+                    if not raw and not data.get('items'):
+                        break
+                    yield emp_id, page, payload(data)
+                    page += 1
+                    if page >= pages:
+                        break
+            return
+
+        max_in_flight = self.max_workers * 2
+        tasks = deque()
+        for emp_id in employer_ids:
+            if emp_id in remaining:
+                tasks.extend((emp_id, page) for page in remaining[emp_id])
+            else:
+                tasks.append((emp_id, 0))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            while tasks or pending:
+                while tasks and len(pending) < max_in_flight:
+                    emp_id, page = tasks.popleft()
+                    future = executor.submit(self.get_vacancy_page, emp_id, page,
+                                             date_from.get(emp_id), raw)
+                    pending[future] = (emp_id, page)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emp_id, page = pending.pop(future)
+                    data = future.result()
+                    if data is None:
+                        if failed is not None:
+                            failed.add(emp_id)
+                        continue
+
+                    if page == 0 and emp_id not in remaining:
+                        pages = pages_of(data)
+                        if page_counts is not None:
+                            page_counts[emp_id] = pages
+                        # Оставшиеся страницы работодателя - в начало очереди
+                        tasks.extendleft((emp_id, next_page) for next_page in
+                                         range(pages - 1, 0, -1))
+
+                    yield emp_id, page, payload(data)
+
+    def get_vacancies_concurrent(self, employer_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Параллельное получение вакансий нескольких работодателей.
 
-        except requests.exceptions.RequestException as e:
-            print(f"Ошибка при получении вакансий для работодателя {employer_id}: {e}")
+        Args:
+            employer_ids: Список ID работодателей
 
-        return vacancies
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: Вакансии по ID работодателя
+        """
+        pages: Dict[int, Dict[int, List[Dict[str, Any]]]] = {emp_id: {} for emp_id in employer_ids}
+
+        for emp_id, page, items in self.iter_vacancy_pages(employer_ids):
+            pages[emp_id][page] = items
+
+        return {
+            emp_id: [item for page in sorted(emp_pages) for item in emp_pages[page]]
+            for emp_id, emp_pages in pages.items()
+        }
 
     def search_employers(self, query: str) -> List[Dict[str, Any]]:
         """
@@ -148,12 +398,12 @@ class HeadHunterAPI(BaseAPIClient):
             }
 
             response = self.session.get(
-                f'{self.BASE_URL}employers',
+                f'{self.base_url}employers',
                 params=params
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = loads(response.content)
                 return data.get('items', [])
             else:
                 print(f"Ошибка при поиске: {response.status_code}")
@@ -161,4 +411,26 @@ class HeadHunterAPI(BaseAPIClient):
 
         except Exception as e:
             print(f"Ошибка при поиске работодателей: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def get_currency_rates(self) -> Dict[str, float]:
+        """
+        Курсы валют из справочника hh.ru.
+
+        Returns:
+            Dict[str, float]: Количество единиц валюты в одном рубле по коду
+                валюты (пустой словарь при ошибке)
+        """
+        try:
+            response = self.session.get(f'{self.base_url}dictionaries')
+
+            if response.status_code == 200:
+                return CurrencyRates.parse_dictionaries(loads(response.content))
+            print(f"❌ Ошибка {response.status_code} при получении справочника валют")
+
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Ошибка при получении справочника валют: {e}")
+        except Exception as e:
+            print(f"❌ Неожиданная ошибка: {e}")
+
+        return {}
\ No newline at end of file
@@ -0,0 +1,406 @@
+"""
+Асинхронный клиент API hh.ru.
+Повторяет интерфейс HeadHunterAPI на asyncio и aiohttp: одно соединение
+с пулом keep-alive, ограничение числа запросов в работе и общей частоты,
+повторные попытки с учётом Retry-After.
+
+Требует пакет aiohttp (pip install aiohttp).
+"""
+
+import asyncio
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from src.transport import RETRY_STATUSES, CircuitBreaker, TransportStats, parse_retry_after
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - зависимость необязательная
+    aiohttp = None
+
+
+class AsyncBaseAPIClient(ABC):
+    """Абстрактный базовый класс для асинхронной работы с API."""
+
+    @abstractmethod
+    async def get_employers(self, employer_ids: List[int]) -> List[Dict[str, Any]]:
+        """Получение информации о работодателях."""
+        pass
+
+    @abstractmethod
+    async def get_vacancies(self, employer_id: int) -> List[Dict[str, Any]]:
+        """Получение вакансий работодателя."""
+        pass
+
+
+class AsyncTokenBucket:
+    """
+    Ограничитель частоты запросов для одного цикла событий.
+
+    Токены резервируются синхронно (без await между чтением и записью),
+    поэтому блокировка не нужна.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Инициализация ограничителя.
+
+        Args:
+            rate: Количество запросов в секунду
+            capacity: Максимальный запас токенов (размер всплеска)
+        """
+        if rate <= 0:
+            raise ValueError("Частота запросов должна быть положительной")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Получение токенов с ожиданием при необходимости.
+
+        Args:
+            tokens: Количество токенов
+
+        Returns:
+            float: Время ожидания в секундах
+        """
+        self._refill()
+        self._tokens -= tokens
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def set_rate(self, rate: float):
+        """
+        Изменение частоты запросов на лету.
+
+        Args:
+            rate: Новое количество запросов в секунду
+        """
+        self._refill()
+        self.rate = float(rate)
+
+
+class AsyncHeadHunterAPI(AsyncBaseAPIClient):
+    """
+    Асинхронный клиент API HeadHunter.
+
+    Используется как асинхронный контекстный менеджер:
+
+        async with AsyncHeadHunterAPI(max_concurrency=200) as api:
+            employers = await api.get_employers(ids)
+    """
+
+    BASE_URL = 'https://api.hh.ru/'
+    PER_PAGE = 100
+
+    def __init__(self, max_concurrency: int = 100, requests_per_second: float = 5.0,
+                 base_url: Optional[str] = None, max_retries: int = 5,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 timeout: float = 30.0):
+        """
+        Инициализация клиента API.
+
+        Args:
+            max_concurrency: Максимальное количество запросов в работе
+            requests_per_second: Общий лимит частоты запросов
+            base_url: Адрес API (по умолчанию BASE_URL)
+            max_retries: Количество повторов запроса при ошибках 429/5xx и сбоях сети
+            backoff_base: Базовая задержка перед повтором в секундах
+            backoff_max: Максимальная задержка перед повтором в секундах
+            timeout: Общий тайм-аут одного запроса в секундах
+        """
+        if aiohttp is None:
+            raise ImportError("Для асинхронного клиента нужен пакет aiohttp: pip install aiohttp")
+
+        self.base_url = (base_url or self.BASE_URL).rstrip('/') + '/'
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.rate_limiter = AsyncTokenBucket(requests_per_second)
+        self.max_rate = self.rate_limiter.rate
+        self.min_rate = 0.5
+        self.circuit_breaker = CircuitBreaker()
+        self.stats = TransportStats()
+        self.session: Optional['aiohttp.ClientSession'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncHeadHunterAPI':
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self):
+        """Создание HTTP-сессии с пулом соединений keep-alive."""
+        if self.session is not None:
+            return
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency,
+                                         keepalive_timeout=30, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept': 'application/json',
+                'Accept-Language': 'ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7'
+            }
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        """Закрытие HTTP-сессии."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def transport_stats(self) -> Dict[str, Any]:
+        """
+        Статистика сетевых запросов.
+
+        Returns:
+            Dict[str, Any]: Запросы, попытки, повторы, ответы 429, ошибки,
+                задержки p50/p95/p99, текущая частота и состояние выключателя
+        """
+        stats = self.stats.snapshot()
+        stats['rate'] = round(self.rate_limiter.rate, 2)
+        stats['circuit'] = self.circuit_breaker.state
+        return stats
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Задержка перед повтором с учётом Retry-After."""
+        delay = parse_retry_after(retry_after)
+        if delay is not None:
+            return min(delay, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None
+                        ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        GET-запрос с повторами при временных ошибках.
+
+        Args:
+            url: Адрес запроса
+            params: Параметры запроса
+
+        Returns:
+            Tuple[int, Optional[Dict[str, Any]]]: Статус ответа и тело JSON
+                (статус 0 - запрос не удался из-за сбоя сети)
+        """
+        if self.session is None:
+            await self.open()
+
+        self.stats.record('requests')
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow():
+                self.stats.record('rejected')
+                return 0, None
+
+            retry_after = None
+            async with self._semaphore:
+                await self.rate_limiter.acquire()
+                started = time.perf_counter()
+                try:
+                    async with self.session.get(url, params=params) as response:
+                        status = response.status
+                        retry_after = response.headers.get('Retry-After')
+                        body = await response.json(content_type=None) if status == 200 else None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    status, body = 0, None
+                    error = e
+                self.stats.record('attempts', time.perf_counter() - started)
+
+            if status == 429:
+                self.stats.record('throttled')
+                self.rate_limiter.set_rate(max(self.min_rate, self.rate_limiter.rate / 2))
+                # Ограничение частоты - ни отказ, ни признак восстановления сервера
+                self.circuit_breaker.release()
+            elif status == 0 or status >= 500:
+                self.stats.record('failures')
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+                if self.rate_limiter.rate < self.max_rate:
+                    self.rate_limiter.set_rate(min(self.max_rate, self.rate_limiter.rate + 0.1))
+
+            if (status != 0 and status not in RETRY_STATUSES) or attempt >= self.max_retries:
+                if status == 0:
+                    print(f"Ошибка при запросе {url}: {error}")
+                return status, body
+
+            attempt += 1
+            self.stats.record('retries')
+            await asyncio.sleep(self._backoff(attempt - 1, retry_after))
+
+    async def get_employer(self, emp_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получение информации об одном работодателе.
+
+        Args:
+            emp_id: ID работодателя
+
+        Returns:
+            Optional[Dict[str, Any]]: Данные работодателя или None при ошибке
+        """
+        status, data = await self._get_json(f'{self.base_url}employers/{emp_id}')
+        if status == 200:
+            return data
+        if status == 404:
+            print(f"❌ Работодатель {emp_id} не найден (404)")
+        elif status:
+            print(f"❌ Ошибка {status} для работодателя {emp_id}")
+        return None
+
+    async def get_employers(self, employer_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Параллельное получение информации о работодателях.
+
+        Args:
+            employer_ids: Список ID работодателей
+
+        Returns:
+            List[Dict[str, Any]]: Список данных о работодателях (в порядке ID)
+        """
+        results = await asyncio.gather(*(self.get_employer(emp_id) for emp_id in employer_ids))
+        return [data for data in results if data]
+
+    async def get_vacancy_page(self, employer_id: int, page: int,
+                               date_from: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Получение одной страницы вакансий работодателя.
+
+        Args:
+            employer_id: ID работодателя
+            page: Номер страницы (с нуля)
+            date_from: Только вакансии, опубликованные не раньше этой даты (ISO 8601)
+
+        Returns:
+            Optional[Dict[str, Any]]: Ответ API (items, pages, ...) или None при ошибке
+        """
+        params = {
+            'employer_id': employer_id,
+            'page': page,
+            'per_page': self.PER_PAGE,
+            'only_with_salary': 'false'
+        }
+        if date_from:
+            params['date_from'] = date_from
+
+        status, data = await self._get_json(f'{self.base_url}vacancies', params)
+        if status == 200:
+            return data
+        if status:
+            print(f"Ошибка при получении вакансий: {status}")
+        return None
+
+    async def get_vacancies(self, employer_id: int) -> List[Dict[str, Any]]:
+        """
+        Получение вакансий работодателя.
+
+        Первая страница сообщает количество страниц, остальные
+        запрашиваются параллельно.
+
+        Args:
+            employer_id: ID работодателя
+
+        Returns:
+            List[Dict[str, Any]]: Список вакансий
+        """
+        first = await self.get_vacancy_page(employer_id, 0)
+        if not first or not first.get('items'):
+            return []
+
+        rest = await asyncio.gather(*(self.get_vacancy_page(employer_id, page)
+                                      for page in range(1, first.get('pages', 1))))
+        vacancies = list(first['items'])
+        for data in rest:
+            if data:
+                vacancies.extend(data.get('items', []))
+        return vacancies
+
+    async def iter_vacancy_pages(self, employer_ids: List[int],
+                                 date_from: Optional[Dict[Any, str]] = None,
+                                 failed: Optional[Set[Any]] = None
+                                 ) -> AsyncIterator[Tuple[int, int, List[Dict[str, Any]]]]:
+        """
+        Постраничная выдача вакансий нескольких работодателей.
+
+        Первые страницы всех работодателей запрашиваются сразу, остальные -
+        по мере того, как ответы сообщают количество страниц. Число задач
+        в работе ограничено max_concurrency, а новые задачи создаются только
+        когда потребитель забирает готовые страницы.
+
+        Args:
+            employer_ids: Список ID работодателей
+            date_from: Нижняя граница даты публикации по ID работодателя
+            failed: Множество, в которое добавляются ID работодателей,
+                    для которых не удалось получить хотя бы одну страницу
+
+        Yields:
+            Tuple[int, int, List[Dict[str, Any]]]: ID работодателя, номер страницы, вакансии
+        """
+        date_from = date_from or {}
+        tasks = deque((emp_id, 0) for emp_id in employer_ids)
+        pending: Dict[asyncio.Task, Tuple[Any, int]] = {}
+
+        try:
+            while tasks or pending:
+                while tasks and len(pending) < self.max_concurrency:
+                    emp_id, page = tasks.popleft()
+                    task = asyncio.ensure_future(
+                        self.get_vacancy_page(emp_id, page, date_from.get(emp_id)))
+                    pending[task] = (emp_id, page)
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    emp_id, page = pending.pop(task)
+                    data = task.result()
+                    if data is None:
+                        if failed is not None:
+                            failed.add(emp_id)
+                        continue
+
+                    if page == 0:
+                        # Оставшиеся страницы работодателя - в начало очереди
+                        tasks.extendleft((emp_id, next_page) for next_page in
+                                         range(data.get('pages', 1) - 1, 0, -1))
+
+                    yield emp_id, page, data.get('items', [])
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_vacancies_concurrent(self, employer_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Параллельное получение вакансий нескольких работодателей.
+
+        Args:
+            employer_ids: Список ID работодателей
+
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: Вакансии по ID работодателя
+        """
+        pages: Dict[int, Dict[int, List[Dict[str, Any]]]] = {emp_id: {} for emp_id in employer_ids}
+
+        async for emp_id, page, items in self.iter_vacancy_pages(employer_ids):
+            pages[emp_id][page] = items
+
+        return {
+            emp_id: [item for page in sorted(emp_pages) for item in emp_pages[page]]
+            for emp_id, emp_pages in pages.items()
+        }
\ No newline at end of file
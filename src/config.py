@@ -20,6 +20,36 @@ class Config:
         self.db_password = os.getenv('DB_PASSWORD', 'postgres')
         self.db_host = os.getenv('DB_HOST', 'localhost')
         self.db_port = os.getenv('DB_PORT', '5432')
+        self.db_pool_min = int(os.getenv('DB_POOL_MIN', '1'))
+        self.db_pool_max = int(os.getenv('DB_POOL_MAX', '5'))
+        # Хранилище: postgresql или sqlite (файл SQLITE_PATH, по умолчанию <DB_NAME>.sqlite3)
+        self.db_backend = os.getenv('DB_BACKEND', 'postgresql')
+        self.sqlite_path = os.getenv('SQLITE_PATH', '')
+        # Подготовка частых запросов на сервере (PREPARE/EXECUTE), 0 - отключить
+        self.db_prepare_statements = os.getenv('DB_PREPARE_STATEMENTS', '1') != '0'
+        # Журнал медленных запросов: порог, мс (0 - отключён), план EXPLAIN и файл JSON Lines
+        self.db_slow_query_ms = float(os.getenv('DB_SLOW_QUERY_MS', '1000'))
+        self.db_slow_query_explain = os.getenv('DB_SLOW_QUERY_EXPLAIN', '0') != '0'
+        self.db_slow_query_log = os.getenv('DB_SLOW_QUERY_LOG', '')
+        # Продолжение прерванной загрузки: запуск не старше INGEST_RESUME_HOURS ч;
+        # запуск с отметками моложе INGEST_LEASE_MINUTES мин выполняется другим процессом;
+        # история запусков хранится INGEST_KEEP_DAYS дней (0 - без очистки)
+        self.ingest_resume_hours = float(os.getenv('INGEST_RESUME_HOURS', '24'))
+        self.ingest_lease_minutes = float(os.getenv('INGEST_LEASE_MINUTES', '10'))
+        self.ingest_keep_days = float(os.getenv('INGEST_KEEP_DAYS', '30'))
+        # Адрес API hh.ru (пустой - боевой api.hh.ru)
+        self.hh_api_url = os.getenv('HH_API_URL', '')
+        # Дисковый кэш ответов hh.ru (пустой путь - кэш отключён)
+        self.hh_cache_path = os.getenv('HH_CACHE_PATH', '')
+        self.hh_cache_ttl = float(os.getenv('HH_CACHE_TTL', '600'))
+        self.hh_cache_max_mb = int(os.getenv('HH_CACHE_MAX_MB', '100'))
+        # Пакетная нормализация страниц: пусто - построчная подготовка,
+        # 0 - в текущем процессе, N - в пуле из N процессов
+        processes = os.getenv('NORMALIZE_PROCESSES', '')
+        self.normalize_processes = int(processes) if processes else None
+        # Файл кэша курсов валют из справочника hh.ru и срок его годности, с
+        self.currency_rates_path = os.getenv('CURRENCY_RATES_PATH', '.hh_currency.json')
+        self.currency_rates_ttl = float(os.getenv('CURRENCY_RATES_TTL', '86400'))
 
     def get_db_params(self) -> Dict[str, str]:
         """
@@ -0,0 +1,219 @@
+"""
+Курсы валют и приведение зарплат к рублям.
+
+Курсы берутся из справочника hh.ru (/dictionaries, поле currency: сколько
+единиц валюты стоит один рубль) и кэшируются в JSON-файле, поэтому загрузка
+вакансий не обращается к справочнику при каждом запуске. Зарплата до вычета
+налогов (gross) приводится к сумме на руки по ставке НДФЛ, чтобы все
+вакансии сравнивались в одних единицах.
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Ставка НДФЛ для перевода зарплаты до вычета налогов в сумму на руки
+NDFL_RATE = 0.13
+
+# Без справочника в рубли переводятся только рублёвые зарплаты
+DEFAULT_RATES = {'RUR': 1.0}
+
+DEFAULT_PATH = '.hh_currency.json'
+DEFAULT_MAX_AGE = 24 * 3600
+
+
+class CurrencyRates:
+    """Курсы валют к рублю в формате справочника hh.ru."""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, updated_at: float = 0.0):
+        """
+        Инициализация курсов.
+
+        Args:
+            rates: Количество единиц валюты в одном рубле по коду валюты
+            updated_at: Время получения курсов (Unix time)
+        """
+        self.rates = dict(DEFAULT_RATES)
+        self.rates.update(rates or {})
+        self.updated_at = updated_at
+
+    @staticmethod
+    def parse_dictionaries(data: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Курсы из ответа /dictionaries.
+
+        Args:
+            data: Ответ справочника hh.ru
+
+        Returns:
+            Dict[str, float]: Курсы по коду валюты
+        """
+        return {
+            item['code']: float(item['rate'])
+            for item in data.get('currency', [])
+            if item.get('code') and item.get('rate')
+        }
+
+    @classmethod
+    def load(cls, path: str) -> 'CurrencyRates':
+        """
+        Загрузка курсов из файла кэша.
+
+        Args:
+            path: Путь к файлу
+
+        Returns:
+            CurrencyRates: Курсы (только рубль, если файла нет или он повреждён)
+        """
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(data['rates'], data.get('updated_at', 0.0))
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Не удалось прочитать курсы валют из {path}: {e}")
+            return cls()
+
+    def save(self, path: str):
+        """
+        Сохранение курсов в файл кэша.
+
+        Args:
+            path: Путь к файлу
+        """
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'rates': self.rates, 'updated_at': self.updated_at}, f,
+                      ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def is_stale(self, max_age: float = DEFAULT_MAX_AGE) -> bool:
+        """Курсы не загружались или старше max_age секунд."""
+        return time.time() - self.updated_at > max_age
+
+    def factor(self, currency: Optional[str], gross: Optional[bool] = False) -> Optional[float]:
+        """
+        Множитель перевода суммы в рубли на руки.
+
+        Args:
+            currency: Код валюты (None - рубли)
+            gross: Сумма указана до вычета налогов
+
+        Returns:
+            Optional[float]: Множитель или None, если курс валюты неизвестен
+        """
+        rate = self.rates.get(currency or 'RUR')
+        if not rate:
+            return None
+        factor = 1.0 / rate
+        if gross:
+            factor *= 1.0 - NDFL_RATE
+        return factor
+
+
+_current: Optional[CurrencyRates] = None
+
+
+def current_rates() -> CurrencyRates:
+    """
+    Курсы, используемые при подготовке вакансий.
+
+    Если курсы не заданы через set_rates (например, в дочернем процессе),
+    они читаются из файла CURRENCY_RATES_PATH.
+
+    Returns:
+        CurrencyRates: Текущие курсы
+    """
+    global _current
+    if _current is None:
+        _current = CurrencyRates.load(os.getenv('CURRENCY_RATES_PATH', DEFAULT_PATH))
+    return _current
+
+
+def set_rates(rates: CurrencyRates):
+    """Установка курсов для подготовки вакансий."""
+    global _current
+    _current = rates
+
+
+def refresh_rates(api, path: str = DEFAULT_PATH, max_age: float = DEFAULT_MAX_AGE) -> CurrencyRates:
+    """
+    Актуализация курсов: из файла кэша или, если он устарел, из справочника hh.ru.
+
+    Args:
+        api: Клиент API с методом get_currency_rates
+        path: Путь к файлу кэша
+        max_age: Срок годности курсов в секундах
+
+    Returns:
+        CurrencyRates: Установленные курсы
+    """
+    rates = CurrencyRates.load(path)
+    if rates.is_stale(max_age):
+        fresh = api.get_currency_rates()
+        if fresh:
+            rates = CurrencyRates(fresh, time.time())
+            try:
+                rates.save(path)
+            except OSError as e:
+                print(f"⚠️ Не удалось сохранить курсы валют в {path}: {e}")
+        elif rates.updated_at:
+            print("⚠️ Справочник валют недоступен, используются сохранённые курсы")
+        else:
+            print("⚠️ Справочник валют недоступен, в рубли переводятся только рублёвые зарплаты")
+    set_rates(rates)
+    return rates
+
+
+def salary_rub(salary: Optional[int], currency: Optional[str], gross: Optional[bool],
+               rates: Optional[CurrencyRates] = None) -> Optional[int]:
+    """
+    Зарплата в рублях на руки.
+
+    Args:
+        salary: Средняя зарплата в валюте вакансии (см. parse_salary)
+        currency: Код валюты
+        gross: Зарплата указана до вычета налогов
+        rates: Курсы (по умолчанию current_rates())
+
+    Returns:
+        Optional[int]: Зарплата в рублях или None, если её нет или курс неизвестен
+    """
+    if not salary:
+        return None
+    factor = (rates or current_rates()).factor(currency, gross)
+    if factor is None:
+        return None
+    return round(salary * factor)
+
+
+def normalize_salary_columns(columns: Dict[str, List[Any]],
+                             rates: Optional[CurrencyRates] = None) -> List[Optional[int]]:
+    """
+    Расчёт колонки salary_rub для пакета вакансий в колоночном виде.
+
+    Множитель считается один раз на пару (валюта, gross), а не на каждую вакансию.
+
+    Args:
+        columns: Колонки salary, currency и gross
+        rates: Курсы (по умолчанию current_rates())
+
+    Returns:
+        List[Optional[int]]: Колонка salary_rub (также записывается в columns)
+    """
+    rates = rates or current_rates()
+    factors: Dict[Any, Optional[float]] = {}
+    result = []
+    for salary, currency, gross in zip(columns['salary'], columns['currency'], columns['gross']):
+        if not salary:
+            result.append(None)
+            continue
+        key = (currency, gross)
+        if key not in factors:
+            factors[key] = rates.factor(currency, gross)
+        factor = factors[key]
+        result.append(round(salary * factor) if factor is not None else None)
+    columns['salary_rub'] = result
+    return result
\ No newline at end of file
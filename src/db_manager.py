@@ -1,17 +1,104 @@
 """
 Модуль для управления базой данных.
-Содержит класс DBManager для работы с данными в PostgreSQL.
+Содержит класс DBManager для работы с данными в PostgreSQL,
+его вариант PooledDBManager с пулом соединений и функцию
+create_db_manager для выбора хранилища по настройкам.
 """
 
+import json
+import threading
+import time
+from contextlib import contextmanager
 import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from typing import List, Dict, Any, Optional
+from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT, TRANSACTION_STATUS_IDLE
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
+from itertools import count
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Set, Tuple
+from src import analytics
 from src.config import Config
+from src.instrumentation import QueryMetrics, instrumented_connection
+from src.profiling import span
+from src.statements import StatementCache
+from src.models import (
+    ColumnInfo, CompanyVacancies, DeadLetter, Employer, EmployerSalaryStats, SalaryHistogram,
+    SearchResult, Vacancy, VacancyInfo, as_row
+)
+
+# Уникальные имена серверных курсоров в пределах процесса
+_cursor_ids = count()
+
+
+def _format_copy_value(value: Any) -> str:
+    """
+    Преобразование значения в текстовый формат COPY.
+
+    Args:
+        value: Значение поля
+
+    Returns:
+        str: Экранированное значение (None превращается в \\N)
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+class _CopyStream:
+    """
+    Файлоподобный объект для COPY FROM STDIN.
+
+    Строки формируются лениво по мере чтения, поэтому весь набор данных
+    не собирается в памяти одной большой строкой.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[Any]]):
+        self._lines: Iterator[str] = (
+            '\t'.join(_format_copy_value(value) for value in row) + '\n'
+            for row in rows
+        )
+        self._buffer = ''
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._lines)
+            except StopIteration:
+                break
+
+        if size < 0:
+            chunk, self._buffer = self._buffer, ''
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
 
 
 class DBManager:
     """Класс для управления базой данных вакансий."""
 
+    BACKEND = 'postgresql'
+    # Ошибки в данных строки: такие строки отделяются в dead_letters
+    DATA_ERRORS = (psycopg2.DataError, psycopg2.IntegrityError)
+
+    # Порядок колонок совпадает с полями записей Employer и Vacancy
+    EMPLOYER_COLUMNS = Employer._fields
+    VACANCY_COLUMNS = Vacancy._fields
+
+    # Аналитика зарплат считается в SQL (percentile_cont, width_bucket);
+    # без этих функций - по колонкам значений в src.analytics
+    SQL_ANALYTICS = True
+    PERCENTILE_LEVELS = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+    # Частые запросы готовятся на сервере один раз на соединение (см. src.statements)
+    PREPARE_STATEMENTS = True
+
     def __init__(self, config: Config):
         """
         Инициализация менеджера базы данных.
@@ -21,6 +108,15 @@ class DBManager:
         """
         self.config = config
         self.conn = None
+        self.statements = StatementCache(self.PREPARE_STATEMENTS and config.db_prepare_statements)
+        # Длительность каждого запроса по методам и журнал медленных запросов
+        self.metrics = QueryMetrics(config.db_slow_query_ms, config.db_slow_query_explain,
+                                    config.db_slow_query_log)
+        self.metrics.bind(type(self), DBManager)
+        self._connection_factory = instrumented_connection(self.metrics)
+        # Записи с последнего refresh_statistics: employer_stats пересчитывается
+        # перед чтением (при запуске состояние представления неизвестно)
+        self._statistics_stale = True
 
     def connect(self, database: str = None):
         """
@@ -34,41 +130,64 @@ class DBManager:
             params['dbname'] = database
 
         if not self.conn or self.conn.closed:
-            self.conn = psycopg2.connect(**params)
+            self.conn = psycopg2.connect(connection_factory=self._connection_factory, **params)
 
     def close(self):
         """Закрытие соединения с базой данных."""
         if self.conn and not self.conn.closed:
             self.conn.close()
 
-    def create_database(self):
+    @contextmanager
+    def _connection(self):
         """
-        Создание базы данных, если она не существует.
+        Соединение с рабочей базой данных на время одной операции.
+
+        Yields:
+            Соединение psycopg2
         """
-        # Подключаемся к стандартной БД postgres
-        conn = None
-        try:
-            conn = psycopg2.connect(**self.config.get_postgres_params())
-            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-            cursor = conn.cursor()
+        self.connect()
+        yield self.conn
 
-            # Проверяем существование базы данных
-            cursor.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s",
-                         (self.config.db_name,))
-            exists = cursor.fetchone()
+    @contextmanager
+    def _admin_connection(self):
+        """
+        Соединение со служебной БД postgres в режиме автокоммита
+        (для создания, проверки и удаления базы данных).
 
-            if not exists:
-                cursor.execute(f'CREATE DATABASE {self.config.db_name}')
-                print(f"✅ База данных {self.config.db_name} успешно создана")
-            else:
-                print(f"ℹ️ База данных {self.config.db_name} уже существует")
+        Yields:
+            Соединение psycopg2
+        """
+        conn = psycopg2.connect(connection_factory=self._connection_factory,
+                                **self.config.get_postgres_params())
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            yield conn
+        finally:
+            conn.close()
 
-            cursor.close()
+    def create_database(self):
+        """
+        Создание базы данных, если она не существует.
+        """
+        try:
+            # Подключаемся к стандартной БД postgres
+            with self._admin_connection() as conn:
+                cursor = conn.cursor()
+
+                # Проверяем существование базы данных
+                cursor.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s",
+                             (self.config.db_name,))
+                exists = cursor.fetchone()
+
+                if not exists:
+                    cursor.execute(f'CREATE DATABASE {self.config.db_name}')
+                    print(f"✅ База данных {self.config.db_name} успешно создана")
+                else:
+                    print(f"ℹ️ База данных {self.config.db_name} уже существует")
+
+                cursor.close()
         except Exception as e:
             print(f"❌ Ошибка при создании базы данных: {e}")
-        finally:
-            if conn and not conn.closed:
-                conn.close()
 
     def create_tables(self):
         """Создание таблиц в базе данных."""
@@ -76,72 +195,233 @@ class DBManager:
         self.create_database()
 
         # Подключаемся к созданной БД
-        self.connect()
-        cursor = self.conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            # Создание таблицы employers
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS employers (
-                    id INTEGER PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    description TEXT,
-                    site_url VARCHAR(255),
-                    alternate_url VARCHAR(255),
-                    open_vacancies INTEGER DEFAULT 0
-                )
-            """)
+            try:
+                # Создание таблицы employers
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS employers (
+                        id INTEGER PRIMARY KEY,
+                        name VARCHAR(255) NOT NULL,
+                        description TEXT,
+                        site_url VARCHAR(255),
+                        alternate_url VARCHAR(255),
+                        open_vacancies INTEGER DEFAULT 0
+                    )
+                """)
+
+                # Создание таблицы vacancies
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS vacancies (
+                        id INTEGER PRIMARY KEY,
+                        employer_id INTEGER NOT NULL,
+                        name VARCHAR(255) NOT NULL,
+                        description TEXT,
+                        salary INTEGER,
+                        url VARCHAR(255),
+                        published_at TIMESTAMP,
+                        salary_from INTEGER,
+                        salary_to INTEGER,
+                        currency VARCHAR(10),
+                        gross BOOLEAN,
+                        salary_rub INTEGER,
+                        FOREIGN KEY (employer_id) REFERENCES employers(id)
+                            ON DELETE CASCADE
+                    )
+                """)
+
+                self._migrate_salary_columns(cursor)
+
+                # Создание индексов для улучшения производительности
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_vacancies_employer 
+                    ON vacancies(employer_id)
+                """)
 
-            # Создание таблицы vacancies
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS vacancies (
-                    id INTEGER PRIMARY KEY,
-                    employer_id INTEGER NOT NULL,
-                    name VARCHAR(255) NOT NULL,
-                    description TEXT,
-                    salary INTEGER,
-                    url VARCHAR(255),
-                    published_at TIMESTAMP,
-                    FOREIGN KEY (employer_id) REFERENCES employers(id)
-                        ON DELETE CASCADE
-                )
-            """)
+                # Сравнение и агрегаты зарплат - по сумме в рублях
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_vacancies_salary_rub 
+                    ON vacancies(salary_rub)
+                """)
 
-            # Создание индексов для улучшения производительности
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_vacancies_employer 
-                ON vacancies(employer_id)
-            """)
+                # Полнотекстовый поиск по названию (вес A) и описанию (вес B)
+                cursor.execute("""
+                    ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS search_vector tsvector
+                    GENERATED ALWAYS AS (
+                        setweight(to_tsvector('russian', coalesce(name, '')), 'A') ||
+                        setweight(to_tsvector('russian', coalesce(description, '')), 'B')
+                    ) STORED
+                """)
 
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_vacancies_salary 
-                ON vacancies(salary)
-            """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_vacancies_search 
+                    ON vacancies USING GIN (search_vector)
+                """)
 
-            self.conn.commit()
-            print("✅ Таблицы успешно созданы")
+                # Порядок выдачи списка вакансий для постраничного чтения по ключу
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_vacancies_employer_salary_rub_id 
+                    ON vacancies(employer_id, (COALESCE(salary_rub, -1)) DESC, id)
+                """)
 
-        except Exception as e:
-            print(f"❌ Ошибка при создании таблиц: {e}")
-            self.conn.rollback()
-        finally:
-            cursor.close()
+                self._create_trigram_index(cursor)
+
+                # Агрегаты по работодателям, обновляемые после каждой загрузки
+                cursor.execute("""
+                    CREATE MATERIALIZED VIEW IF NOT EXISTS employer_stats AS
+                    SELECT 
+                        e.id as employer_id,
+                        e.name,
+                        COUNT(v.id) as vacancies_count,
+                        COALESCE(SUM(v.salary_rub), 0) as salary_sum,
+                        COUNT(v.salary_rub) as salary_count,
+                        MIN(v.salary_rub) as salary_min,
+                        MAX(v.salary_rub) as salary_max
+                    FROM employers e
+                    LEFT JOIN vacancies v ON e.id = v.employer_id
+                    GROUP BY e.id, e.name
+                """)
+
+                # Уникальный индекс нужен для REFRESH ... CONCURRENTLY
+                cursor.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_employer_stats_employer 
+                    ON employer_stats(employer_id)
+                """)
+
+                # Отметки последней синхронизации для инкрементального обновления
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS sync_state (
+                        employer_id INTEGER PRIMARY KEY,
+                        last_published_at TIMESTAMP,
+                        last_synced_at TIMESTAMP NOT NULL,
+                        FOREIGN KEY (employer_id) REFERENCES employers(id)
+                            ON DELETE CASCADE
+                    )
+                """)
+
+                # Запуски загрузки и отметки о сохранённых страницах для их продолжения
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS ingest_runs (
+                        id SERIAL PRIMARY KEY,
+                        employer_ids INTEGER[] NOT NULL,
+                        status VARCHAR(20) NOT NULL DEFAULT 'running',
+                        started_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                        finished_at TIMESTAMP,
+                        vacancies INTEGER NOT NULL DEFAULT 0
+                    )
+                """)
+
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+                        run_id INTEGER NOT NULL,
+                        employer_id INTEGER NOT NULL,
+                        page INTEGER NOT NULL,
+                        pages INTEGER NOT NULL,
+                        vacancies INTEGER NOT NULL,
+                        completed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                        PRIMARY KEY (run_id, employer_id, page),
+                        FOREIGN KEY (run_id) REFERENCES ingest_runs(id)
+                            ON DELETE CASCADE
+                    )
+                """)
+
+                # Строки, отклонённые базой при загрузке, с текстом ошибки
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS dead_letters (
+                        id SERIAL PRIMARY KEY,
+                        table_name VARCHAR(63) NOT NULL,
+                        record_id BIGINT,
+                        payload JSONB NOT NULL,
+                        error TEXT NOT NULL,
+                        failed_at TIMESTAMP NOT NULL DEFAULT NOW()
+                    )
+                """)
+
+                conn.commit()
+                print("✅ Таблицы успешно созданы")
+
+            except Exception as e:
+                print(f"❌ Ошибка при создании таблиц: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+    def _migrate_salary_columns(self, cursor):
+        """
+        Добавление колонок зарплаты в таблицу, созданную до их появления.
+
+        Прежние значения salary считаются рублёвыми и переносятся в salary_rub.
+        Индексы и представление employer_stats, построенные по salary,
+        удаляются и создаются заново по salary_rub.
+
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        cursor.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND table_name = 'vacancies' AND column_name = 'salary_rub'
+        """)
+        if cursor.fetchone():
+            return
+
+        cursor.execute("""
+            ALTER TABLE vacancies
+                ADD COLUMN salary_from INTEGER,
+                ADD COLUMN salary_to INTEGER,
+                ADD COLUMN currency VARCHAR(10),
+                ADD COLUMN gross BOOLEAN,
+                ADD COLUMN salary_rub INTEGER
+        """)
+        cursor.execute("UPDATE vacancies SET salary_rub = salary WHERE salary IS NOT NULL")
+        cursor.execute("DROP MATERIALIZED VIEW IF EXISTS employer_stats")
+        cursor.execute("DROP INDEX IF EXISTS idx_vacancies_salary")
+        cursor.execute("DROP INDEX IF EXISTS idx_vacancies_employer_salary_id")
+        print("ℹ️ Таблица vacancies дополнена колонками зарплаты в валюте и в рублях")
+
+    def _create_trigram_index(self, cursor):
+        """
+        Создание триграммного индекса для поиска подстроки в названии.
+
+        Расширение pg_trgm может быть недоступно без прав суперпользователя,
+        в этом случае поиск по подстроке работает без индекса.
+
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        cursor.execute('SAVEPOINT trgm')
+        try:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vacancies_name_trgm 
+                ON vacancies USING GIN (LOWER(name) gin_trgm_ops)
+            """)
+            cursor.execute('RELEASE SAVEPOINT trgm')
+        except psycopg2.Error as e:
+            print(f"ℹ️ Триграммный индекс не создан: {str(e).splitlines()[0]}")
+            cursor.execute('ROLLBACK TO SAVEPOINT trgm')
 
     def drop_tables(self):
         """Удаление таблиц (для очистки БД)."""
-        self.connect()
-        cursor = self.conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute("DROP TABLE IF EXISTS vacancies CASCADE")
-            cursor.execute("DROP TABLE IF EXISTS employers CASCADE")
-            self.conn.commit()
-            print("✅ Таблицы успешно удалены")
-        except Exception as e:
-            print(f"❌ Ошибка при удалении таблиц: {e}")
-            self.conn.rollback()
-        finally:
-            cursor.close()
+            try:
+                cursor.execute("DROP MATERIALIZED VIEW IF EXISTS employer_stats")
+                cursor.execute("DROP TABLE IF EXISTS dead_letters CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS ingest_checkpoints CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS ingest_runs CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS sync_state CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS vacancies CASCADE")
+                cursor.execute("DROP TABLE IF EXISTS employers CASCADE")
+                conn.commit()
+                print("✅ Таблицы успешно удалены")
+            except Exception as e:
+                print(f"❌ Ошибка при удалении таблиц: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
 
     def drop_database(self):
         """
@@ -150,30 +430,25 @@ class DBManager:
         # Закрываем все соединения с нашей БД
         self.close()
 
-        conn = None
         try:
-            conn = psycopg2.connect(**self.config.get_postgres_params())
-            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-            cursor = conn.cursor()
+            with self._admin_connection() as conn:
+                cursor = conn.cursor()
 
-            # Завершаем все соединения с нашей БД
-            cursor.execute("""
-                SELECT pg_terminate_backend(pg_stat_activity.pid)
-                FROM pg_stat_activity
-                WHERE pg_stat_activity.datname = %s
-                AND pid <> pg_backend_pid()
-            """, (self.config.db_name,))
+                # Завершаем все соединения с нашей БД
+                cursor.execute("""
+                    SELECT pg_terminate_backend(pg_stat_activity.pid)
+                    FROM pg_stat_activity
+                    WHERE pg_stat_activity.datname = %s
+                    AND pid <> pg_backend_pid()
+                """, (self.config.db_name,))
 
-            # Удаляем базу данных
-            cursor.execute(f'DROP DATABASE IF EXISTS {self.config.db_name}')
-            print(f"✅ База данных {self.config.db_name} успешно удалена")
+                # Удаляем базу данных
+                cursor.execute(f'DROP DATABASE IF EXISTS {self.config.db_name}')
+                print(f"✅ База данных {self.config.db_name} успешно удалена")
 
-            cursor.close()
+                cursor.close()
         except Exception as e:
             print(f"❌ Ошибка при удалении базы данных: {e}")
-        finally:
-            if conn and not conn.closed:
-                conn.close()
 
     def database_exists(self) -> bool:
         """
@@ -182,236 +457,1271 @@ class DBManager:
         Returns:
             bool: True если база данных существует
         """
-        conn = None
         try:
-            conn = psycopg2.connect(**self.config.get_postgres_params())
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s",
-                         (self.config.db_name,))
-            exists = cursor.fetchone() is not None
-            cursor.close()
-            return exists
+            with self._admin_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s",
+                             (self.config.db_name,))
+                exists = cursor.fetchone() is not None
+                cursor.close()
+                return exists
         except Exception as e:
             print(f"❌ Ошибка при проверке базы данных: {e}")
             return False
-        finally:
-            if conn and not conn.closed:
-                conn.close()
 
-    def insert_employers(self, employers_data: List[Dict[str, Any]]):
+    def table_exists(self, table_name: str) -> bool:
         """
-        Вставка данных о работодателях.
+        Проверка существования таблицы.
 
         Args:
-            employers_data: Список данных о работодателях
+            table_name: Имя таблицы
+
+        Returns:
+            bool: True если таблица существует
         """
-        self.connect()
-        cursor = self.conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            for emp in employers_data:
+            try:
                 cursor.execute("""
-                    INSERT INTO employers (id, name, description, site_url, alternate_url, open_vacancies)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE SET
-                        name = EXCLUDED.name,
-                        description = EXCLUDED.description,
-                        site_url = EXCLUDED.site_url,
-                        alternate_url = EXCLUDED.alternate_url,
-                        open_vacancies = EXCLUDED.open_vacancies
-                """, (
-                    emp['id'],
-                    emp['name'],
-                    emp['description'],
-                    emp['site_url'],
-                    emp['alternate_url'],
-                    emp['open_vacancies']
-                ))
-
-            self.conn.commit()
-            print(f"✅ Успешно добавлено/обновлено {len(employers_data)} работодателей")
+                    SELECT COUNT(*) FROM information_schema.tables 
+                    WHERE table_name = %s
+                """, (table_name,))
+                return cursor.fetchone()[0] > 0
+
+            except Exception as e:
+                print(f"❌ Ошибка при проверке таблицы: {e}")
+                conn.rollback()
+                return False
+            finally:
+                cursor.close()
+
+    def count_rows(self, table_name: str) -> int:
+        """
+        Подсчёт количества строк в таблице.
 
-        except Exception as e:
-            print(f"❌ Ошибка при вставке работодателей: {e}")
-            self.conn.rollback()
-        finally:
-            cursor.close()
+        Args:
+            table_name: Имя таблицы
 
-    def insert_vacancies(self, vacancies_data: List[Dict[str, Any]]):
+        Returns:
+            int: Количество строк (0 при ошибке)
         """
-        Вставка данных о вакансиях.
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table_name)))
+                return cursor.fetchone()[0]
+
+            except Exception as e:
+                print(f"❌ Ошибка при подсчёте строк: {e}")
+                conn.rollback()
+                return 0
+            finally:
+                cursor.close()
+
+    def insert_employers(self, employers_data: List[Employer]):
+        """
+        Вставка данных о работодателях.
+
+        Агрегаты employer_stats пересчитываются при следующем чтении
+        (или вызовом refresh_statistics).
 
         Args:
-            vacancies_data: Список данных о вакансиях
+            employers_data: Список работодателей (Employer или словари)
         """
-        self.connect()
-        cursor = self.conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            for vac in vacancies_data:
-                cursor.execute("""
-                    INSERT INTO vacancies (id, employer_id, name, description, salary, url, published_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE SET
-                        name = EXCLUDED.name,
-                        description = EXCLUDED.description,
-                        salary = EXCLUDED.salary,
-                        url = EXCLUDED.url,
-                        published_at = EXCLUDED.published_at
-                """, (
-                    vac['id'],
-                    vac['employer_id'],
-                    vac['name'],
-                    vac['description'],
-                    vac['salary'],
-                    vac['url'],
-                    vac['published_at']
-                ))
-
-            self.conn.commit()
-            print(f"✅ Успешно добавлено/обновлено {len(vacancies_data)} вакансий")
+            try:
+                for emp in employers_data:
+                    self.statements.execute(cursor, 'upsert_employer', """
+                        INSERT INTO employers (id, name, description, site_url, alternate_url, open_vacancies)
+                        VALUES (%s, %s, %s, %s, %s, %s)
+                        ON CONFLICT (id) DO UPDATE SET
+                            name = EXCLUDED.name,
+                            description = EXCLUDED.description,
+                            site_url = EXCLUDED.site_url,
+                            alternate_url = EXCLUDED.alternate_url,
+                            open_vacancies = EXCLUDED.open_vacancies
+                    """, as_row(emp, self.EMPLOYER_COLUMNS))
+
+                conn.commit()
+                self._statistics_stale = True
+                print(f"✅ Успешно добавлено/обновлено {len(employers_data)} работодателей")
+
+            except Exception as e:
+                print(f"❌ Ошибка при вставке работодателей: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+    def insert_vacancies(self, vacancies_data: List[Vacancy],
+                         batch_size: int = 500) -> Dict[str, int]:
+        """
+        Вставка данных о вакансиях пакетами.
 
-        except Exception as e:
-            print(f"❌ Ошибка при вставке вакансий: {e}")
-            self.conn.rollback()
-        finally:
-            cursor.close()
+        Каждый пакет фиксируется отдельно. Если пакет не удалось записать,
+        он делится пополам до тех пор, пока не останутся отдельные ошибочные
+        строки - они сохраняются в dead_letters, остальные записываются.
+        Агрегаты employer_stats пересчитываются при следующем чтении
+        (или вызовом refresh_statistics).
+
+        Args:
+            vacancies_data: Список вакансий (Vacancy или словари)
+            batch_size: Количество вакансий в пакете
+
+        Returns:
+            Dict[str, int]: Количество записанных (rows) и отклонённых (failed) вакансий
+        """
+        stats = {'rows': 0, 'failed': 0}
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                for start in range(0, len(vacancies_data), batch_size):
+                    chunk = vacancies_data[start:start + batch_size]
+                    rows = [as_row(vac, self.VACANCY_COLUMNS) for vac in chunk]
+                    written, rejected, _ = self._upsert_isolating(
+                        cursor, 'vacancies', self.VACANCY_COLUMNS, rows, use_copy=False,
+                        page_size=batch_size)
+                    self._save_dead_letters(cursor, 'vacancies', self.VACANCY_COLUMNS, rejected)
+                    conn.commit()
+                    self._statistics_stale = True
+                    stats['rows'] += written
+                    stats['failed'] += len(rejected)
+
+                print(f"✅ Успешно добавлено/обновлено {stats['rows']} вакансий")
+                if stats['failed']:
+                    print(f"⚠️ Отклонено вакансий: {stats['failed']} (см. таблицу dead_letters)")
+
+            except Exception as e:
+                print(f"❌ Ошибка при вставке вакансий: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+            return stats
+
+    def _upsert_isolating(self, cursor, table: str, columns: Sequence[str],
+                          rows: Sequence[Sequence[Any]], use_copy: bool = True,
+                          page_size: int = 1000
+                          ) -> Tuple[int, List[Tuple[Sequence[Any], str]], Optional[str]]:
+        """
+        Массовая вставка с отделением строк, которые отклоняет база.
+
+        Пакет записывается целиком под точкой сохранения. Если база
+        отклоняет пакет из-за данных (слишком длинная строка, нарушение
+        внешнего ключа и т.п.), он делится пополам, пока ошибка
+        не будет локализована до отдельных строк. Транзакция не фиксируется.
+        Из строк с одинаковым ключом записывается последняя.
+
+        Args:
+            cursor: Курсор открытого соединения
+            table: Имя целевой таблицы
+            columns: Список колонок (первая - первичный ключ)
+            rows: Строки в порядке колонок
+            use_copy: Пытаться ли использовать COPY для целого пакета
+            page_size: Размер пакета для execute_values
+
+        Returns:
+            Tuple: Количество записанных строк (различных ключей), отклонённые
+                строки с текстом ошибки и способ загрузки целого пакета
+        """
+        written = 0
+        rejected: List[Tuple[Sequence[Any], str]] = []
+        method = None
+        # Повторы ключа убираются до деления, иначе половины пакета
+        # записали бы одну строку дважды
+        pending = [list({row[0]: row for row in rows}.values())]
+
+        while pending:
+            chunk = pending.pop()
+            whole = method is None
+            cursor.execute('SAVEPOINT bulk_chunk')
+            try:
+                count, used = self._bulk_upsert(cursor, table, columns, chunk,
+                                                use_copy and whole, page_size)
+                cursor.execute('RELEASE SAVEPOINT bulk_chunk')
+                written += count
+                if whole:
+                    method = used
+            except self.DATA_ERRORS as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT bulk_chunk')
+                if whole:
+                    method = 'isolated'
+                if len(chunk) == 1:
+                    rejected.append((chunk[0], str(e).strip()))
+                else:
+                    middle = len(chunk) // 2
+                    pending.append(chunk[middle:])
+                    pending.append(chunk[:middle])
+
+        return written, rejected, method
+
+    def _save_dead_letters(self, cursor, table: str, columns: Sequence[str],
+                           rejected: List[Tuple[Sequence[Any], str]]):
+        """
+        Сохранение отклонённых строк в dead_letters без фиксации транзакции.
+
+        Args:
+            cursor: Курсор открытого соединения
+            table: Имя таблицы, в которую не удалось записать строки
+            columns: Список колонок (первая - первичный ключ)
+            rejected: Отклонённые строки с текстом ошибки
+        """
+        if not rejected:
+            return
+        cursor.executemany("""
+            INSERT INTO dead_letters (table_name, record_id, payload, error)
+            VALUES (%s, %s, %s, %s)
+        """, [
+            (table, row[0], json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str), error)
+            for row, error in rejected
+        ])
+
+    def get_dead_letters(self, table: Optional[str] = None, limit: int = 100) -> List[DeadLetter]:
+        """
+        Получает строки, отклонённые при загрузке.
+
+        Args:
+            table: Имя таблицы (None - все таблицы)
+            limit: Максимальное количество записей
+
+        Returns:
+            List[DeadLetter]: Отклонённые записи с текстом ошибки, новые первыми
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'dead_letters', """
+                    SELECT table_name, record_id, payload, error, failed_at
+                    FROM dead_letters
+                    WHERE CAST(%(table)s AS TEXT) IS NULL OR table_name = %(table)s
+                    ORDER BY id DESC
+                    LIMIT %(limit)s
+                """, {'table': table, 'limit': limit})
+                return [DeadLetter._make(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении отклонённых записей: {e}")
+                conn.rollback()
+                return []
+            finally:
+                cursor.close()
+
+    def _bulk_upsert(self, cursor, table: str, columns: Sequence[str],
+                     rows: Sequence[Sequence[Any]], use_copy: bool = True,
+                     page_size: int = 1000) -> Tuple[int, str]:
+        """
+        Массовая вставка с обновлением без фиксации транзакции.
+
+        Строки потоком передаются через COPY FROM STDIN во временную
+        таблицу, после чего одним запросом INSERT ... SELECT ... ON CONFLICT
+        переносятся в основную таблицу. Если COPY недоступен, используются
+        пакеты execute_values. Из строк с одинаковым ключом при обоих
+        способах записывается последняя.
+
+        Args:
+            cursor: Курсор открытого соединения
+            table: Имя целевой таблицы
+            columns: Список колонок (первая - первичный ключ)
+            rows: Строки в порядке колонок
+            use_copy: Пытаться ли использовать COPY
+            page_size: Размер пакета для execute_values
+
+        Returns:
+            Tuple[int, str]: Количество записанных строк (различных ключей)
+                и использованный способ загрузки ('copy' или 'execute_values')
+        """
+        key = columns[0]
+        column_list = ', '.join(columns)
+        updates = ', '.join(f'{col} = EXCLUDED.{col}' for col in columns[1:])
+        # В одном INSERT ... ON CONFLICT строка не может обновляться дважды
+        unique_rows = list({row[0]: row for row in rows}.values())
+
+        if use_copy:
+            staging = f'tmp_{table}'
+            cursor.execute('SAVEPOINT bulk_copy')
+            try:
+                cursor.execute(f"""
+                    CREATE TEMP TABLE IF NOT EXISTS {staging}
+                    (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP
+                """)
+                cursor.copy_expert(
+                    f'COPY {staging} ({column_list}) FROM STDIN',
+                    _CopyStream(unique_rows)
+                )
+                cursor.execute(f"""
+                    INSERT INTO {table} ({column_list})
+                    SELECT {column_list} FROM {staging}
+                    ON CONFLICT ({key}) DO UPDATE SET {updates}
+                """)
+                written = cursor.rowcount
+                cursor.execute(f'DROP TABLE {staging}')
+                cursor.execute('RELEASE SAVEPOINT bulk_copy')
+                return written, 'copy'
+            except psycopg2.Error as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT bulk_copy')
+                # Ошибка в данных повторится и при execute_values
+                if isinstance(e, (psycopg2.DataError, psycopg2.IntegrityError)):
+                    raise
+                print(f"ℹ️ COPY недоступен ({e.__class__.__name__}), используем execute_values")
+
+        execute_values(cursor, f"""
+            INSERT INTO {table} ({column_list}) VALUES %s
+            ON CONFLICT ({key}) DO UPDATE SET {updates}
+        """, unique_rows, page_size=page_size)
+        return len(unique_rows), 'execute_values'
+
+    def _bulk_load(self, table: str, columns: Sequence[str],
+                   rows: List[Tuple[Any, ...]], label: str,
+                   use_copy: bool, page_size: int) -> Dict[str, Any]:
+        """
+        Массовая загрузка записей с фиксацией и замером скорости.
+
+        Строки, которые отклоняет база, отделяются делением пакета
+        и сохраняются в dead_letters, остальные записываются.
+
+        Args:
+            table: Имя целевой таблицы
+            columns: Список колонок
+            rows: Строки в порядке колонок
+            label: Название сущности для вывода
+            use_copy: Пытаться ли использовать COPY
+            page_size: Размер пакета для execute_values
+
+        Returns:
+            Dict[str, Any]: Статистика загрузки (rows, failed, seconds, rows_per_second, method)
+        """
+        stats = {'rows': 0, 'failed': 0, 'seconds': 0.0, 'rows_per_second': 0.0, 'method': None}
+        if not rows:
+            return stats
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            started = time.perf_counter()
+
+            try:
+                with span('db_write', table=table, rows=len(rows)):
+                    written, rejected, stats['method'] = self._upsert_isolating(
+                        cursor, table, columns, rows, use_copy, page_size)
+                    self._save_dead_letters(cursor, table, columns, rejected)
+                with span('commit', table=table):
+                    conn.commit()
+                self._statistics_stale = True
+
+                elapsed = time.perf_counter() - started
+                stats['rows'] = written
+                stats['failed'] = len(rejected)
+                stats['seconds'] = round(elapsed, 3)
+                stats['rows_per_second'] = round(written / elapsed, 1) if elapsed else 0.0
+                print(f"✅ Загружено {written} {label} ({stats['method']}) "
+                      f"за {stats['seconds']} с: {stats['rows_per_second']} строк/с")
+                if rejected:
+                    print(f"⚠️ Отклонено {len(rejected)} {label} (см. таблицу dead_letters)")
+
+            except Exception as e:
+                print(f"❌ Ошибка при массовой загрузке ({label}): {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+            return stats
+
+    def bulk_insert_employers(self, employers_data: List[Employer],
+                              use_copy: bool = True,
+                              page_size: int = 1000) -> Dict[str, Any]:
+        """
+        Массовая вставка данных о работодателях через COPY.
+        Агрегаты employer_stats пересчитываются при следующем чтении
+        (или вызовом refresh_statistics).
+
+        Args:
+            employers_data: Список работодателей (Employer или словари)
+            use_copy: Пытаться ли использовать COPY
+            page_size: Размер пакета для резервного execute_values
+
+        Returns:
+            Dict[str, Any]: Статистика загрузки
+        """
+        rows = [as_row(emp, self.EMPLOYER_COLUMNS) for emp in employers_data]
+        return self._bulk_load('employers', self.EMPLOYER_COLUMNS, rows,
+                               'работодателей', use_copy, page_size)
+
+    def bulk_insert_vacancies(self, vacancies_data: List[Vacancy],
+                              use_copy: bool = True,
+                              page_size: int = 1000) -> Dict[str, Any]:
+        """
+        Массовая вставка данных о вакансиях через COPY.
+        Агрегаты employer_stats пересчитываются при следующем чтении
+        (или вызовом refresh_statistics).
+
+        Args:
+            vacancies_data: Список вакансий (Vacancy или словари)
+            use_copy: Пытаться ли использовать COPY
+            page_size: Размер пакета для резервного execute_values
+
+        Returns:
+            Dict[str, Any]: Статистика загрузки
+        """
+        rows = [as_row(vac, self.VACANCY_COLUMNS) for vac in vacancies_data]
+        return self._bulk_load('vacancies', self.VACANCY_COLUMNS, rows,
+                               'вакансий', use_copy, page_size)
+
+    def bulk_insert_vacancy_columns(self, columns: Dict[str, List[Any]],
+                                    use_copy: bool = True,
+                                    page_size: int = 1000) -> Dict[str, Any]:
+        """
+        Массовая вставка вакансий, подготовленных в колоночном виде.
+        Агрегаты employer_stats пересчитываются при следующем чтении
+        (или вызовом refresh_statistics).
+
+        Args:
+            columns: Значения по колонкам VACANCY_COLUMNS (см. src.normalize)
+            use_copy: Пытаться ли использовать COPY
+            page_size: Размер пакета для резервного execute_values
+
+        Returns:
+            Dict[str, Any]: Статистика загрузки
+        """
+        rows = list(zip(*(columns[col] for col in self.VACANCY_COLUMNS)))
+        return self._bulk_load('vacancies', self.VACANCY_COLUMNS, rows,
+                               'вакансий', use_copy, page_size)
+
+    def get_sync_state(self) -> Dict[int, Any]:
+        """
+        Получает отметки последней синхронизации работодателей.
+
+        Returns:
+            Dict[int, Any]: Дата последней опубликованной вакансии по ID работодателя
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'sync_state', """
+                    SELECT employer_id, last_published_at
+                    FROM sync_state
+                    WHERE last_published_at IS NOT NULL
+                """)
+                return {row[0]: row[1] for row in cursor.fetchall()}
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении состояния синхронизации: {e}")
+                conn.rollback()
+                return {}
+            finally:
+                cursor.close()
+
+    def update_sync_state(self, employer_ids: List[int]):
+        """
+        Обновляет отметки синхронизации по данным в таблице vacancies.
+
+        Args:
+            employer_ids: Список ID синхронизированных работодателей
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'update_sync_state', """
+                    INSERT INTO sync_state (employer_id, last_published_at, last_synced_at)
+                    SELECT e.id, MAX(v.published_at), NOW()
+                    FROM employers e
+                    LEFT JOIN vacancies v ON v.employer_id = e.id
+                    WHERE e.id = ANY(%s)
+                    GROUP BY e.id
+                    ON CONFLICT (employer_id) DO UPDATE SET
+                        last_published_at = EXCLUDED.last_published_at,
+                        last_synced_at = EXCLUDED.last_synced_at
+                """, ([int(emp_id) for emp_id in employer_ids],))
+                conn.commit()
+
+            except Exception as e:
+                print(f"❌ Ошибка при обновлении состояния синхронизации: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+    def get_vacancy_counts(self, employer_ids: List[int]) -> Dict[int, int]:
+        """
+        Получает количество сохранённых вакансий по работодателям.
+
+        Args:
+            employer_ids: Список ID работодателей
+
+        Returns:
+            Dict[int, int]: Количество вакансий по ID работодателя
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'vacancy_counts', """
+                    SELECT employer_id, COUNT(*)
+                    FROM vacancies
+                    WHERE employer_id = ANY(%s)
+                    GROUP BY employer_id
+                """, ([int(emp_id) for emp_id in employer_ids],))
+                return {row[0]: row[1] for row in cursor.fetchall()}
+
+            except Exception as e:
+                print(f"❌ Ошибка при подсчёте вакансий: {e}")
+                conn.rollback()
+                return {}
+            finally:
+                cursor.close()
+
+    def delete_stale_vacancies(self, employer_id: int, actual_ids: Iterable[int]) -> int:
+        """
+        Удаляет закрытые вакансии работодателя.
+        Агрегаты employer_stats пересчитываются при следующем чтении
+        (или вызовом refresh_statistics).
+
+        Args:
+            employer_id: ID работодателя
+            actual_ids: ID вакансий, которые сейчас открыты на hh.ru
+
+        Returns:
+            int: Количество удалённых вакансий
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'delete_stale_vacancies', """
+                    DELETE FROM vacancies
+                    WHERE employer_id = %s AND NOT (id = ANY(%s))
+                """, (int(employer_id), [int(vac_id) for vac_id in actual_ids]))
+                deleted = cursor.rowcount
+                conn.commit()
+                self._statistics_stale = True
+                return deleted
+
+            except Exception as e:
+                print(f"❌ Ошибка при удалении закрытых вакансий: {e}")
+                conn.rollback()
+                return 0
+            finally:
+                cursor.close()
+
+    def start_ingest_run(self, employer_ids: List[int]) -> Optional[Tuple[int, bool]]:
+        """
+        Начинает запуск загрузки или продолжает незавершённый.
+
+        Продолжается последний запуск с тем же набором работодателей,
+        если он не получил статус completed и начат не раньше чем
+        config.ingest_resume_hours назад; более старые незавершённые
+        запуски помечаются abandoned. Запуск running с отметками моложе
+        config.ingest_lease_minutes считается выполняемым другим процессом
+        и не продолжается. Запуски старше config.ingest_keep_days дней
+        удаляются вместе с отметками.
+
+        Args:
+            employer_ids: Список ID работодателей
+
+        Returns:
+            Optional[Tuple[int, bool]]: ID запуска и признак продолжения
+                (None при ошибке)
+        """
+        ids = sorted({int(emp_id) for emp_id in employer_ids})
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                # Время последней активности запуска - последняя сохранённая страница
+                self.statements.execute(cursor, 'abandon_ingest_runs', """
+                    UPDATE ingest_runs r SET
+                        status = 'abandoned',
+                        finished_at = COALESCE(r.finished_at, NOW())
+                    WHERE r.status IN ('running', 'failed')
+                      AND r.started_at < NOW() - CAST(%s AS DOUBLE PRECISION) * INTERVAL '1 hour'
+                      AND COALESCE((SELECT MAX(c.completed_at) FROM ingest_checkpoints c
+                                    WHERE c.run_id = r.id), r.started_at)
+                          < NOW() - CAST(%s AS DOUBLE PRECISION) * INTERVAL '1 minute'
+                """, (self.config.ingest_resume_hours, self.config.ingest_lease_minutes))
+                if self.config.ingest_keep_days > 0:
+                    self.statements.execute(cursor, 'prune_ingest_runs', """
+                        DELETE FROM ingest_runs
+                        WHERE status <> 'running'
+                          AND started_at < NOW() - CAST(%s AS DOUBLE PRECISION) * INTERVAL '1 day'
+                    """, (self.config.ingest_keep_days,))
+
+                self.statements.execute(cursor, 'find_ingest_run', """
+                    SELECT r.id, r.status,
+                           COALESCE((SELECT MAX(c.completed_at) FROM ingest_checkpoints c
+                                     WHERE c.run_id = r.id), r.started_at)
+                               >= NOW() - CAST(%s AS DOUBLE PRECISION) * INTERVAL '1 minute'
+                    FROM ingest_runs r
+                    WHERE r.employer_ids = %s::integer[] AND r.status <> 'abandoned'
+                    ORDER BY r.id DESC
+                    LIMIT 1
+                """, (self.config.ingest_lease_minutes, ids))
+                row = cursor.fetchone()
+
+                if row is not None and row[1] == 'running' and row[2]:
+                    print(f"ℹ️ Запуск загрузки #{row[0]} выполняется другим процессом, "
+                          f"начинается новый")
+                    row = None
+
+                if row is not None and row[1] != 'completed':
+                    self.statements.execute(cursor, 'resume_ingest_run', """
+                        UPDATE ingest_runs SET status = 'running', finished_at = NULL
+                        WHERE id = %s
+                    """, (row[0],))
+                    run = (row[0], True)
+                else:
+                    self.statements.execute(cursor, 'create_ingest_run', """
+                        INSERT INTO ingest_runs (employer_ids) VALUES (%s::integer[])
+                        RETURNING id
+                    """, (ids,))
+                    run = (cursor.fetchone()[0], False)
+
+                conn.commit()
+                return run
+
+            except Exception as e:
+                print(f"❌ Ошибка при создании запуска загрузки: {e}")
+                conn.rollback()
+                return None
+            finally:
+                cursor.close()
+
+    def get_ingest_checkpoints(self, run_id: int) -> Dict[int, Tuple[int, Set[int]]]:
+        """
+        Получает сохранённые страницы запуска загрузки.
+
+        Args:
+            run_id: ID запуска
+
+        Returns:
+            Dict[int, Tuple[int, Set[int]]]: Количество страниц и номера
+                сохранённых страниц по ID работодателя
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'ingest_checkpoints', """
+                    SELECT employer_id, MAX(pages), ARRAY_AGG(page)
+                    FROM ingest_checkpoints
+                    WHERE run_id = %s
+                    GROUP BY employer_id
+                """, (run_id,))
+                return {row[0]: (row[1], set(row[2])) for row in cursor.fetchall()}
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении отметок загрузки: {e}")
+                conn.rollback()
+                return {}
+            finally:
+                cursor.close()
+
+    def save_vacancy_page(self, run_id: int, employer_id: int, page: int, pages: int,
+                          rows: List[Tuple[Any, ...]]) -> bool:
+        """
+        Сохраняет страницу вакансий вместе с отметкой о ней в одной транзакции.
+        Агрегаты employer_stats пересчитываются при следующем чтении
+        (или вызовом refresh_statistics).
+
+        Args:
+            run_id: ID запуска загрузки
+            employer_id: ID работодателя
+            page: Номер страницы
+            pages: Количество страниц у работодателя
+            rows: Вакансии страницы в порядке колонок VACANCY_COLUMNS
+
+        Returns:
+            bool: True, если страница сохранена
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                with span('db_write', employer_id=employer_id, page=page, rows=len(rows)):
+                    if rows:
+                        _, rejected, _ = self._upsert_isolating(cursor, 'vacancies',
+                                                                self.VACANCY_COLUMNS, rows)
+                        self._save_dead_letters(cursor, 'vacancies', self.VACANCY_COLUMNS, rejected)
+                    self.statements.execute(cursor, 'save_checkpoint', """
+                        INSERT INTO ingest_checkpoints (run_id, employer_id, page, pages, vacancies)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON CONFLICT (run_id, employer_id, page) DO UPDATE SET
+                            pages = EXCLUDED.pages,
+                            vacancies = EXCLUDED.vacancies,
+                            completed_at = NOW()
+                    """, (run_id, int(employer_id), page, pages, len(rows)))
+                with span('commit', employer_id=employer_id, page=page):
+                    conn.commit()
+                self._statistics_stale = True
+                return True
+
+            except Exception as e:
+                print(f"❌ Ошибка при сохранении страницы {page} работодателя {employer_id}: {e}")
+                conn.rollback()
+                return False
+            finally:
+                cursor.close()
+
+    def finish_ingest_run(self, run_id: int, status: str = 'completed') -> int:
+        """
+        Завершает запуск загрузки.
 
-    def get_companies_and_vacancies_count(self) -> List[Dict[str, Any]]:
+        Args:
+            run_id: ID запуска
+            status: Итоговый статус (completed - все страницы сохранены,
+                    failed - часть страниц нужно догрузить при следующем запуске)
+
+        Returns:
+            int: Количество вакансий, сохранённых запуском
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'finish_ingest_run', """
+                    UPDATE ingest_runs SET
+                        status = %s,
+                        finished_at = NOW(),
+                        vacancies = (SELECT COALESCE(SUM(vacancies), 0)
+                                     FROM ingest_checkpoints WHERE run_id = %s)
+                    WHERE id = %s
+                    RETURNING vacancies
+                """, (status, run_id, run_id))
+                row = cursor.fetchone()
+                conn.commit()
+                return row[0] if row else 0
+
+            except Exception as e:
+                print(f"❌ Ошибка при завершении запуска загрузки: {e}")
+                conn.rollback()
+                return 0
+            finally:
+                cursor.close()
+
+    def refresh_statistics(self):
+        """
+        Пересчёт агрегатов employer_stats после загрузки данных.
+
+        Методы чтения количества вакансий и средней зарплаты берут данные
+        из этого представления. Если после записи оно не обновлялось,
+        они сами вызывают этот метод перед чтением (_ensure_statistics).
+        """
+        # Записи, зафиксированные во время пересчёта, снова отметят его устаревшим
+        self._statistics_stale = False
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY employer_stats")
+                conn.commit()
+
+            except Exception as e:
+                self._statistics_stale = True
+                print(f"❌ Ошибка при обновлении статистики: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+    def _ensure_statistics(self):
+        """Пересчёт employer_stats, если после последней записи он не выполнялся."""
+        if self._statistics_stale:
+            self.refresh_statistics()
+
+    def get_companies_and_vacancies_count(self) -> List[CompanyVacancies]:
         """
         Получает список всех компаний и количество вакансий у каждой компании.
 
         Returns:
-            List[Dict[str, Any]]: Список компаний с количеством вакансий
+            List[CompanyVacancies]: Список компаний с количеством вакансий
         """
-        self.connect()
-        cursor = self.conn.cursor()
+        self._ensure_statistics()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute("""
-                SELECT e.name, COUNT(v.id) as vacancies_count
-                FROM employers e
-                LEFT JOIN vacancies v ON e.id = v.employer_id
-                GROUP BY e.id, e.name
-                ORDER BY vacancies_count DESC
-            """)
+            try:
+                self.statements.execute(cursor, 'companies_vacancies_count', """
+                    SELECT name, vacancies_count
+                    FROM employer_stats
+                    ORDER BY vacancies_count DESC
+                """)
 
-            results = cursor.fetchall()
-            return [{'company': row[0], 'count': row[1]} for row in results]
+                results = cursor.fetchall()
+                return [CompanyVacancies._make(row) for row in results]
 
-        except Exception as e:
-            print(f"❌ Ошибка при получении данных: {e}")
-            return []
-        finally:
-            cursor.close()
+            except Exception as e:
+                print(f"❌ Ошибка при получении данных: {e}")
+                return []
+            finally:
+                cursor.close()
 
-    def get_all_vacancies(self) -> List[Dict[str, Any]]:
+    def get_all_vacancies(self) -> List[VacancyInfo]:
         """
         Получает список всех вакансий с указанием названия компании,
         названия вакансии, зарплаты и ссылки на вакансию.
 
         Returns:
-            List[Dict[str, Any]]: Список всех вакансий
+            List[VacancyInfo]: Список всех вакансий
         """
-        self.connect()
-        cursor = self.conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute("""
-                SELECT 
-                    e.name as company_name,
-                    v.name as vacancy_name,
-                    v.salary,
-                    v.url
-                FROM vacancies v
-                JOIN employers e ON v.employer_id = e.id
-                ORDER BY e.name, v.salary DESC NULLS LAST
-            """)
+            try:
+                self.statements.execute(cursor, 'all_vacancies', """
+                    SELECT 
+                        e.name as company_name,
+                        v.name as vacancy_name,
+                        v.salary_rub,
+                        v.url
+                    FROM vacancies v
+                    JOIN employers e ON v.employer_id = e.id
+                    ORDER BY e.name, v.salary_rub DESC NULLS LAST
+                """)
 
-            results = cursor.fetchall()
-            return [
-                {
-                    'company': row[0],
-                    'vacancy': row[1],
-                    'salary': row[2],
-                    'url': row[3]
-                }
-                for row in results
-            ]
+                results = cursor.fetchall()
+                return [VacancyInfo._make(row) for row in results]
 
-        except Exception as e:
-            print(f"❌ Ошибка при получении данных: {e}")
-            return []
-        finally:
-            cursor.close()
+            except Exception as e:
+                print(f"❌ Ошибка при получении данных: {e}")
+                return []
+            finally:
+                cursor.close()
+
+    def iter_all_vacancies(self, itersize: int = 1000) -> Iterator[VacancyInfo]:
+        """
+        Потоковое чтение всех вакансий через серверный курсор.
+
+        Строки забираются с сервера порциями по itersize, поэтому память
+        не зависит от размера таблицы, а первые строки доступны сразу.
+        Соединение занято, пока итератор не исчерпан или не закрыт.
+
+        Args:
+            itersize: Количество строк, получаемых с сервера за один раз
+
+        Yields:
+            VacancyInfo: Данные вакансии (company, vacancy, salary, url)
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor(name=f'vacancies_stream_{next(_cursor_ids)}')
+            cursor.itersize = itersize
+
+            try:
+                cursor.execute("""
+                    SELECT 
+                        e.name as company_name,
+                        v.name as vacancy_name,
+                        v.salary_rub,
+                        v.url
+                    FROM vacancies v
+                    JOIN employers e ON v.employer_id = e.id
+                    ORDER BY e.name, v.salary_rub DESC NULLS LAST
+                """)
+
+                for row in cursor:
+                    yield VacancyInfo._make(row)
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении данных: {e}")
+            finally:
+                cursor.close()
+                # Завершаем транзакцию, в которой жил серверный курсор
+                conn.rollback()
+
+    def iter_table_rows(self, table: str, columns: Sequence[str],
+                        batch_size: int = 10000) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Потоковое чтение таблицы пакетами строк через серверный курсор.
+
+        Используется для выгрузки: в памяти одновременно находится
+        только один пакет, строки упорядочены по первой колонке.
+
+        Args:
+            table: Имя таблицы
+            columns: Список колонок (первая - первичный ключ)
+            batch_size: Количество строк в пакете
+
+        Yields:
+            List[Tuple[Any, ...]]: Пакет строк в порядке колонок
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor(name=f'{table}_batches_{next(_cursor_ids)}')
+            cursor.itersize = batch_size
+
+            try:
+                cursor.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {columns[0]}")
+
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+
+            except Exception as e:
+                print(f"❌ Ошибка при чтении таблицы {table}: {e}")
+            finally:
+                cursor.close()
+                conn.rollback()
+
+    def get_vacancies_page(self, after: Optional[Tuple[str, int, int]] = None,
+                           limit: int = 100) -> Tuple[List[VacancyInfo], Optional[Tuple[str, int, int]]]:
+        """
+        Постраничное чтение вакансий по ключу (keyset pagination).
+
+        Порядок: название компании, зарплата по убыванию (без зарплаты - в конце), ID.
+        В отличие от OFFSET, следующая страница не требует пропуска
+        уже прочитанных строк.
+
+        Args:
+            after: Ключ последней строки предыдущей страницы (None - первая страница)
+            limit: Количество вакансий на странице
+
+        Returns:
+            Tuple: Вакансии страницы и ключ для следующей страницы (None, если страниц больше нет)
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                # Вакансии каждой компании читаются по индексу
+                # idx_vacancies_employer_salary_rub_id не дальше limit строк
+                next_employers = """
+                    SELECT e.name, x.*
+                    FROM employers e
+                    CROSS JOIN LATERAL (
+                        SELECT v.name, v.salary_rub, v.url, COALESCE(v.salary_rub, -1) as salary_key, v.id
+                        FROM vacancies v
+                        WHERE v.employer_id = e.id
+                        ORDER BY COALESCE(v.salary_rub, -1) DESC, v.id
+                        LIMIT %(limit)s
+                    ) x
+                    {where}
+                    ORDER BY e.name, x.salary_key DESC, x.id
+                    LIMIT %(limit)s
+                """
+                params: Dict[str, Any] = {'limit': limit}
+
+                if after is None:
+                    query = next_employers.format(where='')
+                else:
+                    # Продолжение текущей компании и следующие компании
+                    params.update(name=after[0], salary=after[1], id=after[2])
+                    query = """
+                        (
+                            SELECT e.name, v.name, v.salary_rub, v.url,
+                                   COALESCE(v.salary_rub, -1) as salary_key, v.id
+                            FROM employers e
+                            JOIN vacancies v ON v.employer_id = e.id
+                            WHERE e.name = %(name)s
+                              AND COALESCE(v.salary_rub, -1) <= %(salary)s
+                              AND (COALESCE(v.salary_rub, -1) < %(salary)s OR v.id > %(id)s)
+                            ORDER BY salary_key DESC, v.id
+                            LIMIT %(limit)s
+                        )
+                        UNION ALL
+                        ({next_employers})
+                        ORDER BY 1, 5 DESC, 6
+                        LIMIT %(limit)s
+                    """.format(next_employers=next_employers.format(where='WHERE e.name > %(name)s'))
+
+                self.statements.execute(cursor, 'vacancies_page' if after is None else 'vacancies_next_page',
+                                        query, params)
+
+                results = cursor.fetchall()
+                page = [VacancyInfo._make(row[:4]) for row in results]
+                next_key = None
+                if len(results) == limit:
+                    last = results[-1]
+                    next_key = (last[0], last[4], last[5])
+                return page, next_key
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении данных: {e}")
+                return [], None
+            finally:
+                cursor.close()
 
     def get_avg_salary(self) -> float:
         """
-        Получает среднюю зарплату по вакансиям.
+        Получает среднюю зарплату по вакансиям в рублях на руки.
 
         Returns:
             float: Средняя зарплата
         """
-        self.connect()
-        cursor = self.conn.cursor()
+        self._ensure_statistics()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute("""
-                SELECT AVG(salary) as avg_salary
-                FROM vacancies
-                WHERE salary IS NOT NULL
-            """)
+            try:
+                self.statements.execute(cursor, 'avg_salary', """
+                    SELECT SUM(salary_sum)::numeric / NULLIF(SUM(salary_count), 0) as avg_salary
+                    FROM employer_stats
+                """)
 
-            result = cursor.fetchone()
-            return round(result[0], 2) if result[0] else 0
+                result = cursor.fetchone()
+                return round(result[0], 2) if result[0] else 0
 
-        except Exception as e:
-            print(f"❌ Ошибка при получении средней зарплаты: {e}")
-            return 0
-        finally:
-            cursor.close()
+            except Exception as e:
+                print(f"❌ Ошибка при получении средней зарплаты: {e}")
+                return 0
+            finally:
+                cursor.close()
 
-    def get_vacancies_with_higher_salary(self) -> List[Dict[str, Any]]:
+    def _fetch_salaries(self) -> Tuple[Any, Any]:
         """
-        Получает список всех вакансий, у которых зарплата выше средней по всем вакансиям.
+        Чтение зарплат в рублях колонками для расчёта аналитики вне SQL.
 
         Returns:
-            List[Dict[str, Any]]: Список вакансий с зарплатой выше средней
+            Tuple: Массив ID работодателей и массив зарплат
         """
-        self.connect()
-        cursor = self.conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute("""
-                SELECT 
-                    e.name as company_name,
-                    v.name as vacancy_name,
-                    v.salary,
-                    v.url
-                FROM vacancies v
-                JOIN employers e ON v.employer_id = e.id
-                WHERE v.salary > (SELECT AVG(salary) FROM vacancies WHERE salary IS NOT NULL)
-                ORDER BY v.salary DESC
-            """)
+            try:
+                self.statements.execute(cursor, 'fetch_salaries', """
+                    SELECT employer_id, salary_rub
+                    FROM vacancies
+                    WHERE salary_rub IS NOT NULL
+                """)
+                rows = cursor.fetchall()
+                return (analytics.to_array((row[0] for row in rows), integer=True),
+                        analytics.to_array(row[1] for row in rows))
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении зарплат: {e}")
+                return analytics.to_array((), integer=True), analytics.to_array(())
+            finally:
+                cursor.close()
+
+    def get_salary_percentiles(self, levels: Sequence[float] = PERCENTILE_LEVELS) -> Tuple[Optional[float], ...]:
+        """
+        Перцентили зарплат в рублях по всем вакансиям.
+
+        Args:
+            levels: Уровни от 0 до 1
+
+        Returns:
+            Tuple[Optional[float], ...]: Перцентили по уровням (None, если зарплат нет)
+        """
+        levels = tuple(levels)
+        if not self.SQL_ANALYTICS:
+            return analytics.percentiles(self._fetch_salaries()[1], levels)
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'salary_percentiles', """
+                    SELECT percentile_cont(%s::float8[]) WITHIN GROUP (ORDER BY salary_rub)
+                    FROM vacancies
+                    WHERE salary_rub IS NOT NULL
+                """, (list(levels),))
+                result = cursor.fetchone()[0]
+                return tuple(result) if result else tuple(None for _ in levels)
+
+            except Exception as e:
+                print(f"❌ Ошибка при расчёте перцентилей: {e}")
+                conn.rollback()
+                return tuple(None for _ in levels)
+            finally:
+                cursor.close()
+
+    def get_salary_histogram(self, buckets: int = 10, low: Optional[float] = None,
+                             high: Optional[float] = None) -> SalaryHistogram:
+        """
+        Гистограмма зарплат в рублях с интервалами равной ширины.
+
+        Args:
+            buckets: Количество интервалов
+            low: Нижняя граница (по умолчанию минимальная зарплата)
+            high: Верхняя граница (по умолчанию максимальная зарплата)
 
-            results = cursor.fetchall()
-            return [
-                {
-                    'company': row[0],
-                    'vacancy': row[1],
-                    'salary': row[2],
-                    'url': row[3]
-                }
-                for row in results
+        Returns:
+            SalaryHistogram: Границы интервалов и количество вакансий в каждом
+                (пустая при buckets <= 0 или без зарплат)
+        """
+        empty = SalaryHistogram((), ())
+        if buckets <= 0:
+            print(f"❌ Количество интервалов гистограммы должно быть положительным: {buckets}")
+            return empty
+
+        salaries = None
+        if low is None or high is None:
+            if self.SQL_ANALYTICS:
+                result = self.execute_query(
+                    'SELECT MIN(salary_rub), MAX(salary_rub) FROM vacancies')
+                bounds = result[0] if result else (None, None)
+            else:
+                salaries = self._fetch_salaries()[1]
+                bounds = (min(salaries), max(salaries)) if len(salaries) else (None, None)
+            low = bounds[0] if low is None else low
+            high = bounds[1] if high is None else high
+        if low is None or high is None:
+            return empty
+
+        low, high = float(low), float(high)
+        if high <= low:
+            high = low + 1
+        width = (high - low) / buckets
+        edges = tuple(low + width * index for index in range(buckets)) + (high,)
+
+        if not self.SQL_ANALYTICS:
+            if salaries is None:
+                salaries = self._fetch_salaries()[1]
+            return SalaryHistogram(edges, analytics.histogram(salaries, buckets, low, high))
+
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                # Максимальное значение попадает в последний интервал, а не за него
+                self.statements.execute(cursor, 'salary_histogram', """
+                    SELECT LEAST(width_bucket(salary_rub, %(low)s, %(high)s, %(buckets)s),
+                                 %(buckets)s) as bucket,
+                           COUNT(*)
+                    FROM vacancies
+                    WHERE salary_rub BETWEEN %(low)s AND %(high)s
+                    GROUP BY bucket
+                """, {'low': low, 'high': high, 'buckets': buckets})
+                counts = [0] * buckets
+                for bucket, count in cursor.fetchall():
+                    counts[bucket - 1] = count
+                return SalaryHistogram(edges, tuple(counts))
+
+            except Exception as e:
+                print(f"❌ Ошибка при построении гистограммы: {e}")
+                conn.rollback()
+                return empty
+            finally:
+                cursor.close()
+
+    def get_employer_salary_stats(self, min_vacancies: int = 1) -> List[EmployerSalaryStats]:
+        """
+        Медиана и 90-й перцентиль зарплат в рублях по работодателям.
+
+        Args:
+            min_vacancies: Минимум вакансий с зарплатой у работодателя
+
+        Returns:
+            List[EmployerSalaryStats]: Работодатели по убыванию медианы
+        """
+        if not self.SQL_ANALYTICS:
+            employer_ids, salaries = self._fetch_salaries()
+            groups = analytics.group_percentiles(employer_ids, salaries, (0.5, 0.9))
+            names = dict(self.execute_query('SELECT id, name FROM employers'))
+            stats = [
+                EmployerSalaryStats(emp_id, names.get(emp_id, ''), count, median, p90)
+                for emp_id, (count, (median, p90)) in groups.items()
+                if count >= min_vacancies
             ]
+            stats.sort(key=lambda item: (-item.median, item.company))
+            return stats
 
-        except Exception as e:
-            print(f"❌ Ошибка при получении данных: {e}")
-            return []
-        finally:
-            cursor.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'employer_salary_stats', """
+                    SELECT 
+                        e.id,
+                        e.name,
+                        COUNT(*) as vacancies,
+                        percentile_cont(0.5) WITHIN GROUP (ORDER BY v.salary_rub) as median,
+                        percentile_cont(0.9) WITHIN GROUP (ORDER BY v.salary_rub) as p90
+                    FROM vacancies v
+                    JOIN employers e ON v.employer_id = e.id
+                    WHERE v.salary_rub IS NOT NULL
+                    GROUP BY e.id, e.name
+                    HAVING COUNT(*) >= %s
+                    ORDER BY median DESC, e.name
+                """, (min_vacancies,))
+                return [EmployerSalaryStats._make(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ Ошибка при расчёте статистики работодателей: {e}")
+                conn.rollback()
+                return []
+            finally:
+                cursor.close()
+
+    def get_top_salaries(self, limit: int = 10,
+                         employer_id: Optional[int] = None) -> List[VacancyInfo]:
+        """
+        Вакансии с самой высокой зарплатой в рублях.
+
+        Читаются по индексу зарплаты в обратном порядке, без сортировки всей таблицы.
+
+        Args:
+            limit: Количество вакансий
+            employer_id: ID работодателя (None - все работодатели)
+
+        Returns:
+            List[VacancyInfo]: Вакансии по убыванию зарплаты
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'top_salaries', """
+                    SELECT 
+                        e.name as company_name,
+                        v.name as vacancy_name,
+                        v.salary_rub,
+                        v.url
+                    FROM vacancies v
+                    JOIN employers e ON v.employer_id = e.id
+                    WHERE v.salary_rub IS NOT NULL
+                      AND (CAST(%(employer_id)s AS INTEGER) IS NULL OR v.employer_id = %(employer_id)s)
+                    ORDER BY v.salary_rub DESC, v.id
+                    LIMIT %(limit)s
+                """, {'employer_id': employer_id, 'limit': limit})
+                return [VacancyInfo._make(row) for row in cursor.fetchall()]
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении данных: {e}")
+                conn.rollback()
+                return []
+            finally:
+                cursor.close()
 
-    def get_vacancies_with_keyword(self, keyword: str) -> List[Dict[str, Any]]:
+    def get_vacancies_with_higher_salary(self) -> List[VacancyInfo]:
+        """
+        Получает список всех вакансий, у которых зарплата выше средней по всем вакансиям.
+
+        Returns:
+            List[VacancyInfo]: Список вакансий с зарплатой выше средней
+        """
+        self._ensure_statistics()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'higher_salary_vacancies', """
+                    SELECT 
+                        e.name as company_name,
+                        v.name as vacancy_name,
+                        v.salary_rub,
+                        v.url
+                    FROM vacancies v
+                    JOIN employers e ON v.employer_id = e.id
+                    WHERE v.salary_rub > (
+                        SELECT SUM(salary_sum)::numeric / NULLIF(SUM(salary_count), 0)
+                        FROM employer_stats
+                    )
+                    ORDER BY v.salary_rub DESC
+                """)
+
+                results = cursor.fetchall()
+                return [VacancyInfo._make(row) for row in results]
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении данных: {e}")
+                return []
+            finally:
+                cursor.close()
+
+    def get_vacancies_with_keyword(self, keyword: str) -> List[VacancyInfo]:
         """
         Получает список всех вакансий, в названии которых содержатся переданные слова.
 
@@ -419,40 +1729,77 @@ class DBManager:
             keyword: Ключевое слово для поиска
 
         Returns:
-            List[Dict[str, Any]]: Список вакансий, содержащих ключевое слово
+            List[VacancyInfo]: Список вакансий, содержащих ключевое слово
         """
-        self.connect()
-        cursor = self.conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-        try:
-            cursor.execute("""
-                SELECT 
-                    e.name as company_name,
-                    v.name as vacancy_name,
-                    v.salary,
-                    v.url
-                FROM vacancies v
-                JOIN employers e ON v.employer_id = e.id
-                WHERE LOWER(v.name) LIKE %s
-                ORDER BY e.name, v.salary DESC
-            """, (f'%{keyword.lower()}%',))
-
-            results = cursor.fetchall()
-            return [
-                {
-                    'company': row[0],
-                    'vacancy': row[1],
-                    'salary': row[2],
-                    'url': row[3]
-                }
-                for row in results
-            ]
+            try:
+                self.statements.execute(cursor, 'keyword_vacancies', """
+                    SELECT 
+                        e.name as company_name,
+                        v.name as vacancy_name,
+                        v.salary_rub,
+                        v.url
+                    FROM vacancies v
+                    JOIN employers e ON v.employer_id = e.id
+                    WHERE LOWER(v.name) LIKE %s
+                    ORDER BY e.name, v.salary_rub DESC
+                """, (f'%{keyword.lower()}%',))
 
-        except Exception as e:
-            print(f"❌ Ошибка при получении данных: {e}")
-            return []
-        finally:
-            cursor.close()
+                results = cursor.fetchall()
+                return [VacancyInfo._make(row) for row in results]
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении данных: {e}")
+                return []
+            finally:
+                cursor.close()
+
+    def search_vacancies(self, query: str, limit: int = 20,
+                         offset: int = 0) -> List[SearchResult]:
+        """
+        Полнотекстовый поиск вакансий по названию и описанию.
+
+        Запрос разбирается функцией websearch_to_tsquery с русской морфологией:
+        несколько слов ищутся вместе, фраза в кавычках - целиком,
+        поддерживаются "or" и исключение слов через "-".
+
+        Args:
+            query: Поисковый запрос
+            limit: Количество вакансий на странице
+            offset: Смещение от начала выдачи
+
+        Returns:
+            List[SearchResult]: Вакансии, отсортированные по релевантности
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                self.statements.execute(cursor, 'search_vacancies', """
+                    SELECT 
+                        e.name as company_name,
+                        v.name as vacancy_name,
+                        v.salary_rub,
+                        v.url,
+                        ts_rank_cd(v.search_vector, q) as rank
+                    FROM vacancies v
+                    JOIN employers e ON v.employer_id = e.id
+                    CROSS JOIN websearch_to_tsquery('russian', %s) q
+                    WHERE v.search_vector @@ q
+                    ORDER BY rank DESC, v.id
+                    LIMIT %s OFFSET %s
+                """, (query, limit, offset))
+
+                results = cursor.fetchall()
+                return [SearchResult._make(row) for row in results]
+
+            except Exception as e:
+                print(f"❌ Ошибка при поиске вакансий: {e}")
+                return []
+            finally:
+                cursor.close()
 
     def execute_query(self, query: str, params: tuple = None) -> List[tuple]:
         """
@@ -465,30 +1812,39 @@ class DBManager:
         Returns:
             List[tuple]: Результаты запроса
         """
-        self.connect()
-        cursor = self.conn.cursor()
-
-        try:
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+        with self._connection() as conn:
+            cursor = conn.cursor()
 
-            if query.strip().upper().startswith('SELECT'):
-                results = cursor.fetchall()
+            try:
+                started = time.perf_counter()
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                self.statements.record('execute_query', time.perf_counter() - started, cursor.rowcount)
+
+                # Строки есть у любого запроса с результатом (SELECT, WITH, EXPLAIN, RETURNING)
+                results = cursor.fetchall() if cursor.description is not None else []
+                conn.commit()
                 return results
-            else:
-                self.conn.commit()
+
+            except Exception as e:
+                print(f"❌ Ошибка при выполнении запроса: {e}")
+                conn.rollback()
                 return []
+            finally:
+                cursor.close()
 
-        except Exception as e:
-            print(f"❌ Ошибка при выполнении запроса: {e}")
-            self.conn.rollback()
-            return []
-        finally:
-            cursor.close()
+    def statement_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Статистика выполнения запросов по именам (см. StatementCache.stats).
 
-    def get_table_info(self, table_name: str) -> List[Dict[str, Any]]:
+        Returns:
+            Dict[str, Dict[str, Any]]: Количество выполнений, время, строки и признак подготовки
+        """
+        return self.statements.stats()
+
+    def get_table_info(self, table_name: str) -> List[ColumnInfo]:
         """
         Получает информацию о структуре таблицы.
 
@@ -496,36 +1852,188 @@ class DBManager:
             table_name: Имя таблицы
 
         Returns:
-            List[Dict[str, Any]]: Информация о колонках таблицы
+            List[ColumnInfo]: Информация о колонках таблицы
         """
-        self.connect()
-        cursor = self.conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute("""
+                    SELECT 
+                        column_name,
+                        data_type,
+                        is_nullable,
+                        column_default
+                    FROM information_schema.columns
+                    WHERE table_name = %s
+                    ORDER BY ordinal_position
+                """, (table_name,))
+
+                results = cursor.fetchall()
+                return [ColumnInfo._make(row) for row in results]
+
+            except Exception as e:
+                print(f"❌ Ошибка при получении информации о таблице: {e}")
+                return []
+            finally:
+                cursor.close()
+
+
+class PooledDBManager(DBManager):
+    """
+    Менеджер базы данных с пулом соединений.
+
+    Каждая операция берёт соединение из ограниченного пула и возвращает его
+    по завершении, поэтому один экземпляр можно безопасно использовать
+    из нескольких потоков.
+    """
+
+    def __init__(self, config: Config, minconn: int = 1, maxconn: int = 5):
+        """
+        Инициализация менеджера с пулом соединений.
+
+        Args:
+            config: Конфигурация подключения к БД
+            minconn: Минимальное количество открытых соединений
+            maxconn: Максимальное количество соединений в пуле
+        """
+        super().__init__(config)
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._admin_pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        self._admin_lock = threading.Lock()
+        # ThreadedConnectionPool не ждёт свободного соединения, а сразу
+        # выбрасывает PoolError, поэтому ожидание обеспечивает семафор
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def connect(self, database: str = None):
+        """
+        Создание пула соединений (если он ещё не создан).
+
+        Args:
+            database: Имя базы данных (если None, использует из конфига)
+        """
+        with self._pool_lock:
+            if self._pool is None or self._pool.closed:
+                params = self.config.get_db_params()
+                if database:
+                    params['dbname'] = database
+                self._pool = ThreadedConnectionPool(self.minconn, self.maxconn,
+                                                    connection_factory=self._connection_factory, **params)
+
+    def close(self):
+        """Закрытие всех соединений пула."""
+        with self._pool_lock:
+            for pool in (self._pool, self._admin_pool):
+                if pool is not None and not pool.closed:
+                    pool.closeall()
+            self._pool = None
+            self._admin_pool = None
+
+    @contextmanager
+    def _connection(self):
+        """
+        Соединение из пула на время одной операции.
+
+        Yields:
+            Соединение psycopg2
+        """
+        started = time.perf_counter()
+        self._slots.acquire()
+        waited = time.perf_counter() - started
 
         try:
-            cursor.execute("""
-                SELECT 
-                    column_name,
-                    data_type,
-                    is_nullable,
-                    column_default
-                FROM information_schema.columns
-                WHERE table_name = %s
-                ORDER BY ordinal_position
-            """, (table_name,))
-
-            results = cursor.fetchall()
-            return [
-                {
-                    'column': row[0],
-                    'type': row[1],
-                    'nullable': row[2],
-                    'default': row[3]
-                }
-                for row in results
-            ]
+            self.connect()
+            pool = self._pool
+            conn = pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._stats_lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
 
-        except Exception as e:
-            print(f"❌ Ошибка при получении информации о таблице: {e}")
-            return []
+        try:
+            yield conn
         finally:
-            cursor.close()
\ No newline at end of file
+            # Незавершённая транзакция не должна достаться следующему потоку
+            if not conn.closed and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            pool.putconn(conn, close=bool(conn.closed))
+            with self._stats_lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def _admin_connection(self):
+        """
+        Соединение со служебной БД postgres из отдельного пула на одно соединение.
+
+        Yields:
+            Соединение psycopg2
+        """
+        with self._pool_lock:
+            if self._admin_pool is None or self._admin_pool.closed:
+                self._admin_pool = ThreadedConnectionPool(
+                    0, 1, connection_factory=self._connection_factory,
+                    **self.config.get_postgres_params()
+                )
+            pool = self._admin_pool
+
+        with self._admin_lock:
+            conn = pool.getconn()
+            try:
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                yield conn
+            finally:
+                pool.putconn(conn, close=bool(conn.closed))
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Статистика использования пула соединений.
+
+        Returns:
+            Dict[str, Any]: Размер пула, выдачи соединений и время ожидания
+        """
+        with self._stats_lock:
+            return {
+                'minconn': self.minconn,
+                'maxconn': self.maxconn,
+                'in_use': self._in_use,
+                'peak_in_use': self._peak_in_use,
+                'checkouts': self._checkouts,
+                'wait_total_seconds': round(self._wait_total, 4),
+                'wait_avg_seconds': round(self._wait_total / self._checkouts, 6) if self._checkouts else 0.0,
+                'wait_max_seconds': round(self._wait_max, 4),
+            }
+
+
+def create_db_manager(config: Config) -> DBManager:
+    """
+    Создание менеджера БД для хранилища из настроек (DB_BACKEND).
+
+    Args:
+        config: Конфигурация
+
+    Returns:
+        DBManager: PooledDBManager для PostgreSQL или SQLiteDBManager для SQLite
+    """
+    backend = config.db_backend.lower()
+    if backend == 'sqlite':
+        from src.sqlite_manager import SQLiteDBManager
+        return SQLiteDBManager(config)
+    if backend in ('postgresql', 'postgres'):
+        return PooledDBManager(config, config.db_pool_min, config.db_pool_max)
+    raise ValueError(f"Неизвестное хранилище DB_BACKEND={config.db_backend}")
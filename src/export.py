@@ -0,0 +1,358 @@
+"""
+Выгрузка и загрузка снимков данных в колоночных форматах Parquet и Arrow.
+
+Таблицы employers и vacancies читаются из базы пакетами через серверный
+курсор и записываются наборами файлов с разбиением в стиле Hive:
+
+    <каталог>/employers/fetch_date=2024-03-01/part-0.parquet
+    <каталог>/vacancies/fetch_date=2024-03-01/employer_id=1740/part-0.parquet
+
+Дата выгрузки отделяет снимки друг от друга, а разбиение по работодателю
+позволяет читать данные одной компании, не открывая остальные файлы.
+Загрузка снимка идёт теми же пакетами через массовую вставку DBManager
+(COPY для PostgreSQL), поэтому память не зависит от размера снимка.
+
+Установка необязательной зависимости: pip install pyarrow
+"""
+
+import argparse
+import os
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from src.pipeline import iter_in_background
+
+try:
+    import pyarrow
+    import pyarrow.dataset as pyarrow_dataset
+except ImportError:  # pragma: no cover - зависимость необязательная
+    pyarrow = None
+    pyarrow_dataset = None
+
+# Формат файлов по названию: Arrow записывается в формате IPC (Feather v2)
+FORMATS = {'parquet': 'parquet', 'arrow': 'ipc'}
+
+TABLES = ('employers', 'vacancies')
+
+
+def _require_pyarrow():
+    if pyarrow is None:
+        raise ImportError("Для выгрузки в Parquet/Arrow нужен пакет pyarrow: pip install pyarrow")
+
+
+def table_schema(table: str):
+    """
+    Схема Arrow для таблицы в порядке её колонок.
+
+    Args:
+        table: Имя таблицы (employers или vacancies)
+
+    Returns:
+        pyarrow.Schema: Схема таблицы
+    """
+    _require_pyarrow()
+    if table == 'employers':
+        return pyarrow.schema([
+            ('id', pyarrow.int64()),
+            ('name', pyarrow.string()),
+            ('description', pyarrow.string()),
+            ('site_url', pyarrow.string()),
+            ('alternate_url', pyarrow.string()),
+            ('open_vacancies', pyarrow.int64()),
+        ])
+    if table == 'vacancies':
+        return pyarrow.schema([
+            ('id', pyarrow.int64()),
+            ('employer_id', pyarrow.int64()),
+            ('name', pyarrow.string()),
+            ('description', pyarrow.string()),
+            ('salary', pyarrow.int64()),
+            ('url', pyarrow.string()),
+            ('published_at', pyarrow.timestamp('s')),
+            ('salary_from', pyarrow.int64()),
+            ('salary_to', pyarrow.int64()),
+            ('currency', pyarrow.string()),
+            ('gross', pyarrow.bool_()),
+            ('salary_rub', pyarrow.int64()),
+        ])
+    raise ValueError(f"Неизвестная таблица: {table}")
+
+
+def _partitioning(table: str, by_date: bool = True):
+    """Разбиение набора файлов таблицы по дате выгрузки и работодателю."""
+    fields = [('fetch_date', pyarrow.string())] if by_date else []
+    if table == 'vacancies':
+        fields.append(('employer_id', pyarrow.int64()))
+    if not fields:
+        return None
+    return pyarrow_dataset.partitioning(pyarrow.schema(fields), flavor='hive')
+
+
+def _to_bool(value: Any) -> Optional[bool]:
+    """Логическое значение из базы (SQLite хранит его числом)."""
+    return value if value is None else bool(value)
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    """Дата публикации из базы: datetime (PostgreSQL) или строка ISO 8601 (SQLite)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value)[:19])
+
+
+def _record_batches(rows_batches: Iterator[List[Tuple[Any, ...]]], schema,
+                    fetch_date: str, stats: Dict[str, Any]):
+    """
+    Пакеты Arrow из пакетов строк с колонкой даты выгрузки.
+
+    Args:
+        rows_batches: Пакеты строк в порядке колонок схемы
+        schema: Схема таблицы
+        fetch_date: Дата выгрузки
+        stats: Статистика, в которую добавляется количество строк
+    """
+    names = schema.names
+    converters = {index: _to_timestamp if pyarrow.types.is_timestamp(field.type) else _to_bool
+                  for index, field in enumerate(schema)
+                  if pyarrow.types.is_timestamp(field.type) or pyarrow.types.is_boolean(field.type)}
+    for rows in rows_batches:
+        columns = [list(column) for column in zip(*rows)]
+        for index, convert in converters.items():
+            columns[index] = [convert(value) for value in columns[index]]
+        arrays = [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)]
+        arrays.append(pyarrow.array([fetch_date] * len(rows), type=pyarrow.string()))
+        stats['rows'] += len(rows)
+        yield pyarrow.RecordBatch.from_arrays(arrays, names=names + ['fetch_date'])
+
+
+def _directory_size(path: str) -> Tuple[int, int]:
+    files = 0
+    size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+
+def export_table(db_manager, table: str, directory: str, fmt: str = 'parquet',
+                 fetch_date: Optional[str] = None, batch_size: int = 50000,
+                 compression: str = 'zstd') -> Dict[str, Any]:
+    """
+    Выгрузка таблицы в набор файлов Parquet или Arrow.
+
+    Файлы снимка с той же датой выгрузки перезаписываются.
+
+    Args:
+        db_manager: Менеджер БД
+        table: Имя таблицы (employers или vacancies)
+        directory: Каталог снимков
+        fmt: Формат файлов (parquet или arrow)
+        fetch_date: Дата выгрузки в формате ГГГГ-ММ-ДД (по умолчанию сегодня)
+        batch_size: Количество строк в пакете чтения и в группе строк файла
+        compression: Сжатие колонок (zstd, snappy, lz4 или None)
+
+    Returns:
+        Dict[str, Any]: Статистика выгрузки (rows, files, bytes, seconds, rows_per_second)
+    """
+    _require_pyarrow()
+    if fmt not in FORMATS:
+        raise ValueError(f"Неизвестный формат {fmt}, доступны: {', '.join(FORMATS)}")
+
+    fetch_date = fetch_date or date.today().isoformat()
+    schema = table_schema(table)
+    file_format = FORMATS[fmt]
+    if file_format == 'parquet':
+        options = pyarrow_dataset.ParquetFileFormat().make_write_options(compression=compression)
+    else:
+        options = pyarrow_dataset.IpcFileFormat().make_write_options(compression=compression)
+
+    base_dir = os.path.join(directory, table)
+    stats = {'rows': 0, 'files': 0, 'bytes': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+    started = time.perf_counter()
+    # Пакеты пишутся потоками pyarrow, а чтение из базы целиком идёт в одном фоновом потоке
+    rows_batches = iter_in_background(
+        lambda: db_manager.iter_table_rows(table, schema.names, batch_size), 2, name='hh-export')
+    batches = _record_batches(rows_batches, schema, fetch_date, stats)
+    pyarrow_dataset.write_dataset(
+        batches, base_dir,
+        schema=schema.append(pyarrow.field('fetch_date', pyarrow.string())),
+        format=file_format,
+        file_options=options,
+        partitioning=_partitioning(table),
+        basename_template=f'part-{{i}}.{fmt}',
+        existing_data_behavior='delete_matching',
+        max_rows_per_group=batch_size,
+    )
+
+    elapsed = time.perf_counter() - started
+    stats['files'], stats['bytes'] = _directory_size(os.path.join(base_dir, f'fetch_date={fetch_date}'))
+    stats['seconds'] = round(elapsed, 3)
+    stats['rows_per_second'] = round(stats['rows'] / elapsed, 1) if elapsed else 0.0
+    print(f"✅ Выгружено {stats['rows']} строк {table} в {stats['files']} файлов {fmt} "
+          f"({stats['bytes'] / 1024 / 1024:.1f} МБ) за {stats['seconds']} с")
+    return stats
+
+
+def export_dataset(db_manager, directory: str, fmt: str = 'parquet',
+                   fetch_date: Optional[str] = None, batch_size: int = 50000,
+                   compression: str = 'zstd') -> Dict[str, Dict[str, Any]]:
+    """
+    Выгрузка снимка работодателей и вакансий.
+
+    Args:
+        db_manager: Менеджер БД
+        directory: Каталог снимков
+        fmt: Формат файлов (parquet или arrow)
+        fetch_date: Дата выгрузки в формате ГГГГ-ММ-ДД (по умолчанию сегодня)
+        batch_size: Количество строк в пакете
+        compression: Сжатие колонок
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Статистика выгрузки по таблицам
+    """
+    fetch_date = fetch_date or date.today().isoformat()
+    return {
+        table: export_table(db_manager, table, directory, fmt, fetch_date, batch_size, compression)
+        for table in TABLES
+    }
+
+
+def snapshot_dates(directory: str, table: str = 'vacancies') -> List[str]:
+    """
+    Даты выгрузки сохранённых снимков.
+
+    Args:
+        directory: Каталог снимков
+        table: Имя таблицы
+
+    Returns:
+        List[str]: Даты в порядке возрастания
+    """
+    try:
+        names = os.listdir(os.path.join(directory, table))
+    except FileNotFoundError:
+        return []
+    return sorted(name.split('=', 1)[1] for name in names if name.startswith('fetch_date='))
+
+
+def _detect_format(directory: str) -> str:
+    for root, _, names in os.walk(directory):
+        for name in names:
+            extension = os.path.splitext(name)[1].lstrip('.')
+            if extension in FORMATS:
+                return extension
+    return 'parquet'
+
+
+def import_table(db_manager, table: str, directory: str, fetch_date: str,
+                 fmt: Optional[str] = None, batch_size: int = 50000,
+                 use_copy: bool = True) -> Dict[str, Any]:
+    """
+    Загрузка таблицы из снимка.
+
+    Args:
+        db_manager: Менеджер БД
+        table: Имя таблицы (employers или vacancies)
+        directory: Каталог снимков
+        fetch_date: Дата выгрузки снимка
+        fmt: Формат файлов (по умолчанию определяется по расширению)
+        batch_size: Количество строк в пакете записи
+        use_copy: Пытаться ли использовать COPY
+
+    Returns:
+        Dict[str, Any]: Статистика загрузки (rows, failed, seconds, rows_per_second)
+    """
+    _require_pyarrow()
+    # Снимки разных дат могут быть в разных форматах: читаем только каталог нужной даты
+    snapshot_dir = os.path.join(directory, table, f'fetch_date={fetch_date}')
+    fmt = fmt or _detect_format(snapshot_dir)
+    schema = table_schema(table)
+    dataset = pyarrow_dataset.dataset(snapshot_dir, format=FORMATS[fmt],
+                                      partitioning=_partitioning(table, by_date=False))
+
+    stats = {'rows': 0, 'failed': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+    started = time.perf_counter()
+    for batch in dataset.to_batches(columns=schema.names, batch_size=batch_size):
+        if not batch.num_rows:
+            continue
+        columns = {name: batch.column(name).to_pylist() for name in schema.names}
+        if table == 'vacancies':
+            result = db_manager.bulk_insert_vacancy_columns(columns, use_copy=use_copy)
+        else:
+            rows = list(zip(*(columns[name] for name in schema.names)))
+            result = db_manager.bulk_insert_employers(rows, use_copy=use_copy)
+        stats['rows'] += result['rows']
+        stats['failed'] += result['failed']
+
+    elapsed = time.perf_counter() - started
+    stats['seconds'] = round(elapsed, 3)
+    stats['rows_per_second'] = round(stats['rows'] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def import_dataset(db_manager, directory: str, fetch_date: Optional[str] = None,
+                   batch_size: int = 50000, use_copy: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Загрузка снимка работодателей и вакансий в базу.
+
+    Записи с теми же ID обновляются. После загрузки пересчитываются агрегаты.
+
+    Args:
+        db_manager: Менеджер БД (таблицы должны существовать)
+        directory: Каталог снимков
+        fetch_date: Дата выгрузки снимка (по умолчанию последняя)
+        batch_size: Количество строк в пакете записи
+        use_copy: Пытаться ли использовать COPY
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Статистика загрузки по таблицам
+    """
+    _require_pyarrow()
+    if fetch_date is None:
+        dates = snapshot_dates(directory)
+        if not dates:
+            raise FileNotFoundError(f"В каталоге {directory} нет снимков")
+        fetch_date = dates[-1]
+
+    # Работодатели загружаются первыми из-за внешнего ключа вакансий
+    result = {
+        table: import_table(db_manager, table, directory, fetch_date,
+                            batch_size=batch_size, use_copy=use_copy)
+        for table in TABLES
+    }
+    db_manager.refresh_statistics()
+    print(f"✅ Снимок {fetch_date} загружен: {result['employers']['rows']} работодателей, "
+          f"{result['vacancies']['rows']} вакансий")
+    return result
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Выгрузка и загрузка снимков в Parquet/Arrow')
+    parser.add_argument('command', choices=('export', 'import'), help='Действие')
+    parser.add_argument('directory', help='Каталог снимков')
+    parser.add_argument('--format', default='parquet', choices=FORMATS, help='Формат файлов')
+    parser.add_argument('--fetch-date', default=None,
+                        help='Дата снимка ГГГГ-ММ-ДД (выгрузка - сегодня, загрузка - последний)')
+    parser.add_argument('--batch-size', type=int, default=50000, help='Строк в пакете')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    from src.config import Config
+    from src.db_manager import create_db_manager
+
+    args = parse_args(argv)
+    db_manager = create_db_manager(Config())
+    try:
+        if args.command == 'export':
+            export_dataset(db_manager, args.directory, args.format, args.fetch_date, args.batch_size)
+        else:
+            db_manager.create_tables()
+            import_dataset(db_manager, args.directory, args.fetch_date, args.batch_size)
+    finally:
+        db_manager.close()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
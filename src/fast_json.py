@@ -0,0 +1,115 @@
+"""
+Быстрый разбор JSON-ответов hh.ru.
+
+Если установлен msgspec, страницы вакансий и работодатели декодируются
+сразу в типизированные структуры, содержащие только сохраняемые в БД поля;
+остальные поля ответа пропускаются без создания объектов. Без msgspec
+используется orjson, а без него - стандартный модуль json.
+
+Установка необязательных зависимостей: pip install msgspec orjson
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - зависимость необязательная
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависимость необязательная
+    orjson = None
+
+Columns = Dict[str, List[Any]]
+
+if orjson is not None:
+    loads = orjson.loads
+    JSON_BACKEND = 'orjson'
+else:
+    loads = json.loads
+    JSON_BACKEND = 'json'
+
+BACKEND = 'msgspec' if msgspec is not None else JSON_BACKEND
+
+
+if msgspec is not None:
+    class Vacancy(msgspec.Struct):
+        """
+        Вакансия с полями, которые сохраняются в БД.
+
+        Порядок полей совпадает с src.normalize.VacancyFields.
+        """
+        id: str
+        name: str
+        snippet: Optional[Dict[str, Any]] = None
+        description: Optional[str] = None
+        salary: Optional[Dict[str, Any]] = None
+        alternate_url: str = ''
+        published_at: str = ''
+
+    class VacancyPage(msgspec.Struct):
+        """Страница ответа /vacancies."""
+        items: List[Vacancy] = []
+        pages: int = 0
+
+    class Employer(msgspec.Struct):
+        """Работодатель с полями, которые сохраняются в БД."""
+        id: str
+        name: str
+        description: Optional[str] = ''
+        site_url: Optional[str] = ''
+        alternate_url: Optional[str] = ''
+        open_vacancies: Optional[int] = 0
+
+    _page_decoder = msgspec.json.Decoder(VacancyPage)
+    _employer_decoder = msgspec.json.Decoder(Employer)
+
+
+def decode_vacancy_columns(raw: bytes, employer_id: Any) -> Columns:
+    """
+    Разбор ответа /vacancies сразу в колонки для записи в БД.
+
+    Колонки собирает src.normalize.build_columns - тот же код,
+    что и при разборе без типов.
+
+    Args:
+        raw: Тело ответа
+        employer_id: ID работодателя
+
+    Returns:
+        Columns: Значения по колонкам src.normalize.COLUMNS
+    """
+    from src.normalize import build_columns, vacancy_fields
+
+    if msgspec is not None:
+        try:
+            page = _page_decoder.decode(raw)
+        except msgspec.ValidationError:
+            # Неожиданная схема ответа - разбираем без типов
+            pass
+        else:
+            return build_columns(map(msgspec.structs.astuple, page.items), employer_id)
+
+    return build_columns(map(vacancy_fields, loads(raw).get('items', [])), employer_id)
+
+
+def decode_employer(raw: bytes) -> Dict[str, Any]:
+    """
+    Разбор ответа /employers/{id}.
+
+    С msgspec результат содержит только сохраняемые поля работодателя.
+
+    Args:
+        raw: Тело ответа
+
+    Returns:
+        Dict[str, Any]: Данные работодателя
+    """
+    if msgspec is not None:
+        try:
+            return msgspec.structs.asdict(_employer_decoder.decode(raw))
+        except msgspec.ValidationError:
+            pass
+    return loads(raw)
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+Модуль для кэширования ответов API hh.ru на диске.
+Содержит SQLite-кэш с TTL и вытеснением по LRU и адаптер requests,
+который отвечает из кэша и перепроверяет устаревшие записи
+условными запросами (If-None-Match / If-Modified-Since).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Заголовки, которые теряют смысл после распаковки тела ответа
+_SKIP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class ResponseCache:
+    """Постоянный кэш HTTP-ответов в базе SQLite."""
+
+    def __init__(self, path: str = '.hh_cache.sqlite', ttl: float = 600,
+                 max_bytes: int = 100 * 1024 * 1024):
+        """
+        Инициализация кэша.
+
+        Args:
+            path: Путь к файлу SQLite
+            ttl: Время (в секундах), в течение которого ответ отдаётся без запроса к API
+            max_bytes: Максимальный суммарный размер тел ответов
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._db.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)')
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, str], bytes, Optional[str], Optional[str], float]]:
+        """
+        Получение записи из кэша.
+
+        Args:
+            key: Ключ (URL запроса)
+
+        Returns:
+            Optional[Tuple]: Заголовки, тело, ETag, Last-Modified и время сохранения
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT headers, body, etag, last_modified, stored_at FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._db.commit()
+            return json.loads(row[0]), row[1], row[2], row[3], row[4]
+
+    def set(self, key: str, headers: Dict[str, str], body: bytes):
+        """
+        Сохранение ответа в кэш с вытеснением давно не использованных записей.
+
+        Args:
+            key: Ключ (URL запроса)
+            headers: Заголовки ответа
+            body: Тело ответа
+        """
+        now = time.time()
+        headers = {name: value for name, value in headers.items()
+                   if name.lower() not in _SKIP_HEADERS}
+        lookup = CaseInsensitiveDict(headers)
+
+        with self._lock:
+            self._db.execute("""
+                INSERT OR REPLACE INTO responses
+                    (key, headers, body, etag, last_modified, stored_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, json.dumps(headers), body, lookup.get('ETag'),
+                  lookup.get('Last-Modified'), now, now, len(body)))
+            self._evict()
+            self._db.commit()
+
+    def touch(self, key: str):
+        """
+        Продление срока жизни записи после ответа 304 Not Modified.
+
+        Args:
+            key: Ключ (URL запроса)
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute('UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?',
+                             (now, now, key))
+            self._db.commit()
+
+    def _evict(self):
+        """Удаление давно не использованных записей сверх max_bytes."""
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self._db.execute(
+                'SELECT key, size FROM responses ORDER BY accessed_at').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            self.record('evictions')
+
+    def record(self, counter: str):
+        """
+        Увеличение счётчика (hits, misses, revalidations или evictions).
+
+        Args:
+            counter: Имя счётчика
+        """
+        with self._counter_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def clear(self):
+        """Очистка кэша."""
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+            self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Счётчики работы кэша.
+
+        Returns:
+            Dict[str, Any]: Попадания, промахи, перепроверки и вытеснения
+        """
+        with self._lock:
+            entries, size = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size,
+        }
+
+
+class CachingAdapter(BaseAdapter):
+    """
+    HTTP-адаптер, отвечающий на GET-запросы из ResponseCache.
+
+    Свежие записи возвращаются без обращения к сети (и без расхода токенов
+    ограничителя частоты), устаревшие - перепроверяются условным запросом.
+    """
+
+    def __init__(self, inner: BaseAdapter, cache: ResponseCache):
+        """
+        Инициализация адаптера.
+
+        Args:
+            inner: Адаптер, выполняющий реальные запросы
+            cache: Кэш ответов
+        """
+        super().__init__()
+        self.inner = inner
+        self.cache = cache
+
+    def _build_response(self, request, headers: Dict[str, str], body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return self.inner.send(request, **kwargs)
+
+        key = request.url
+        entry = self.cache.get(key)
+
+        if entry is not None:
+            headers, body, etag, last_modified, stored_at = entry
+            if time.time() - stored_at < self.cache.ttl:
+                self.cache.record('hits')
+                return self._build_response(request, headers, body)
+
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if last_modified:
+                request.headers['If-Modified-Since'] = last_modified
+
+        response = self.inner.send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            self.cache.record('revalidations')
+            self.cache.touch(key)
+            return self._build_response(request, entry[0], entry[1])
+
+        self.cache.record('misses')
+        if response.status_code == 200:
+            self.cache.set(key, dict(response.headers), response.content)
+        return response
+
+    def close(self):
+        self.inner.close()
\ No newline at end of file
@@ -0,0 +1,340 @@
+"""
+Замер запросов к базе данных и журнал медленных запросов.
+
+Каждое выполнение курсора (execute, executemany, COPY) учитывается
+в гистограмме длительности по методу DBManager, из которого оно вызвано,
+и по виду запроса (select, insert, copy...). Вместе с ней считаются
+строки и ошибки. Запросы дольше порога попадают в журнал медленных
+запросов, при желании - с планом выполнения: для SELECT - EXPLAIN
+(ANALYZE, BUFFERS), для остальных - EXPLAIN без выполнения запроса.
+
+Статистика выгружается в текстовом формате Prometheus (to_prometheus)
+или в JSON (to_dict).
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import psycopg2.extensions
+
+# Границы интервалов гистограммы длительности, с (как у клиентов Prometheus)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Запросы, для которых можно получить план выполнения
+EXPLAINABLE = {'select', 'with', 'insert', 'update', 'delete', 'execute', 'values'}
+
+# Запросы, план которых получается с ANALYZE (запрос выполняется повторно)
+ANALYZABLE = {'select'}
+
+_SQL_LIMIT = 2000
+
+
+def query_text(query: Any, cursor=None) -> str:
+    """Текст запроса из строки, байтов или объекта psycopg2.sql."""
+    if isinstance(query, str):
+        return query
+    if isinstance(query, bytes):
+        return query.decode('utf-8', 'replace')
+    if cursor is not None and hasattr(query, 'as_string'):
+        return query.as_string(cursor)
+    return str(query)
+
+
+def operation(query: Any) -> str:
+    """Вид запроса - первое ключевое слово в нижнем регистре."""
+    head = query[:32].decode('ascii', 'replace') if isinstance(query, bytes) else str(query)[:64]
+    words = head.lstrip(' \t\r\n(').split(None, 1)
+    return words[0].lower() if words else ''
+
+
+class QueryMetrics:
+    """Гистограммы длительности запросов и журнал медленных запросов."""
+
+    def __init__(self, slow_query_ms: float = 0, explain: bool = False,
+                 log_path: str = '', keep_slow: int = 100):
+        """
+        Инициализация статистики.
+
+        Args:
+            slow_query_ms: Порог медленного запроса, мс (0 - журнал отключён)
+            explain: Получать ли план выполнения медленных запросов
+                (для SELECT - EXPLAIN ANALYZE, который выполняет запрос повторно)
+            log_path: Файл журнала медленных запросов в формате JSON Lines
+            keep_slow: Сколько последних медленных запросов хранить в памяти
+        """
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self.log_path = log_path
+        self.sources: Tuple[str, ...] = ()
+        self._series: Dict[Tuple[str, str], List[Any]] = {}
+        self._slow = deque(maxlen=keep_slow)
+        self._lock = threading.Lock()
+
+    def bind(self, manager_class: type, base_class: type):
+        """
+        Файлы классов менеджера, по которым определяется вызывающий метод.
+
+        Args:
+            manager_class: Класс менеджера БД
+            base_class: Базовый класс (DBManager)
+        """
+        self.sources = tuple({
+            sys.modules[cls.__module__].__file__
+            for cls in manager_class.__mro__
+            if issubclass(cls, base_class) and getattr(sys.modules.get(cls.__module__), '__file__', None)
+        })
+
+    def _calling_method(self) -> str:
+        """Самый внешний метод менеджера в стеке вызовов текущего запроса."""
+        frame = sys._getframe(2)
+        method = None
+        while frame is not None:
+            if frame.f_code.co_filename in self.sources:
+                method = frame.f_code.co_name
+            elif method is not None:
+                break
+            frame = frame.f_back
+        return method or 'unknown'
+
+    def observe(self, query: Any, seconds: float, rows: int,
+                error: Optional[BaseException] = None,
+                explain: Optional[Callable[[], str]] = None):
+        """
+        Учёт одного выполнения запроса.
+
+        Args:
+            query: Текст запроса
+            seconds: Длительность
+            rows: Количество строк (возвращённых или изменённых, если известно)
+            error: Исключение, если запрос завершился ошибкой
+            explain: Функция получения плана выполнения запроса
+        """
+        method = self._calling_method()
+        kind = operation(query)
+        slow = bool(self.slow_query_ms) and error is None and seconds * 1000 >= self.slow_query_ms
+
+        with self._lock:
+            series = self._series.get((method, kind))
+            if series is None:
+                # Количество по интервалам, сумма, количество, строки, ошибки, медленные, максимум
+                series = self._series[(method, kind)] = [[0] * (len(BUCKETS) + 1), 0.0, 0, 0, 0, 0, 0.0]
+            index = 0
+            while index < len(BUCKETS) and seconds > BUCKETS[index]:
+                index += 1
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+            series[3] += max(rows or 0, 0)
+            series[4] += error is not None
+            series[5] += slow
+            series[6] = max(series[6], seconds)
+
+        if slow:
+            self._log_slow(method, kind, query, seconds, explain)
+
+    def _log_slow(self, method: str, kind: str, query: Any, seconds: float,
+                  explain: Optional[Callable[[], str]]):
+        plan = None
+        if self.explain and explain is not None and kind in EXPLAINABLE:
+            try:
+                plan = explain()
+            except Exception as e:
+                plan = f'EXPLAIN не выполнен: {e}'
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'method': method,
+            'operation': kind,
+            'ms': round(seconds * 1000, 3),
+            'query': ' '.join(query_text(query).split())[:_SQL_LIMIT],
+            'plan': plan,
+        }
+        with self._lock:
+            self._slow.append(entry)
+        print(f"⚠️ Медленный запрос в {method}: {entry['ms']} мс ({kind})")
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            except OSError as e:
+                print(f"⚠️ Не удалось записать журнал медленных запросов: {e}")
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Последние медленные запросы (новые в конце)."""
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self):
+        """Обнуление статистики и журнала в памяти."""
+        with self._lock:
+            self._series.clear()
+            self._slow.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Статистика в формате JSON.
+
+        Returns:
+            Dict[str, Any]: Границы интервалов, серии по (method, operation)
+                с накопленным количеством по интервалам и медленные запросы
+        """
+        with self._lock:
+            queries = []
+            for (method, kind), (counts, total, count, rows, errors, slow, peak) in sorted(self._series.items()):
+                cumulative = []
+                running = 0
+                for value in counts:
+                    running += value
+                    cumulative.append(running)
+                queries.append({
+                    'method': method,
+                    'operation': kind,
+                    'count': count,
+                    'sum_seconds': round(total, 6),
+                    'avg_ms': round(total / count * 1000, 3) if count else 0.0,
+                    'max_ms': round(peak * 1000, 3),
+                    'buckets': cumulative,
+                    'rows': rows,
+                    'errors': errors,
+                    'slow': slow,
+                })
+            return {
+                'buckets': list(BUCKETS) + ['+Inf'],
+                'slow_query_ms': self.slow_query_ms,
+                'queries': queries,
+                'slow_queries': list(self._slow),
+            }
+
+    def to_prometheus(self, prefix: str = 'hh_db') -> str:
+        """
+        Статистика в текстовом формате Prometheus.
+
+        Args:
+            prefix: Префикс имён метрик
+
+        Returns:
+            str: Гистограмма длительности и счётчики строк, ошибок и медленных запросов
+        """
+        data = self.to_dict()
+        lines = [
+            f'# HELP {prefix}_query_duration_seconds Длительность запросов к БД',
+            f'# TYPE {prefix}_query_duration_seconds histogram',
+        ]
+        for item in data['queries']:
+            labels = f'method="{item["method"]}",operation="{item["operation"]}"'
+            for bound, value in zip(data['buckets'], item['buckets']):
+                lines.append(f'{prefix}_query_duration_seconds_bucket{{{labels},le="{bound}"}} {value}')
+            lines.append(f'{prefix}_query_duration_seconds_sum{{{labels}}} {item["sum_seconds"]}')
+            lines.append(f'{prefix}_query_duration_seconds_count{{{labels}}} {item["count"]}')
+
+        for name, key, text in (('query_rows_total', 'rows', 'Строки, возвращённые или изменённые запросами'),
+                                ('query_errors_total', 'errors', 'Запросы, завершившиеся ошибкой'),
+                                ('slow_queries_total', 'slow', 'Запросы дольше порога')):
+            lines.append(f'# HELP {prefix}_{name} {text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for item in data['queries']:
+                labels = f'method="{item["method"]}",operation="{item["operation"]}"'
+                lines.append(f'{prefix}_{name}{{{labels}}} {item[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """
+        Сохранение статистики в файл: .json - JSON, иначе формат Prometheus.
+
+        Args:
+            path: Путь к файлу
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            else:
+                f.write(self.to_prometheus())
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    """Курсор psycopg2, передающий каждое выполнение в QueryMetrics соединения."""
+
+    def execute(self, query, vars=None):
+        if not isinstance(query, (str, bytes)):
+            # Запрос из psycopg2.sql собирается заранее, чтобы знать его вид
+            query = query.as_string(self)
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception as e:
+            self.connection.metrics.observe(query, time.perf_counter() - started, 0, e)
+            raise
+        self.connection.metrics.observe(query, time.perf_counter() - started, self.rowcount,
+                                        explain=None if self.name else lambda: self._explain(query, vars))
+        return result
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            result = super().executemany(query, vars_list)
+        except Exception as e:
+            self.connection.metrics.observe(query, time.perf_counter() - started, 0, e)
+            raise
+        self.connection.metrics.observe(query, time.perf_counter() - started, self.rowcount)
+        return result
+
+    def copy_expert(self, sql, file, size=8192):
+        started = time.perf_counter()
+        try:
+            result = super().copy_expert(sql, file, size)
+        except Exception as e:
+            self.connection.metrics.observe(sql, time.perf_counter() - started, 0, e)
+            raise
+        self.connection.metrics.observe(sql, time.perf_counter() - started, self.rowcount)
+        return result
+
+    def _explain(self, query, vars) -> Optional[str]:
+        """
+        План выполнения запроса на том же соединении.
+
+        SELECT выполняется ещё раз (EXPLAIN ANALYZE) под точкой сохранения,
+        которая затем откатывается. Остальные запросы не выполняются: ANALYZE
+        повторил бы вставку, сдвинув последовательности и вызвав триггеры.
+        """
+        if self.connection.autocommit:
+            return None
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if operation(query) in ANALYZABLE else 'EXPLAIN '
+        text = prefix.encode() + query if isinstance(query, bytes) else prefix + query_text(query, self)
+        cursor = psycopg2.extensions.cursor(self.connection)
+        try:
+            cursor.execute('SAVEPOINT explain_slow_query')
+            try:
+                cursor.execute(text, vars)
+                return '\n'.join(row[0] for row in cursor.fetchall())
+            finally:
+                cursor.execute('ROLLBACK TO SAVEPOINT explain_slow_query')
+                cursor.execute('RELEASE SAVEPOINT explain_slow_query')
+        finally:
+            cursor.close()
+
+
+class InstrumentedConnection(psycopg2.extensions.connection):
+    """Соединение psycopg2, курсоры которого замеряют запросы."""
+
+    metrics: QueryMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = InstrumentedCursor
+
+
+def instrumented_connection(metrics: QueryMetrics) -> type:
+    """
+    Класс соединения для psycopg2.connect(connection_factory=...), пишущий в metrics.
+
+    Args:
+        metrics: Статистика запросов
+
+    Returns:
+        type: Подкласс InstrumentedConnection
+    """
+    return type('InstrumentedConnection', (InstrumentedConnection,), {'metrics': metrics})
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Типизированные записи данных.
+
+Работодатели, вакансии и строки результатов запросов представлены
+именованными кортежами: у них нет словаря атрибутов на каждый экземпляр,
+а поля читаются по имени (vacancy.salary) или по индексу. Порядок полей
+Employer и Vacancy совпадает с колонками таблиц, поэтому записи
+передаются в COPY и execute_values без преобразования.
+
+Для совместимости со словарями у каждой записи есть метод _asdict().
+"""
+
+from datetime import datetime
+from typing import Any, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class Employer(NamedTuple):
+    """Работодатель, подготовленный для сохранения в БД."""
+    id: Union[int, str]
+    name: str
+    description: Optional[str] = ''
+    site_url: Optional[str] = ''
+    alternate_url: Optional[str] = ''
+    open_vacancies: Optional[int] = 0
+
+
+class Vacancy(NamedTuple):
+    """
+    Вакансия, подготовленная для сохранения в БД.
+
+    salary - средняя зарплата в валюте вакансии, salary_rub - она же
+    в рублях на руки (см. src.currency).
+    """
+    id: Union[int, str]
+    employer_id: int
+    name: str
+    description: str = ''
+    salary: Optional[int] = None
+    url: str = ''
+    published_at: Any = ''
+    salary_from: Optional[int] = None
+    salary_to: Optional[int] = None
+    currency: Optional[str] = None
+    gross: Optional[bool] = None
+    salary_rub: Optional[int] = None
+
+
+class CompanyVacancies(NamedTuple):
+    """Компания и количество её вакансий."""
+    company: str
+    count: int
+
+
+class VacancyInfo(NamedTuple):
+    """Вакансия в выдаче запросов: компания, название, зарплата в рублях, ссылка."""
+    company: str
+    vacancy: str
+    salary: Optional[int]
+    url: str
+
+
+class SearchResult(NamedTuple):
+    """Вакансия в результатах полнотекстового поиска."""
+    company: str
+    vacancy: str
+    salary: Optional[int]
+    url: str
+    rank: float
+
+
+class SalaryHistogram(NamedTuple):
+    """Гистограмма зарплат: границы интервалов (на одну больше) и количество вакансий."""
+    edges: Tuple[float, ...]
+    counts: Tuple[int, ...]
+
+
+class EmployerSalaryStats(NamedTuple):
+    """Распределение зарплат в рублях у работодателя."""
+    employer_id: int
+    company: str
+    vacancies: int
+    median: float
+    p90: float
+
+
+class DeadLetter(NamedTuple):
+    """Строка, отклонённая базой при загрузке."""
+    table: str
+    record_id: Optional[str]
+    payload: Any
+    error: str
+    failed_at: datetime
+
+
+class ColumnInfo(NamedTuple):
+    """Описание колонки таблицы."""
+    column: str
+    type: str
+    nullable: str
+    default: Optional[str]
+
+
+def as_row(record: Union[Mapping[str, Any], Sequence[Any]],
+           columns: Sequence[str]) -> Tuple[Any, ...]:
+    """
+    Строка для записи в БД из типизированной записи или словаря.
+
+    Args:
+        record: Employer, Vacancy (поля в порядке колонок) или словарь
+        columns: Колонки таблицы
+
+    Returns:
+        Tuple[Any, ...]: Значения в порядке колонок
+    """
+    if isinstance(record, tuple):
+        return record
+    if isinstance(record, Mapping):
+        return tuple(record[col] for col in columns)
+    return tuple(record)
\ No newline at end of file
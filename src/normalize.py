@@ -0,0 +1,243 @@
+"""
+Пакетная нормализация страниц вакансий hh.ru.
+Преобразует сырые ответы /vacancies (байты JSON) сразу в колонки
+для записи в БД и умеет распределять страницы по пулу процессов,
+чтобы разбор JSON и подготовка данных не упирались в одно ядро.
+"""
+
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from src.currency import normalize_salary_columns
+from src.fast_json import decode_vacancy_columns, loads
+from src.profiling import span
+from src.utils import parse_salary
+
+# Колонки нормализованной страницы (совпадают с DBManager.VACANCY_COLUMNS)
+COLUMNS = ('id', 'employer_id', 'name', 'description', 'salary', 'url', 'published_at',
+           'salary_from', 'salary_to', 'currency', 'gross', 'salary_rub')
+
+_PAGES_RE = re.compile(rb'"pages"\s*:\s*(\d+)')
+
+Columns = Dict[str, List[Any]]
+
+# ID, название, snippet, описание, зарплата, ссылка и дата публикации вакансии
+VacancyFields = Tuple[Any, str, Optional[Dict[str, Any]], Optional[str],
+                      Optional[Dict[str, Any]], str, str]
+
+
+def empty_columns() -> Columns:
+    """Пустой набор колонок."""
+    return {name: [] for name in COLUMNS}
+
+
+def page_count(raw: bytes) -> int:
+    """
+    Количество страниц из сырого ответа /vacancies без полного разбора JSON.
+
+    Поле pages есть только на верхнем уровне ответа и стоит после items,
+    поэтому ищется последнее вхождение.
+
+    Args:
+        raw: Тело ответа
+
+    Returns:
+        int: Значение поля pages
+    """
+    matches = _PAGES_RE.findall(raw[-512:]) or _PAGES_RE.findall(raw)
+    if matches:
+        return int(matches[-1])
+    return loads(raw).get('pages', 0)
+
+
+def vacancy_fields(vacancy: Dict[str, Any]) -> VacancyFields:
+    """
+    Поля вакансии из ответа API в порядке VacancyFields.
+
+    Args:
+        vacancy: Вакансия из ответа API
+
+    Returns:
+        VacancyFields: ID, название, snippet, описание, зарплата, ссылка, дата публикации
+    """
+    return (vacancy['id'], vacancy['name'], vacancy.get('snippet'), vacancy.get('description'),
+            vacancy.get('salary'), vacancy.get('alternate_url', ''), vacancy.get('published_at', ''))
+
+
+def build_columns(records: Iterable[VacancyFields], employer_id: Any) -> Columns:
+    """
+    Подготовка вакансий в колоночном виде.
+
+    Общая для разбора в словари (normalize_items) и типизированного
+    разбора src.fast_json, поэтому оба пути дают одинаковые колонки.
+    Результат совпадает с prepare_vacancy_data для каждой вакансии.
+
+    Args:
+        records: Поля вакансий (см. vacancy_fields)
+        employer_id: ID работодателя
+
+    Returns:
+        Columns: Значения по колонкам COLUMNS
+    """
+    ids, names, descriptions, salaries, urls, published = [], [], [], [], [], []
+    salaries_from, salaries_to, currencies, gross = [], [], [], []
+
+    for vac_id, name, snippet, description, salary, url, published_at in records:
+        if snippet:
+            description = snippet.get('responsibility', '')
+        else:
+            description = description or ''
+
+        ids.append(vac_id)
+        names.append(name)
+        descriptions.append(description)
+        salary = salary or {}
+        salaries.append(parse_salary(salary))
+        urls.append(url)
+        published.append(published_at)
+        salaries_from.append(salary.get('from'))
+        salaries_to.append(salary.get('to'))
+        currencies.append(salary.get('currency'))
+        gross.append(salary.get('gross'))
+
+    columns = {
+        'id': ids,
+        'employer_id': [employer_id] * len(ids),
+        'name': names,
+        'description': descriptions,
+        'salary': salaries,
+        'url': urls,
+        'published_at': published,
+        'salary_from': salaries_from,
+        'salary_to': salaries_to,
+        'currency': currencies,
+        'gross': gross,
+    }
+    normalize_salary_columns(columns)
+    return columns
+
+
+def normalize_items(items: Sequence[Dict[str, Any]], employer_id: int) -> Columns:
+    """
+    Подготовка вакансий страницы в колоночном виде.
+
+    Args:
+        items: Вакансии из ответа API
+        employer_id: ID работодателя
+
+    Returns:
+        Columns: Значения по колонкам COLUMNS
+    """
+    return build_columns(map(vacancy_fields, items), employer_id)
+
+
+def normalize_page(raw: bytes, employer_id: int) -> Columns:
+    """
+    Разбор сырого ответа /vacancies и подготовка его вакансий.
+
+    Разбор выполняется быстрым декодером src.fast_json, если он доступен.
+
+    Args:
+        raw: Тело ответа
+        employer_id: ID работодателя
+
+    Returns:
+        Columns: Значения по колонкам COLUMNS
+    """
+    return decode_vacancy_columns(raw, employer_id)
+
+
+def _normalize_task(task: Tuple[Any, int, bytes]) -> Tuple[Any, int, Columns]:
+    emp_id, page, raw = task
+    # Разбор и подготовка выполняются одним проходом декодера
+    with span('normalize', employer_id=emp_id, page=page, bytes=len(raw)):
+        return emp_id, page, normalize_page(raw, emp_id)
+
+
+def normalize_pages(pages: Iterable[Tuple[Any, int, bytes]], processes: int = 0,
+                    in_flight: int = 4) -> Iterator[Tuple[Any, int, Columns]]:
+    """
+    Нормализация потока сырых страниц, при необходимости в пуле процессов.
+
+    Порядок страниц сохраняется. В пул одновременно передаётся не более
+    processes * in_flight страниц, поэтому поток может быть сколь угодно длинным.
+
+    Args:
+        pages: Поток (ID работодателя, номер страницы, тело ответа)
+        processes: Количество процессов (0 - в текущем процессе)
+        in_flight: Количество страниц в работе на один процесс
+
+    Yields:
+        Tuple[Any, int, Columns]: ID работодателя, номер страницы, колонки
+    """
+    if processes <= 0:
+        for task in pages:
+            yield _normalize_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending: deque = deque()
+        for task in pages:
+            pending.append(executor.submit(_normalize_task, task))
+            if len(pending) >= processes * in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def merge_columns(target: Columns, source: Columns):
+    """
+    Добавление колонок source в конец target.
+
+    Args:
+        target: Накопитель колонок
+        source: Добавляемые колонки
+    """
+    for name in COLUMNS:
+        target[name].extend(source[name])
+
+
+def column_rows(columns: Columns, order: Sequence[str] = COLUMNS) -> List[Tuple[Any, ...]]:
+    """
+    Преобразование колонок в строки для записи в БД.
+
+    Args:
+        columns: Значения по колонкам
+        order: Порядок колонок в строке
+
+    Returns:
+        List[Tuple[Any, ...]]: Строки
+    """
+    return list(zip(*(columns[name] for name in order)))
+
+
+def iter_normalized_batches(pages: Iterable[Tuple[Any, int, bytes]], batch_size: int = 1000,
+                            processes: int = 0, counts: Optional[Dict[Any, int]] = None,
+                            seen_ids: Optional[Dict[Any, Set[int]]] = None) -> Iterator[Columns]:
+    """
+    Сбор нормализованных страниц в пакеты колонок.
+
+    Args:
+        pages: Поток (ID работодателя, номер страницы, тело ответа)
+        batch_size: Минимальное количество вакансий в пакете (кроме последнего)
+        processes: Количество процессов нормализации
+        counts: Словарь для подсчёта вакансий по работодателям
+        seen_ids: Словарь для сбора ID полученных вакансий по работодателям
+
+    Yields:
+        Columns: Пакет вакансий в колоночном виде
+    """
+    batch = empty_columns()
+    for emp_id, _, columns in normalize_pages(pages, processes):
+        size = len(columns['id'])
+        if counts is not None:
+            counts[emp_id] = counts.get(emp_id, 0) + size
+        if seen_ids is not None:
+            seen_ids.setdefault(emp_id, set()).update(int(vac_id) for vac_id in columns['id'])
+        merge_columns(batch, columns)
+        if len(batch['id']) >= batch_size:
+            yield batch
+            batch = empty_columns()
+    if batch['id']:
+        yield batch
\ No newline at end of file
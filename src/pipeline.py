@@ -0,0 +1,429 @@
+"""
+Потоковый конвейер загрузки вакансий с hh.ru в базу данных.
+Страницы API проходят через подготовку данных и собираются в пакеты
+ограниченного размера, которые записываются в БД по мере заполнения.
+"""
+
+import asyncio
+import queue
+import threading
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from src.models import Vacancy
+from src.normalize import column_rows, iter_normalized_batches, normalize_pages
+from src.profiling import span
+from src.utils import prepare_vacancy_data
+
+# Маркер окончания данных в очереди между стадиями
+_DONE = object()
+
+
+def iter_prepared_vacancies(pages: Iterable[Tuple[int, int, List[Dict[str, Any]]]],
+                            counts: Dict[int, int] = None,
+                            seen_ids: Dict[int, Set[int]] = None) -> Iterator[Vacancy]:
+    """
+    Подготовка вакансий из потока страниц API.
+
+    Args:
+        pages: Поток (ID работодателя, номер страницы, вакансии)
+        counts: Словарь для подсчёта вакансий по работодателям
+        seen_ids: Словарь для сбора ID полученных вакансий по работодателям
+
+    Yields:
+        Vacancy: Подготовленные данные вакансии
+    """
+    for emp_id, page, items in pages:
+        if counts is not None:
+            counts[emp_id] = counts.get(emp_id, 0) + len(items)
+        if seen_ids is not None:
+            seen_ids.setdefault(emp_id, set()).update(int(item['id']) for item in items)
+        # Страница готовится целиком, чтобы её подготовка замерялась отдельно от записи
+        with span('normalize', employer_id=emp_id, page=page, rows=len(items)):
+            prepared = [prepare_vacancy_data(vacancy, emp_id) for vacancy in items]
+        yield from prepared
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Разбиение потока на пакеты фиксированного размера.
+
+    Args:
+        iterable: Исходный поток
+        size: Размер пакета
+
+    Yields:
+        List[Any]: Очередной пакет (последний может быть меньше)
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _put(channel: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """
+    Помещение элемента в очередь с проверкой сигнала остановки.
+
+    Returns:
+        bool: False, если конвейер остановлен
+    """
+    while not stop.is_set():
+        try:
+            channel.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def iter_in_background(produce: Callable[[], Iterable[Any]], queue_size: int,
+                       name: str = 'hh-fetch') -> Iterator[Any]:
+    """
+    Поток элементов, которые производятся в отдельном фоновом потоке.
+
+    Производитель целиком работает в одном потоке и передаёт элементы
+    через очередь ограниченного размера, поэтому результат можно
+    читать из любого потока. Исключение производителя пробрасывается читателю.
+
+    Args:
+        produce: Функция, возвращающая поток элементов
+        queue_size: Максимальное количество элементов в очереди
+        name: Имя фонового потока
+
+    Yields:
+        Any: Элементы производителя
+    """
+    channel: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def run():
+        try:
+            for item in produce():
+                if not _put(channel, item, stop):
+                    return
+            _put(channel, _DONE, stop)
+        except Exception as e:
+            _put(channel, e, stop)
+
+    producer = threading.Thread(target=run, name=name, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = channel.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _pump(produce: Callable[[], Iterable[Any]], consume: Callable[[Any], None],
+          queue_size: int):
+    """
+    Передача элементов из фонового потока-производителя потребителю.
+
+    Потребитель вызывается в текущем потоке (см. iter_in_background).
+
+    Args:
+        produce: Функция, возвращающая поток элементов
+        consume: Обработчик элемента
+        queue_size: Максимальное количество элементов в очереди
+    """
+    for item in iter_in_background(produce, queue_size):
+        consume(item)
+
+
+def run_vacancy_pipeline(api, db_manager, employer_ids: List[int],
+                         batch_size: int = 1000, queue_size: int = 4,
+                         concurrent: bool = True,
+                         date_from: Optional[Dict[Any, str]] = None,
+                         seen_ids: Optional[Dict[int, Set[int]]] = None,
+                         processes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Загрузка вакансий работодателей в БД потоковым конвейером.
+
+    Сетевая стадия работает в отдельном потоке и передаёт готовые пакеты
+    писателю через очередь ограниченного размера. Когда очередь заполнена,
+    загрузка страниц приостанавливается, поэтому в памяти одновременно
+    находится не более queue_size + 1 пакетов.
+
+    Если задан processes, страницы запрашиваются без разбора JSON
+    и нормализуются в колонки пакетно (src.normalize), в том числе
+    в пуле из processes процессов.
+
+    Args:
+        api: Экземпляр HeadHunterAPI
+        db_manager: Менеджер базы данных
+        employer_ids: Список ID работодателей
+        batch_size: Количество вакансий в пакете записи
+        queue_size: Максимальное количество пакетов в очереди
+        concurrent: Загружать страницы параллельно
+        date_from: Нижняя граница даты публикации по ID работодателя
+        seen_ids: Словарь для сбора ID полученных вакансий по работодателям
+        processes: Количество процессов нормализации (None - построчная подготовка,
+                   0 - пакетная в текущем процессе)
+
+    Returns:
+        Dict[str, Any]: Статистика (vacancies, batches, per_employer, failed)
+    """
+    counts: Dict[int, int] = {}
+    failed: Set[Any] = set()
+    stats = {'vacancies': 0, 'batches': 0, 'per_employer': counts, 'failed': failed}
+    columnar = processes is not None
+
+    def produce() -> Iterator[Any]:
+        pages = api.iter_vacancy_pages(employer_ids, concurrent=concurrent,
+                                       date_from=date_from, failed=failed, raw=columnar)
+        if columnar:
+            return iter_normalized_batches(pages, batch_size, processes, counts, seen_ids)
+        return batched(iter_prepared_vacancies(pages, counts, seen_ids), batch_size)
+
+    def write(batch: Any):
+        if columnar:
+            result = db_manager.bulk_insert_vacancy_columns(batch)
+        else:
+            result = db_manager.bulk_insert_vacancies(batch)
+        stats['vacancies'] += result['rows']
+        stats['batches'] += 1
+
+    _pump(produce, write, queue_size)
+    return stats
+
+
+def run_incremental_sync(api, db_manager, employers_data: List[Dict[str, Any]],
+                         batch_size: int = 1000, concurrent: bool = True,
+                         processes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Инкрементальное обновление вакансий работодателей.
+
+    Для работодателей с сохранённой отметкой запрашиваются только вакансии,
+    опубликованные после неё (параметр date_from). Закрытые вакансии
+    обнаруживаются сравнением числа сохранённых вакансий с open_vacancies
+    работодателя: только при расхождении список его вакансий загружается
+    полностью, а отсутствующие в нём удаляются. Работодатели без отметки
+    загружаются полностью. Если часть страниц работодателя получить
+    не удалось, его вакансии не удаляются, а отметка не сдвигается.
+    Вакансии не удаляются и тогда, когда полный список неполон: API
+    отдаёт не больше api.MAX_DEPTH вакансий, или список оказался пустым.
+
+    Args:
+        api: Экземпляр HeadHunterAPI
+        db_manager: Менеджер базы данных
+        employers_data: Свежие данные работодателей из API
+        batch_size: Количество вакансий в пакете записи
+        concurrent: Загружать страницы параллельно
+        processes: Количество процессов нормализации (см. run_vacancy_pipeline)
+
+    Returns:
+        Dict[str, Any]: Статистика (vacancies, per_employer, reconciled, deleted, failed)
+    """
+    employers = {int(emp['id']): emp for emp in employers_data}
+    watermarks = db_manager.get_sync_state()
+
+    incremental_ids = [emp_id for emp_id in employers if emp_id in watermarks]
+    full_ids = [emp_id for emp_id in employers if emp_id not in watermarks]
+
+    stats = run_vacancy_pipeline(
+        api, db_manager, incremental_ids, batch_size, concurrent=concurrent,
+        date_from={emp_id: watermarks[emp_id].isoformat() for emp_id in incremental_ids},
+        processes=processes
+    )
+    per_employer = dict(stats['per_employer'])
+    total = stats['vacancies']
+    failed = set(stats['failed'])
+
+    # Полная загрузка нужна новым работодателям и тем, у кого закрылись вакансии
+    stored = db_manager.get_vacancy_counts(incremental_ids)
+    reconcile_ids = [emp_id for emp_id in incremental_ids
+                     if stored.get(emp_id, 0) > employers[emp_id].get('open_vacancies', 0)]
+
+    seen_ids: Dict[int, Set[int]] = {}
+    full_stats = run_vacancy_pipeline(api, db_manager, full_ids + reconcile_ids, batch_size,
+                                      concurrent=concurrent, seen_ids=seen_ids,
+                                      processes=processes)
+    total += full_stats['vacancies']
+    failed |= full_stats['failed']
+    for emp_id, count in full_stats['per_employer'].items():
+        per_employer[emp_id] = per_employer.get(emp_id, 0) + count
+
+    deleted = 0
+    for emp_id in full_ids + reconcile_ids:
+        if emp_id in failed:
+            continue
+        seen = seen_ids.get(emp_id, set())
+        open_vacancies = employers[emp_id].get('open_vacancies', 0) or 0
+        if not seen:
+            if emp_id in stored:
+                print(f"⚠️ Работодатель {emp_id}: API вернул пустой список вакансий, "
+                      f"закрытые вакансии не удаляются")
+            continue
+        if len(seen) >= api.MAX_DEPTH and len(seen) < open_vacancies:
+            # Вакансии за пределами окна пагинации могут быть открыты
+            print(f"⚠️ Работодатель {emp_id}: получено {len(seen)} из {open_vacancies} вакансий "
+                  f"(ограничение API), закрытые вакансии не удаляются")
+            continue
+        deleted += db_manager.delete_stale_vacancies(emp_id, seen)
+
+    db_manager.update_sync_state([emp_id for emp_id in employers if emp_id not in failed])
+
+    return {
+        'vacancies': total,
+        'per_employer': per_employer,
+        'reconciled': reconcile_ids,
+        'deleted': deleted,
+        'failed': failed,
+    }
+
+
+def run_checkpointed_pipeline(api, db_manager, employer_ids: List[int],
+                              queue_size: int = 8, concurrent: bool = True,
+                              processes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Возобновляемая загрузка вакансий работодателей.
+
+    Запуск записывается в ingest_runs, а каждая страница сохраняется
+    в собственной транзакции вместе с отметкой в ingest_checkpoints.
+    Если предыдущий запуск с теми же работодателями не завершился,
+    он продолжается: уже сохранённые страницы не запрашиваются повторно.
+
+    Args:
+        api: Экземпляр HeadHunterAPI
+        db_manager: Менеджер базы данных
+        employer_ids: Список ID работодателей
+        queue_size: Максимальное количество страниц в очереди
+        concurrent: Загружать страницы параллельно
+        processes: Количество процессов нормализации (см. run_vacancy_pipeline)
+
+    Returns:
+        Dict[str, Any]: Статистика (run_id, resumed, vacancies, skipped_pages,
+            per_employer, failed)
+    """
+    run = db_manager.start_ingest_run(employer_ids)
+    if run is None:
+        raise RuntimeError("Не удалось создать запуск загрузки")
+    run_id, resumed = run
+
+    resume = db_manager.get_ingest_checkpoints(run_id) if resumed else {}
+    # Работодатель без сохранённой первой страницы загружается заново
+    resume = {emp_id: done for emp_id, done in resume.items() if 0 in done[1]}
+    page_counts: Dict[int, int] = {emp_id: pages for emp_id, (pages, _) in resume.items()}
+
+    counts: Dict[int, int] = {}
+    failed: Set[Any] = set()
+    stats = {
+        'run_id': run_id,
+        'resumed': resumed,
+        'vacancies': 0,
+        'skipped_pages': sum(len(pages) for _, pages in resume.values()),
+        'per_employer': counts,
+        'failed': failed,
+    }
+
+    columnar = processes is not None
+
+    def produce() -> Iterator[Tuple[int, int, List[Tuple[Any, ...]]]]:
+        pages = api.iter_vacancy_pages(employer_ids, concurrent=concurrent, failed=failed,
+                                       page_counts=page_counts, resume=resume, raw=columnar)
+        if columnar:
+            for emp_id, page, columns in normalize_pages(pages, processes):
+                counts[emp_id] = counts.get(emp_id, 0) + len(columns['id'])
+                yield emp_id, page, column_rows(columns, db_manager.VACANCY_COLUMNS)
+            return
+
+        for emp_id, page, items in pages:
+            prepared = iter_prepared_vacancies([(emp_id, page, items)], counts)
+            # Поля Vacancy идут в порядке колонок таблицы
+            yield emp_id, page, list(prepared)
+
+    def write(item: Tuple[int, int, List[Tuple[Any, ...]]]):
+        emp_id, page, rows = item
+        pages = max(page_counts.get(emp_id, 1), 1)
+        if db_manager.save_vacancy_page(run_id, emp_id, page, pages, rows):
+            stats['vacancies'] += len(rows)
+        else:
+            failed.add(emp_id)
+
+    try:
+        _pump(produce, write, queue_size)
+    except BaseException:
+        # Прерванный (в том числе Ctrl+C) запуск продолжается следующей загрузкой
+        db_manager.finish_ingest_run(run_id, 'failed')
+        raise
+
+    db_manager.finish_ingest_run(run_id, 'failed' if failed else 'completed')
+    return stats
+
+
+async def _put_async(channel: asyncio.Queue, item: Any, writer: asyncio.Future):
+    """Помещение элемента в очередь, пока писатель работает."""
+    put = asyncio.ensure_future(channel.put(item))
+    await asyncio.wait([put, writer], return_when=asyncio.FIRST_COMPLETED)
+    if writer.done() and not put.done():
+        put.cancel()
+    if writer.done() and writer.exception() is not None:
+        raise writer.exception()
+
+
+async def run_vacancy_pipeline_async(api, db_manager, employer_ids: List[int],
+                                     batch_size: int = 1000, queue_size: int = 4,
+                                     date_from: Optional[Dict[Any, str]] = None,
+                                     seen_ids: Optional[Dict[int, Set[int]]] = None) -> Dict[str, Any]:
+    """
+    Загрузка вакансий работодателей в БД асинхронным конвейером.
+
+    Страницы поступают из AsyncHeadHunterAPI.iter_vacancy_pages, а пакеты
+    записываются методами db_manager в пуле потоков, не останавливая цикл
+    событий. Очередь ограниченного размера между стадиями приостанавливает
+    загрузку, пока писатель не освободит место.
+
+    Args:
+        api: Экземпляр AsyncHeadHunterAPI
+        db_manager: Менеджер базы данных
+        employer_ids: Список ID работодателей
+        batch_size: Количество вакансий в пакете записи
+        queue_size: Максимальное количество пакетов в очереди
+        date_from: Нижняя граница даты публикации по ID работодателя
+        seen_ids: Словарь для сбора ID полученных вакансий по работодателям
+
+    Returns:
+        Dict[str, Any]: Статистика (vacancies, batches, per_employer, failed)
+    """
+    channel: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    counts: Dict[int, int] = {}
+    failed: Set[Any] = set()
+    stats = {'vacancies': 0, 'batches': 0, 'per_employer': counts, 'failed': failed}
+    loop = asyncio.get_running_loop()
+
+    async def write():
+        while True:
+            batch = await channel.get()
+            if batch is _DONE:
+                return
+            result = await loop.run_in_executor(None, db_manager.bulk_insert_vacancies, batch)
+            stats['vacancies'] += result['rows']
+            stats['batches'] += 1
+
+    writer = asyncio.ensure_future(write())
+    try:
+        batch: List[Vacancy] = []
+        async for emp_id, page, items in api.iter_vacancy_pages(employer_ids, date_from=date_from,
+                                                                failed=failed):
+            for prepared in iter_prepared_vacancies([(emp_id, page, items)], counts, seen_ids):
+                batch.append(prepared)
+                if len(batch) >= batch_size:
+                    await _put_async(channel, batch, writer)
+                    batch = []
+        if batch:
+            await _put_async(channel, batch, writer)
+        await _put_async(channel, _DONE, writer)
+        await writer
+    finally:
+        writer.cancel()
+
+    return stats
\ No newline at end of file
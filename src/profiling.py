@@ -0,0 +1,361 @@
+"""
+Профилирование загрузки данных с hh.ru по стадиям.
+
+Стадии загрузки (ожидание HTTP, разбор JSON, подготовка вакансий,
+запись в БД, фиксация транзакции) отмечаются интервалами span(...)
+с ID работодателя и номером страницы. Пока профилировщик не включён,
+span() ничего не делает, поэтому отметки остаются в коде постоянно.
+
+Включённый IngestProfiler собирает интервалы всех потоков и по ним
+строит таблицу стадий (общее и собственное время, p50/p95) и разбивку
+по работодателям. Трасса сохраняется в формате Chrome Trace Event
+(chrome://tracing, ui.perfetto.dev, speedscope) и при желании
+дополняется профилем cProfile и статистикой памяти tracemalloc.
+
+Пример:
+    profiler = IngestProfiler('ingest_profile.json', cprofile=True)
+    with profiler:
+        fetch_and_save_data(db_manager)
+    profiler.report()
+    profiler.write()
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Стадии в порядке прохождения страницы через конвейер
+STAGES = ('throttle', 'backoff', 'http', 'decode', 'normalize', 'db_write', 'commit')
+
+_NULL_SPAN = nullcontext()
+
+# Включённый профилировщик (None - отметки стадий не записываются)
+_active: Optional['IngestProfiler'] = None
+
+
+def active_profiler() -> Optional['IngestProfiler']:
+    """Включённый профилировщик или None."""
+    return _active
+
+
+def span(name: str, cat: str = 'stage', **args):
+    """
+    Интервал стадии для включённого профилировщика.
+
+    Args:
+        name: Название стадии (см. STAGES)
+        cat: Категория: stage - стадия страницы, phase - этап загрузки
+        **args: Подробности (employer_id, page, rows...)
+
+    Returns:
+        Менеджер контекста, замеряющий вложенный блок
+    """
+    profiler = _active
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name, cat, **args)
+
+
+def _percentile(values: List[float], share: float) -> float:
+    """Перцентиль отсортированного списка (ближайший ранг)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+class IngestProfiler:
+    """Сбор интервалов стадий загрузки, cProfile и tracemalloc."""
+
+    def __init__(self, path: str = 'ingest_profile.json', cprofile: bool = False,
+                 trace_memory: bool = False, top: int = 15):
+        """
+        Инициализация профилировщика.
+
+        Args:
+            path: Файл трассы Chrome Trace Event (JSON)
+            cprofile: Профилировать функции cProfile (поток, включивший профилировщик;
+                      результат - в файле <path>.prof)
+            trace_memory: Отслеживать выделения памяти tracemalloc
+            top: Количество функций и мест выделения памяти в отчёте
+        """
+        self.path = path
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.top = top
+        # (название, категория, начало нс, длительность нс, поток, подробности)
+        self._events: List[Tuple[str, str, int, int, int, Dict[str, Any]]] = []
+        self._memory: List[Tuple[int, int]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._profile: Optional[cProfile.Profile] = None
+        self._previous: Optional['IngestProfiler'] = None
+        self._own_tracing = False
+        self._started = 0
+        self._wall = 0
+        self.memory: Dict[str, Any] = {}
+
+    def __enter__(self) -> 'IngestProfiler':
+        global _active
+        self._previous, _active = _active, self
+        self._own_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if self._own_tracing:
+            tracemalloc.start()
+        if self.cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        global _active
+        self._wall += time.perf_counter_ns() - self._started
+        if self._profile is not None:
+            self._profile.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:self.top]
+            if self._own_tracing:
+                tracemalloc.stop()
+            self.memory = {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top': [{'where': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+                        for stat in top],
+            }
+        _active = self._previous
+        return False
+
+    @contextmanager
+    def span(self, name: str, cat: str = 'stage', **args) -> Iterator[None]:
+        """
+        Замер вложенного блока.
+
+        Args:
+            name: Название стадии
+            cat: Категория (stage или phase)
+            **args: Подробности для трассы
+        """
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, cat, started, time.perf_counter_ns() - started, args)
+
+    def record(self, name: str, cat: str, started: int, duration: int,
+               args: Optional[Dict[str, Any]] = None):
+        """
+        Учёт интервала, замеренного вызывающим кодом.
+
+        Args:
+            name: Название стадии
+            cat: Категория
+            started: Начало по time.perf_counter_ns()
+            duration: Длительность, нс
+            args: Подробности для трассы
+        """
+        thread = threading.current_thread()
+        memory = tracemalloc.get_traced_memory()[0] if self.trace_memory and tracemalloc.is_tracing() else None
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self._events.append((name, cat, started, duration, thread.ident, args or {}))
+            if memory is not None:
+                self._memory.append((started + duration, memory))
+
+    def _self_times(self) -> List[int]:
+        """
+        Собственное время интервалов: длительность без вложенных интервалов того же потока.
+
+        Returns:
+            List[int]: Собственное время каждого интервала, нс (в порядке записи)
+        """
+        result = [duration for _, _, _, duration, _, _ in self._events]
+        by_thread: Dict[int, List[int]] = {}
+        for index, event in enumerate(self._events):
+            by_thread.setdefault(event[4], []).append(index)
+
+        for indexes in by_thread.values():
+            # Внешний интервал начинается раньше и при равном начале длиннее
+            indexes.sort(key=lambda i: (self._events[i][2], -self._events[i][3]))
+            stack: List[int] = []
+            for index in indexes:
+                started, duration = self._events[index][2], self._events[index][3]
+                while stack and self._events[stack[-1]][2] + self._events[stack[-1]][3] <= started:
+                    stack.pop()
+                if stack:
+                    result[stack[-1]] -= duration
+                stack.append(index)
+        return result
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Сводка по стадиям.
+
+        Returns:
+            List[Dict[str, Any]]: По стадии - категория, количество, общее
+                и собственное время (с), средняя, p50, p95 и максимальная
+                длительность (мс); стадии STAGES идут первыми
+        """
+        with self._lock:
+            self_times = self._self_times()
+            groups: Dict[Tuple[str, str], List[Any]] = {}
+            for event, own in zip(self._events, self_times):
+                item = groups.setdefault((event[0], event[1]), [[], 0])
+                item[0].append(event[3])
+                item[1] += own
+
+        def order(key):
+            name, cat = key
+            return (cat != 'phase', STAGES.index(name) if name in STAGES else len(STAGES), name)
+
+        rows = []
+        for name, cat in sorted(groups, key=order):
+            durations, own = groups[(name, cat)]
+            durations.sort()
+            total = sum(durations)
+            rows.append({
+                'stage': name,
+                'category': cat,
+                'count': len(durations),
+                'total_seconds': round(total / 1e9, 4),
+                'self_seconds': round(own / 1e9, 4),
+                'avg_ms': round(total / len(durations) / 1e6, 3),
+                'p50_ms': round(_percentile(durations, 0.5) / 1e6, 3),
+                'p95_ms': round(_percentile(durations, 0.95) / 1e6, 3),
+                'max_ms': round(durations[-1] / 1e6, 3),
+            })
+        return rows
+
+    def per_employer(self) -> Dict[Any, Dict[str, Any]]:
+        """
+        Собственное время стадий по работодателям.
+
+        Returns:
+            Dict[Any, Dict[str, Any]]: По ID работодателя - количество страниц
+                и секунды по стадиям
+        """
+        with self._lock:
+            self_times = self._self_times()
+            result: Dict[Any, Dict[str, Any]] = {}
+            for (name, cat, _, _, _, args), own in zip(self._events, self_times):
+                if cat != 'stage' or args.get('employer_id') is None:
+                    continue
+                item = result.setdefault(args['employer_id'], {'pages': 0})
+                item[name] = item.get(name, 0.0) + own / 1e9
+                if name == 'http':
+                    item['pages'] += 1
+        return result
+
+    def profile_stats(self) -> str:
+        """Самые затратные функции cProfile (по накопленному времени)."""
+        if self._profile is None:
+            return ''
+        stream = io.StringIO()
+        pstats.Stats(self._profile, stream=stream).sort_stats('cumulative').print_stats(self.top)
+        return stream.getvalue()
+
+    def report(self):
+        """Вывод таблицы стадий, разбивки по работодателям и итогов cProfile/tracemalloc."""
+        rows = self.summary()
+        print("\n" + "=" * 50)
+        print(f"ПРОФИЛЬ ЗАГРУЗКИ: {self._wall / 1e9:.3f} с")
+        print("=" * 50)
+        if not rows:
+            print("ℹ️ Стадии загрузки не отмечены")
+            return
+
+        print(f"{'стадия':<20} {'вызовов':>8} {'всего, с':>9} {'своё, с':>9} "
+              f"{'сред, мс':>9} {'p50, мс':>9} {'p95, мс':>9} {'макс, мс':>9}")
+        for row in rows:
+            stage = row['stage'] if row['category'] == 'stage' else f"[{row['stage']}]"
+            print(f"{stage:<20} {row['count']:>8} {row['total_seconds']:>9.3f} "
+                  f"{row['self_seconds']:>9.3f} {row['avg_ms']:>9.2f} {row['p50_ms']:>9.2f} "
+                  f"{row['p95_ms']:>9.2f} {row['max_ms']:>9.2f}")
+        print("ℹ️ Стадии потоков загрузки идут параллельно, поэтому их сумма может превышать общее время")
+
+        employers = self.per_employer()
+        if employers:
+            stages = [stage for stage in STAGES if any(stage in item for item in employers.values())]
+            print(f"\n{'работодатель':<14} {'страниц':>8} " + ' '.join(f'{stage + ", с":>11}' for stage in stages))
+            for emp_id, item in sorted(employers.items(), key=lambda pair: str(pair[0])):
+                print(f"{str(emp_id):<14} {item['pages']:>8} " +
+                      ' '.join(f"{item.get(stage, 0.0):>11.3f}" for stage in stages))
+
+        if self.memory:
+            print(f"\n🧠 Память: пик {self.memory['peak_bytes'] / 1024 / 1024:.1f} МБ")
+            for stat in self.memory['top'][:5]:
+                print(f"   {stat['bytes'] / 1024:>10.1f} КБ  {stat['where']}")
+
+        profile = self.profile_stats()
+        if profile:
+            print(f"\n⏱️ cProfile (поток {threading.current_thread().name}):")
+            print(profile.rstrip())
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Трасса в формате Chrome Trace Event.
+
+        Returns:
+            Dict[str, Any]: traceEvents (интервалы ph=X, счётчик памяти,
+                имена потоков) и otherData со сводкой по стадиям
+        """
+        pid = os.getpid()
+        with self._lock:
+            origin = min([event[2] for event in self._events] + [self._started])
+            events: List[Dict[str, Any]] = [
+                {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                for tid, name in self._threads.items()
+            ]
+            for name, cat, started, duration, tid, args in self._events:
+                events.append({
+                    'name': name, 'cat': cat, 'ph': 'X', 'pid': pid, 'tid': tid,
+                    'ts': (started - origin) / 1000, 'dur': duration / 1000,
+                    'args': {key: str(value) if not isinstance(value, (int, float, str)) else value
+                             for key, value in args.items()},
+                })
+            for moment, value in self._memory:
+                events.append({'name': 'traced_memory', 'ph': 'C', 'pid': pid,
+                               'ts': (moment - origin) / 1000, 'args': {'bytes': value}})
+
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'wall_seconds': round(self._wall / 1e9, 4),
+                'stages': self.summary(),
+                'memory': self.memory,
+            },
+        }
+
+    def write(self, path: Optional[str] = None) -> List[str]:
+        """
+        Сохранение трассы и профиля cProfile.
+
+        Args:
+            path: Файл трассы (по умолчанию self.path)
+
+        Returns:
+            List[str]: Записанные файлы
+        """
+        path = path or self.path
+        written = []
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+            written.append(path)
+            if self._profile is not None:
+                profile_path = os.path.splitext(path)[0] + '.prof'
+                self._profile.dump_stats(profile_path)
+                written.append(profile_path)
+        except OSError as e:
+            print(f"❌ Не удалось сохранить профиль загрузки: {e}")
+            return written
+
+        print(f"✅ Трасса загрузки сохранена: {', '.join(written)}")
+        return written
\ No newline at end of file
@@ -0,0 +1,940 @@
+"""
+Встроенное хранилище SQLite для DBManager.
+
+Позволяет работать с вакансиями и считать аналитику без сервера PostgreSQL:
+на ноутбуке, в CI, в бенчмарках. Запросы DBManager выполняются через
+обёртку курсора, которая переводит параметры psycopg2 (%s, %(name)s)
+в формат sqlite3, а методы с особенностями PostgreSQL (массивы,
+материализованное представление, полнотекстовый поиск) переопределены.
+
+База настроена на массовую загрузку: журнал WAL, synchronous=NORMAL,
+пакеты пишутся одним executemany с подготовленным выражением в одной
+транзакции, а полнотекстовый индекс FTS5 перестраивается один раз
+в refresh_statistics, а не триггером на каждую строку.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from src.config import Config
+from src.db_manager import DBManager
+from src.instrumentation import QueryMetrics
+from src.models import ColumnInfo, DeadLetter, SearchResult, VacancyInfo
+
+_PARAM_RE = re.compile(r'%\((\w+)\)s|%s|%%|\bNOW\(\)', re.IGNORECASE)
+
+# Окончания, отбрасываемые при поиске: слово ищется по основе как по префиксу
+_ENDINGS = sorted(
+    ('ами', 'ями', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими', 'ов', 'ев', 'ей', 'ий', 'ый', 'ой',
+     'ая', 'яя', 'ые', 'ие', 'ое', 'ее', 'ах', 'ях', 'ам', 'ям', 'ом', 'ем', 'ы', 'и', 'а', 'я',
+     'у', 'ю', 'е', 'о', 'ь'),
+    key=len, reverse=True)
+
+
+def _translate(query: str) -> str:
+    """Перевод параметров и функций psycopg2/PostgreSQL в синтаксис sqlite3."""
+    def replace(match):
+        token = match.group(0)
+        if match.group(1):
+            return f':{match.group(1)}'
+        if token == '%s':
+            return '?'
+        if token == '%%':
+            return '%'
+        return 'CURRENT_TIMESTAMP'
+    return _PARAM_RE.sub(replace, query)
+
+
+def _stem(word: str) -> str:
+    """Отбрасывание окончания у слов длиннее четырёх букв."""
+    for ending in _ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= 4:
+            return word[:-len(ending)]
+    return word
+
+
+def fts_query(query: str) -> Optional[str]:
+    """
+    Перевод запроса в формате websearch_to_tsquery в запрос FTS5.
+
+    Слова ищутся вместе по основе, фраза в кавычках - целиком,
+    "or" объединяет соседние условия, "-" исключает слово.
+
+    Args:
+        query: Поисковый запрос
+
+    Returns:
+        Optional[str]: Запрос FTS5 или None, если искать нечего
+    """
+    positive: List[str] = []
+    negative: List[str] = []
+    join_or = False
+    for token in re.findall(r'-?"[^"]*"?|\S+', query):
+        if token.lower() == 'or':
+            join_or = bool(positive)
+            continue
+        excluded = token.startswith('-')
+        phrase = token.lstrip('-').startswith('"')
+        words = re.findall(r'\w+', token.lower())
+        if not words:
+            continue
+        if phrase:
+            term = '"' + ' '.join(words) + '"'
+        else:
+            term = ' AND '.join(f'"{_stem(word)}"*' for word in words)
+        if excluded:
+            negative.append(term)
+        elif join_or:
+            positive[-1] = f'({positive[-1]}) OR ({term})'
+            join_or = False
+        else:
+            positive.append(term)
+
+    if not positive:
+        return None
+    result = ' AND '.join(f'({term})' for term in positive)
+    for term in negative:
+        result = f'({result}) NOT ({term})'
+    return result
+
+
+class _SQLiteCursor:
+    """Курсор sqlite3 с параметрами в формате psycopg2, замеряющий запросы."""
+
+    def __init__(self, conn: sqlite3.Connection, metrics: QueryMetrics):
+        self._conn = conn
+        self._cursor = conn.cursor()
+        self._metrics = metrics
+        self.itersize = 1000
+
+    def execute(self, query: str, params: Any = None):
+        if not self._conn.in_transaction and query.lstrip()[:9].upper() == 'SAVEPOINT':
+            # Внешняя точка сохранения без транзакции фиксировалась бы при RELEASE
+            self._conn.execute('BEGIN')
+        text = _translate(query)
+        started = time.perf_counter()
+        try:
+            if params is None:
+                self._cursor.execute(text)
+            else:
+                self._cursor.execute(text, params)
+        except Exception as e:
+            self._metrics.observe(query, time.perf_counter() - started, 0, e)
+            raise
+        self._metrics.observe(query, time.perf_counter() - started, self._cursor.rowcount,
+                              explain=lambda: self._explain(text, params))
+        return self
+
+    def executemany(self, query: str, rows: Iterable[Sequence[Any]]):
+        started = time.perf_counter()
+        try:
+            self._cursor.executemany(_translate(query), rows)
+        except Exception as e:
+            self._metrics.observe(query, time.perf_counter() - started, 0, e)
+            raise
+        self._metrics.observe(query, time.perf_counter() - started, self._cursor.rowcount)
+        return self
+
+    def _explain(self, text: str, params: Any) -> str:
+        """План запроса (EXPLAIN QUERY PLAN не выполняет запрос)."""
+        rows = self._conn.execute(f'EXPLAIN QUERY PLAN {text}', params or ()).fetchall()
+        return '\n'.join(row[-1] for row in rows)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size: int):
+        return self._cursor.fetchmany(size)
+
+    def __iter__(self):
+        # Строки читаются порциями, как у серверного курсора psycopg2
+        while True:
+            rows = self._cursor.fetchmany(self.itersize)
+            if not rows:
+                return
+            yield from rows
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class _SQLiteConnection:
+    """Соединение sqlite3 с интерфейсом, который ожидает DBManager."""
+
+    def __init__(self, conn: sqlite3.Connection, metrics: QueryMetrics):
+        self._conn = conn
+        self._metrics = metrics
+        self.closed = False
+
+    def cursor(self, name: Optional[str] = None) -> _SQLiteCursor:
+        # Имя серверного курсора не нужно: sqlite3 и так читает строки по мере обхода
+        return _SQLiteCursor(self._conn, self._metrics)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        if not self.closed:
+            self._conn.close()
+            self.closed = True
+
+
+class SQLiteDBManager(DBManager):
+    """
+    Менеджер базы данных вакансий во встроенной базе SQLite.
+
+    Одно соединение используется всеми потоками по очереди, поэтому
+    экземпляр безопасен для конвейеров загрузки с потоком записи.
+    """
+
+    BACKEND = 'sqlite'
+    DATA_ERRORS = (sqlite3.IntegrityError, sqlite3.DataError)
+    # percentile_cont и width_bucket в SQLite нет
+    SQL_ANALYTICS = False
+    # sqlite3 сам кэширует скомпилированные выражения (cached_statements)
+    PREPARE_STATEMENTS = False
+
+    def __init__(self, config: Config, path: Optional[str] = None):
+        """
+        Инициализация менеджера SQLite.
+
+        Args:
+            config: Конфигурация (путь к файлу - SQLITE_PATH или <DB_NAME>.sqlite3)
+            path: Путь к файлу базы (':memory:' - база в памяти)
+        """
+        super().__init__(config)
+        self.path = path or config.sqlite_path or f'{config.db_name}.sqlite3'
+        self._lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._in_use = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self.fts_enabled = False
+
+    def connect(self, database: str = None):
+        """
+        Открытие файла базы данных.
+
+        Args:
+            database: Путь к файлу (если None, используется self.path)
+        """
+        if self.conn is not None and not self.conn.closed:
+            return
+        path = database or self.path
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        raw = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+        raw.execute('PRAGMA journal_mode = WAL')
+        raw.execute('PRAGMA synchronous = NORMAL')
+        raw.execute('PRAGMA foreign_keys = ON')
+        raw.execute('PRAGMA temp_store = MEMORY')
+        raw.execute('PRAGMA cache_size = -65536')
+        # Встроенная LOWER в SQLite не меняет регистр кириллицы
+        raw.create_function('lower', 1, lambda value: value.lower() if isinstance(value, str) else value,
+                            deterministic=True)
+        self.fts_enabled = bool(raw.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'vacancies_fts'").fetchone())
+        self.conn = _SQLiteConnection(raw, self.metrics)
+
+    def close(self):
+        """Закрытие соединения с базой данных."""
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    @contextmanager
+    def _connection(self):
+        """
+        Соединение с базой на время одной операции (операции выполняются по очереди).
+
+        Yields:
+            _SQLiteConnection: Соединение
+        """
+        started = time.perf_counter()
+        with self._lock:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._checkouts += 1
+                self._in_use += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                self.connect()
+                yield self.conn
+            finally:
+                with self._stats_lock:
+                    self._in_use -= 1
+
+    @contextmanager
+    def _admin_connection(self):
+        """Служебной базы у SQLite нет: операции с файлом выполняются напрямую."""
+        with self._connection() as conn:
+            yield conn
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Статистика использования соединения.
+
+        Returns:
+            Dict[str, Any]: Поля как у PooledDBManager.pool_stats (соединение одно)
+        """
+        with self._stats_lock:
+            return {
+                'minconn': 1,
+                'maxconn': 1,
+                'in_use': self._in_use,
+                'peak_in_use': 1 if self._checkouts else 0,
+                'checkouts': self._checkouts,
+                'wait_total_seconds': round(self._wait_total, 4),
+                'wait_avg_seconds': round(self._wait_total / self._checkouts, 6) if self._checkouts else 0.0,
+                'wait_max_seconds': round(self._wait_max, 4),
+            }
+
+    def create_database(self):
+        """Создание файла базы данных, если его нет."""
+        existed = self.database_exists()
+        with self._connection():
+            pass
+        if existed:
+            print(f"ℹ️ База данных {self.path} уже существует")
+        else:
+            print(f"✅ База данных {self.path} успешно создана")
+
+    def drop_database(self):
+        """
+        Удаление файла базы данных (осторожно!).
+        """
+        self.close()
+        if self.path == ':memory:':
+            return
+        try:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(self.path + suffix):
+                    os.remove(self.path + suffix)
+            print(f"✅ База данных {self.path} успешно удалена")
+        except OSError as e:
+            print(f"❌ Ошибка при удалении базы данных: {e}")
+
+    def database_exists(self) -> bool:
+        """
+        Проверка существования файла базы данных.
+
+        Returns:
+            bool: True если база данных существует
+        """
+        if self.path == ':memory:':
+            return self.conn is not None and not self.conn.closed
+        return os.path.exists(self.path)
+
+    def create_tables(self):
+        """Создание таблиц в базе данных."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS employers (
+                        id INTEGER PRIMARY KEY,
+                        name VARCHAR(255) NOT NULL,
+                        description TEXT,
+                        site_url VARCHAR(255),
+                        alternate_url VARCHAR(255),
+                        open_vacancies INTEGER DEFAULT 0
+                    )
+                """)
+
+                # Дата публикации хранится строкой ISO 8601 из ответа API
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS vacancies (
+                        id INTEGER PRIMARY KEY,
+                        employer_id INTEGER NOT NULL,
+                        name VARCHAR(255) NOT NULL,
+                        description TEXT,
+                        salary INTEGER,
+                        url VARCHAR(255),
+                        published_at TEXT,
+                        salary_from INTEGER,
+                        salary_to INTEGER,
+                        currency VARCHAR(10),
+                        gross BOOLEAN,
+                        salary_rub INTEGER,
+                        FOREIGN KEY (employer_id) REFERENCES employers(id)
+                            ON DELETE CASCADE
+                    )
+                """)
+
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_vacancies_employer
+                    ON vacancies(employer_id)
+                """)
+
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_vacancies_salary_rub
+                    ON vacancies(salary_rub)
+                """)
+
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_vacancies_employer_salary_rub_id
+                    ON vacancies(employer_id, COALESCE(salary_rub, -1) DESC, id)
+                """)
+
+                # Агрегаты по работодателям - таблица, пересчитываемая в refresh_statistics
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS employer_stats (
+                        employer_id INTEGER PRIMARY KEY,
+                        name VARCHAR(255),
+                        vacancies_count INTEGER NOT NULL,
+                        salary_sum INTEGER NOT NULL,
+                        salary_count INTEGER NOT NULL,
+                        salary_min INTEGER,
+                        salary_max INTEGER
+                    )
+                """)
+
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS sync_state (
+                        employer_id INTEGER PRIMARY KEY,
+                        last_published_at TEXT,
+                        last_synced_at TIMESTAMP NOT NULL,
+                        FOREIGN KEY (employer_id) REFERENCES employers(id)
+                            ON DELETE CASCADE
+                    )
+                """)
+
+                # Набор работодателей запуска хранится JSON-массивом
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS ingest_runs (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        employer_ids TEXT NOT NULL,
+                        status VARCHAR(20) NOT NULL DEFAULT 'running',
+                        started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                        finished_at TIMESTAMP,
+                        vacancies INTEGER NOT NULL DEFAULT 0
+                    )
+                """)
+
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+                        run_id INTEGER NOT NULL,
+                        employer_id INTEGER NOT NULL,
+                        page INTEGER NOT NULL,
+                        pages INTEGER NOT NULL,
+                        vacancies INTEGER NOT NULL,
+                        completed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (run_id, employer_id, page),
+                        FOREIGN KEY (run_id) REFERENCES ingest_runs(id)
+                            ON DELETE CASCADE
+                    )
+                """)
+
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS dead_letters (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        table_name VARCHAR(63) NOT NULL,
+                        record_id INTEGER,
+                        payload TEXT NOT NULL,
+                        error TEXT NOT NULL,
+                        failed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                self._create_fts_index(cursor)
+
+                conn.commit()
+                print("✅ Таблицы успешно созданы")
+
+            except Exception as e:
+                print(f"❌ Ошибка при создании таблиц: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+    def _create_fts_index(self, cursor):
+        """
+        Создание полнотекстового индекса FTS5 по названию и описанию.
+
+        Если SQLite собран без FTS5, поиск выполняется через LIKE.
+
+        Args:
+            cursor: Курсор открытого соединения
+        """
+        cursor.execute('SAVEPOINT fts')
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_fts USING fts5(
+                    name, description, content='vacancies', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            cursor.execute('RELEASE SAVEPOINT fts')
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"ℹ️ Полнотекстовый индекс не создан: {e}")
+            cursor.execute('ROLLBACK TO SAVEPOINT fts')
+            cursor.execute('RELEASE SAVEPOINT fts')
+            self.fts_enabled = False
+
+    def drop_tables(self):
+        """Удаление таблиц (для очистки БД)."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                for table in ('vacancies_fts', 'employer_stats', 'dead_letters', 'ingest_checkpoints',
+                              'ingest_runs', 'sync_state', 'vacancies', 'employers'):
+                    cursor.execute(f'DROP TABLE IF EXISTS {table}')
+                conn.commit()
+                self.fts_enabled = False
+                print("✅ Таблицы успешно удалены")
+            except Exception as e:
+                print(f"❌ Ошибка при удалении таблиц: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+    def table_exists(self, table_name: str) -> bool:
+        """
+        Проверка существования таблицы.
+
+        Args:
+            table_name: Имя таблицы
+
+        Returns:
+            bool: True если таблица существует
+        """
+        result = self.execute_query(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = %s", (table_name,))
+        return bool(result and result[0][0])
+
+    def count_rows(self, table_name: str) -> int:
+        """
+        Подсчёт количества строк в таблице.
+
+        Args:
+            table_name: Имя таблицы
+
+        Returns:
+            int: Количество строк (0 при ошибке)
+        """
+        quoted = '"' + table_name.replace('"', '""') + '"'
+        result = self.execute_query(f'SELECT COUNT(*) FROM {quoted}')
+        return result[0][0] if result else 0
+
+    def get_dead_letters(self, table: Optional[str] = None, limit: int = 100) -> List[DeadLetter]:
+        """
+        Получает строки, отклонённые при загрузке.
+
+        Args:
+            table: Имя таблицы (None - все таблицы)
+            limit: Максимальное количество записей
+
+        Returns:
+            List[DeadLetter]: Отклонённые записи с текстом ошибки, новые первыми
+        """
+        # JSON и время хранятся текстом: приводим к тем же типам, что у PostgreSQL
+        return [
+            letter._replace(payload=json.loads(letter.payload),
+                            failed_at=datetime.fromisoformat(letter.failed_at))
+            for letter in super().get_dead_letters(table, limit)
+        ]
+
+    def _bulk_upsert(self, cursor, table: str, columns: Sequence[str],
+                     rows: Sequence[Sequence[Any]], use_copy: bool = True,
+                     page_size: int = 1000) -> Tuple[int, str]:
+        """
+        Массовая вставка с обновлением без фиксации транзакции.
+
+        Все строки пишутся одним executemany: выражение подготавливается
+        один раз и выполняется для каждой строки внутри текущей транзакции.
+        Параметры use_copy и page_size не используются.
+
+        Returns:
+            Tuple[int, str]: Количество записанных строк (различных ключей)
+                и использованный способ загрузки ('executemany')
+        """
+        key = columns[0]
+        column_list = ', '.join(columns)
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f'{col} = excluded.{col}' for col in columns[1:])
+        cursor.executemany(f"""
+            INSERT INTO {table} ({column_list}) VALUES ({placeholders})
+            ON CONFLICT ({key}) DO UPDATE SET {updates}
+        """, rows)
+        return len({row[0] for row in rows}), 'executemany'
+
+    def get_sync_state(self) -> Dict[int, Any]:
+        """
+        Получает отметки последней синхронизации работодателей.
+
+        Returns:
+            Dict[int, Any]: Дата последней опубликованной вакансии по ID работодателя
+        """
+        # Как и колонка TIMESTAMP в PostgreSQL, отметка не содержит часового пояса
+        return {
+            emp_id: datetime.fromisoformat(str(published)[:19])
+            for emp_id, published in super().get_sync_state().items()
+        }
+
+    def update_sync_state(self, employer_ids: List[int]):
+        """
+        Обновляет отметки синхронизации по данным в таблице vacancies.
+
+        Args:
+            employer_ids: Список ID синхронизированных работодателей
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute("""
+                    INSERT INTO sync_state (employer_id, last_published_at, last_synced_at)
+                    SELECT e.id, MAX(v.published_at), CURRENT_TIMESTAMP
+                    FROM employers e
+                    LEFT JOIN vacancies v ON v.employer_id = e.id
+                    WHERE e.id IN (SELECT value FROM json_each(?))
+                    GROUP BY e.id
+                    ON CONFLICT (employer_id) DO UPDATE SET
+                        last_published_at = excluded.last_published_at,
+                        last_synced_at = excluded.last_synced_at
+                """, (json.dumps([int(emp_id) for emp_id in employer_ids]),))
+                conn.commit()
+
+            except Exception as e:
+                print(f"❌ Ошибка при обновлении состояния синхронизации: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+    def get_vacancy_counts(self, employer_ids: List[int]) -> Dict[int, int]:
+        """
+        Получает количество сохранённых вакансий по работодателям.
+
+        Args:
+            employer_ids: Список ID работодателей
+
+        Returns:
+            Dict[int, int]: Количество вакансий по ID работодателя
+        """
+        rows = self.execute_query("""
+            SELECT employer_id, COUNT(*)
+            FROM vacancies
+            WHERE employer_id IN (SELECT value FROM json_each(?))
+            GROUP BY employer_id
+        """, (json.dumps([int(emp_id) for emp_id in employer_ids]),))
+        return dict(rows)
+
+    def delete_stale_vacancies(self, employer_id: int, actual_ids: Iterable[int]) -> int:
+        """
+        Удаляет закрытые вакансии работодателя.
+
+        Args:
+            employer_id: ID работодателя
+            actual_ids: ID вакансий, которые сейчас открыты на hh.ru
+
+        Returns:
+            int: Количество удалённых вакансий
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute("""
+                    DELETE FROM vacancies
+                    WHERE employer_id = ?
+                      AND id NOT IN (SELECT value FROM json_each(?))
+                """, (int(employer_id), json.dumps([int(vac_id) for vac_id in actual_ids])))
+                deleted = cursor.rowcount
+                conn.commit()
+                self._statistics_stale = True
+                return deleted
+
+            except Exception as e:
+                print(f"❌ Ошибка при удалении закрытых вакансий: {e}")
+                conn.rollback()
+                return 0
+            finally:
+                cursor.close()
+
+    def start_ingest_run(self, employer_ids: List[int]) -> Optional[Tuple[int, bool]]:
+        """
+        Начинает запуск загрузки или продолжает незавершённый
+        (правила продолжения и очистки - как у DBManager.start_ingest_run).
+
+        Args:
+            employer_ids: Список ID работодателей
+
+        Returns:
+            Optional[Tuple[int, bool]]: ID запуска и признак продолжения
+                (None при ошибке)
+        """
+        ids = json.dumps(sorted({int(emp_id) for emp_id in employer_ids}))
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                lease = f'-{self.config.ingest_lease_minutes} minutes'
+                cursor.execute("""
+                    UPDATE ingest_runs SET
+                        status = 'abandoned',
+                        finished_at = COALESCE(finished_at, CURRENT_TIMESTAMP)
+                    WHERE status IN ('running', 'failed')
+                      AND started_at < datetime('now', ?)
+                      AND COALESCE((SELECT MAX(c.completed_at) FROM ingest_checkpoints c
+                                    WHERE c.run_id = ingest_runs.id), started_at)
+                          < datetime('now', ?)
+                """, (f'-{self.config.ingest_resume_hours} hours', lease))
+                if self.config.ingest_keep_days > 0:
+                    cursor.execute("""
+                        DELETE FROM ingest_runs
+                        WHERE status <> 'running' AND started_at < datetime('now', ?)
+                    """, (f'-{self.config.ingest_keep_days} days',))
+
+                cursor.execute("""
+                    SELECT r.id, r.status,
+                           COALESCE((SELECT MAX(c.completed_at) FROM ingest_checkpoints c
+                                     WHERE c.run_id = r.id), r.started_at) >= datetime('now', ?)
+                    FROM ingest_runs r
+                    WHERE r.employer_ids = ? AND r.status <> 'abandoned'
+                    ORDER BY r.id DESC
+                    LIMIT 1
+                """, (lease, ids))
+                row = cursor.fetchone()
+
+                if row is not None and row[1] == 'running' and row[2]:
+                    print(f"ℹ️ Запуск загрузки #{row[0]} выполняется другим процессом, "
+                          f"начинается новый")
+                    row = None
+
+                if row is not None and row[1] != 'completed':
+                    cursor.execute("""
+                        UPDATE ingest_runs SET status = 'running', finished_at = NULL
+                        WHERE id = ?
+                    """, (row[0],))
+                    run = (row[0], True)
+                else:
+                    cursor.execute("INSERT INTO ingest_runs (employer_ids) VALUES (?)", (ids,))
+                    run = (cursor.lastrowid, False)
+
+                conn.commit()
+                return run
+
+            except Exception as e:
+                print(f"❌ Ошибка при создании запуска загрузки: {e}")
+                conn.rollback()
+                return None
+            finally:
+                cursor.close()
+
+    def get_ingest_checkpoints(self, run_id: int) -> Dict[int, Tuple[int, Set[int]]]:
+        """
+        Получает сохранённые страницы запуска загрузки.
+
+        Args:
+            run_id: ID запуска
+
+        Returns:
+            Dict[int, Tuple[int, Set[int]]]: Количество страниц и номера
+                сохранённых страниц по ID работодателя
+        """
+        rows = self.execute_query("""
+            SELECT employer_id, MAX(pages), json_group_array(page)
+            FROM ingest_checkpoints
+            WHERE run_id = ?
+            GROUP BY employer_id
+        """, (run_id,))
+        return {row[0]: (row[1], set(json.loads(row[2]))) for row in rows}
+
+    def refresh_statistics(self):
+        """
+        Пересчёт агрегатов employer_stats и полнотекстового индекса после загрузки данных.
+        """
+        self._statistics_stale = False
+        with self._connection() as conn:
+            cursor = conn.cursor()
+
+            try:
+                cursor.execute("DELETE FROM employer_stats")
+                cursor.execute("""
+                    INSERT INTO employer_stats
+                    SELECT
+                        e.id,
+                        e.name,
+                        COUNT(v.id),
+                        COALESCE(SUM(v.salary_rub), 0),
+                        COUNT(v.salary_rub),
+                        MIN(v.salary_rub),
+                        MAX(v.salary_rub)
+                    FROM employers e
+                    LEFT JOIN vacancies v ON e.id = v.employer_id
+                    GROUP BY e.id, e.name
+                """)
+                if self.fts_enabled:
+                    cursor.execute("INSERT INTO vacancies_fts(vacancies_fts) VALUES ('rebuild')")
+                conn.commit()
+
+            except Exception as e:
+                self._statistics_stale = True
+                print(f"❌ Ошибка при обновлении статистики: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+
+    def get_vacancies_page(self, after: Optional[Tuple[str, int, int]] = None,
+                           limit: int = 100) -> Tuple[List[VacancyInfo], Optional[Tuple[str, int, int]]]:
+        """
+        Постраничное чтение вакансий по ключу (keyset pagination).
+
+        Порядок: название компании, зарплата по убыванию (без зарплаты - в конце), ID.
+
+        Args:
+            after: Ключ последней строки предыдущей страницы (None - первая страница)
+            limit: Количество вакансий на странице
+
+        Returns:
+            Tuple: Вакансии страницы и ключ для следующей страницы (None, если страниц больше нет)
+        """
+        params: Dict[str, Any] = {'limit': limit, 'name': None, 'salary': None, 'id': None}
+        if after is not None:
+            params.update(name=after[0], salary=after[1], id=after[2])
+
+        rows = self.execute_query("""
+            SELECT e.name, v.name, v.salary_rub, v.url,
+                   COALESCE(v.salary_rub, -1) as salary_key, v.id
+            FROM vacancies v
+            JOIN employers e ON v.employer_id = e.id
+            WHERE :name IS NULL
+               OR e.name > :name
+               OR (e.name = :name AND (COALESCE(v.salary_rub, -1) < :salary
+                   OR (COALESCE(v.salary_rub, -1) = :salary AND v.id > :id)))
+            ORDER BY e.name, salary_key DESC, v.id
+            LIMIT :limit
+        """, params)
+        page = [VacancyInfo._make(row[:4]) for row in rows]
+        next_key = None
+        if len(rows) == limit:
+            last = rows[-1]
+            next_key = (last[0], last[4], last[5])
+        return page, next_key
+
+    def get_avg_salary(self) -> float:
+        """
+        Получает среднюю зарплату по вакансиям в рублях на руки.
+
+        Returns:
+            float: Средняя зарплата
+        """
+        self._ensure_statistics()
+        result = self.execute_query("""
+            SELECT CAST(SUM(salary_sum) AS REAL) / NULLIF(SUM(salary_count), 0)
+            FROM employer_stats
+        """)
+        return round(result[0][0], 2) if result and result[0][0] else 0
+
+    def get_vacancies_with_higher_salary(self) -> List[VacancyInfo]:
+        """
+        Получает список всех вакансий, у которых зарплата выше средней по всем вакансиям.
+
+        Returns:
+            List[VacancyInfo]: Список вакансий с зарплатой выше средней
+        """
+        self._ensure_statistics()
+        rows = self.execute_query("""
+            SELECT
+                e.name as company_name,
+                v.name as vacancy_name,
+                v.salary_rub,
+                v.url
+            FROM vacancies v
+            JOIN employers e ON v.employer_id = e.id
+            WHERE v.salary_rub > (
+                SELECT CAST(SUM(salary_sum) AS REAL) / NULLIF(SUM(salary_count), 0)
+                FROM employer_stats
+            )
+            ORDER BY v.salary_rub DESC
+        """)
+        return [VacancyInfo._make(row) for row in rows]
+
+    def search_vacancies(self, query: str, limit: int = 20,
+                         offset: int = 0) -> List[SearchResult]:
+        """
+        Полнотекстовый поиск вакансий по названию и описанию.
+
+        Запрос переводится в FTS5 функцией fts_query; совпадение в названии
+        весит больше, чем в описании. Индекс обновляется в refresh_statistics
+        (перед поиском - если после записи он не вызывался).
+
+        Args:
+            query: Поисковый запрос
+            limit: Количество вакансий на странице
+            offset: Смещение от начала выдачи
+
+        Returns:
+            List[SearchResult]: Вакансии, отсортированные по релевантности
+        """
+        if not self.fts_enabled:
+            rows = self.execute_query("""
+                SELECT e.name, v.name, v.salary_rub, v.url, 1.0 as rank
+                FROM vacancies v
+                JOIN employers e ON v.employer_id = e.id
+                WHERE LOWER(v.name) LIKE ? OR LOWER(v.description) LIKE ?
+                ORDER BY v.id
+                LIMIT ? OFFSET ?
+            """, (f'%{query.lower()}%', f'%{query.lower()}%', limit, offset))
+            return [SearchResult._make(row) for row in rows]
+
+        match = fts_query(query)
+        if match is None:
+            return []
+        self._ensure_statistics()
+        rows = self.execute_query("""
+            SELECT e.name, v.name, v.salary_rub, v.url,
+                   -bm25(vacancies_fts, 10.0, 1.0) as rank
+            FROM vacancies_fts
+            JOIN vacancies v ON v.id = vacancies_fts.rowid
+            JOIN employers e ON v.employer_id = e.id
+            WHERE vacancies_fts MATCH ?
+            ORDER BY rank DESC, v.id
+            LIMIT ? OFFSET ?
+        """, (match, limit, offset))
+        return [SearchResult._make(row) for row in rows]
+
+    def get_table_info(self, table_name: str) -> List[ColumnInfo]:
+        """
+        Получает информацию о структуре таблицы.
+
+        Args:
+            table_name: Имя таблицы
+
+        Returns:
+            List[ColumnInfo]: Информация о колонках таблицы
+        """
+        rows = self.execute_query('SELECT name, type, "notnull", dflt_value FROM pragma_table_info(?)',
+                                  (table_name,))
+        return [ColumnInfo(row[0], row[1].lower(), 'NO' if row[2] else 'YES', row[3]) for row in rows]
\ No newline at end of file
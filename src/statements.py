@@ -0,0 +1,163 @@
+"""
+Кэш подготовленных выражений для запросов DBManager.
+
+Частые запросы (вставка с обновлением, поиск, агрегаты) выполняются
+по имени: при первом выполнении на соединении текст запроса один раз
+отправляется серверу командой PREPARE, а дальше вызывается EXECUTE
+с параметрами - сервер не разбирает и не планирует запрос заново.
+Подготовленные выражения живут до закрытия соединения и не зависят
+от отката транзакций, поэтому кэш помнит их для каждого соединения.
+
+Если сервер не может подготовить запрос (например, не выводится тип
+параметра), запрос выполняется обычным способом. По каждому имени
+считаются количество выполнений, время и количество строк.
+"""
+
+import re
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+_PARAM_RE = re.compile(r'%\((\w+)\)s|%s|%%')
+
+
+def to_server_params(query: str) -> Tuple[str, List[Any]]:
+    """
+    Перевод параметров psycopg2 в позиционные параметры PREPARE.
+
+    Args:
+        query: Запрос с параметрами %s или %(name)s
+
+    Returns:
+        Tuple[str, List[Any]]: Запрос с параметрами $1, $2... и порядок
+            параметров (номера позиций для %s или имена для %(name)s)
+    """
+    order: List[Any] = []
+
+    def replace(match):
+        token = match.group(0)
+        if token == '%%':
+            return '%'
+        key = match.group(1) if match.group(1) else len(order)
+        if key not in order or not match.group(1):
+            order.append(key)
+        return f'${order.index(key) + 1}'
+
+    return _PARAM_RE.sub(replace, query), order
+
+
+class StatementCache:
+    """Подготовленные выражения по соединениям и статистика выполнения по именам."""
+
+    def __init__(self, prepare: bool = True):
+        """
+        Инициализация кэша.
+
+        Args:
+            prepare: Подготавливать ли запросы на сервере (False - только статистика)
+        """
+        self.prepare = prepare
+        self._queries: Dict[str, Tuple[str, List[Any]]] = {}
+        self._failed: set = set()
+        self._prepared: 'weakref.WeakKeyDictionary[Any, set]' = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _prepare(self, cursor, name: str, query: str) -> bool:
+        """
+        Подготовка запроса на соединении курсора.
+
+        Returns:
+            bool: True, если запрос подготовлен
+        """
+        if name not in self._queries:
+            self._queries[name] = to_server_params(query)
+        text, _ = self._queries[name]
+        # Ошибка PREPARE не должна прерывать текущую транзакцию
+        cursor.execute('SAVEPOINT prepare_statement')
+        try:
+            cursor.execute(f'PREPARE {name} AS {text}')
+        except Exception as e:
+            cursor.execute('ROLLBACK TO SAVEPOINT prepare_statement')
+            cursor.execute('RELEASE SAVEPOINT prepare_statement')
+            with self._lock:
+                self._failed.add(name)
+            print(f"ℹ️ Запрос {name} выполняется без подготовки: {str(e).strip().splitlines()[0]}")
+            return False
+        cursor.execute('RELEASE SAVEPOINT prepare_statement')
+        return True
+
+    def execute(self, cursor, name: str, query: str,
+                params: Optional[Any] = None):
+        """
+        Выполнение запроса по имени.
+
+        Args:
+            cursor: Курсор открытого соединения
+            name: Имя запроса (одно имя - один текст запроса)
+            query: Текст запроса с параметрами psycopg2
+            params: Параметры (кортеж или словарь)
+
+        Returns:
+            Курсор с результатом
+        """
+        started = time.perf_counter()
+        prepared = False
+        if self.prepare and name not in self._failed:
+            with self._lock:
+                names = self._prepared.setdefault(cursor.connection, set())
+            if name in names:
+                prepared = True
+            elif self._prepare(cursor, name, query):
+                names.add(name)
+                prepared = True
+
+        if prepared:
+            _, order = self._queries[name]
+            if not order:
+                cursor.execute(f'EXECUTE {name}')
+            else:
+                values = ([params[key] for key in order] if isinstance(params, Mapping)
+                          else list(params))
+                cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(values))})", values)
+        elif params is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query, params)
+
+        self.record(name, time.perf_counter() - started, cursor.rowcount)
+        return cursor
+
+    def record(self, name: str, seconds: float, rows: int):
+        """Учёт одного выполнения запроса."""
+        with self._lock:
+            item = self._stats.setdefault(name, [0, 0.0, 0])
+            item[0] += 1
+            item[1] += seconds
+            item[2] += max(rows, 0)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Статистика выполнения запросов.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: По имени запроса - executions, total_seconds,
+                avg_ms, rows и признак prepared
+        """
+        with self._lock:
+            return {
+                name: {
+                    'executions': int(count),
+                    'total_seconds': round(seconds, 4),
+                    'avg_ms': round(seconds / count * 1000, 3) if count else 0.0,
+                    'rows': int(rows),
+                    'prepared': self.prepare and name in self._queries and name not in self._failed,
+                }
+                for name, (count, seconds, rows) in sorted(self._stats.items())
+            }
+
+    def reset_stats(self):
+        """Обнуление статистики выполнения."""
+        with self._lock:
+            self._stats.clear()
\ No newline at end of file
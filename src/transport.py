@@ -0,0 +1,385 @@
+"""
+Транспортный слой для запросов к API hh.ru.
+Содержит ограничитель частоты запросов, адаптер requests, который его применяет,
+и адаптер с повторными попытками, автоматическим выключателем (circuit breaker)
+и подстройкой частоты по ответам 429.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from src.profiling import span
+
+# Статусы, после которых запрос имеет смысл повторить
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """
+    Потокобезопасный ограничитель частоты запросов (token bucket).
+
+    Один экземпляр разделяется всеми потоками клиента, поэтому суммарная
+    частота запросов не превышает rate независимо от числа потоков.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Инициализация ограничителя.
+
+        Args:
+            rate: Количество запросов в секунду
+            capacity: Максимальный запас токенов (размер всплеска)
+        """
+        if rate <= 0:
+            raise ValueError("Частота запросов должна быть положительной")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Получение токенов с ожиданием при необходимости.
+
+        Токены резервируются под блокировкой, а ожидание выполняется вне её,
+        поэтому потоки не блокируют друг друга во время сна.
+
+        Args:
+            tokens: Количество токенов
+
+        Returns:
+            float: Время ожидания в секундах
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            with span('throttle'):
+                time.sleep(wait)
+        return wait
+
+    def set_rate(self, rate: float):
+        """
+        Изменение частоты запросов на лету.
+
+        Args:
+            rate: Новое количество запросов в секунду
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.rate = float(rate)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTP-адаптер, получающий токен из ограничителя перед каждым запросом."""
+
+    def __init__(self, limiter: TokenBucket, **kwargs):
+        """
+        Инициализация адаптера.
+
+        Args:
+            limiter: Общий ограничитель частоты запросов
+            **kwargs: Параметры HTTPAdapter (pool_connections, pool_maxsize и т.д.)
+        """
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.limiter.acquire()
+        return super().send(request, **kwargs)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Запрос отклонён: выключатель разомкнут после серии ошибок."""
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель для серии неудачных запросов.
+
+    После failure_threshold ошибок подряд выключатель размыкается, и запросы
+    отклоняются сразу, не нагружая API. Через reset_timeout секунд
+    пропускается один пробный запрос: успех замыкает выключатель,
+    ошибка снова размыкает его. Ответ 429 не считается ни успехом,
+    ни ошибкой (см. release).
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Инициализация выключателя.
+
+        Args:
+            failure_threshold: Количество ошибок подряд до размыкания
+            reset_timeout: Время (в секундах) до пробного запроса
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Проверка, можно ли отправить запрос.
+
+        Returns:
+            bool: True, если запрос разрешён
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # Полуоткрытое состояние: только один пробный запрос
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        """Учёт успешного запроса."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release(self):
+        """
+        Учёт запроса, не сказавшегося на доступности API (ответ 429).
+
+        Состояние и счётчик ошибок не меняются; в полуоткрытом состоянии
+        можно отправить новый пробный запрос.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Учёт неудачного запроса."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class TransportStats:
+    """Потокобезопасные счётчики и задержки запросов транспорта."""
+
+    def __init__(self, window: int = 10000):
+        """
+        Инициализация статистики.
+
+        Args:
+            window: Количество последних задержек для расчёта перцентилей
+        """
+        self.requests = 0
+        self.attempts = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self.rejected = 0
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, counter: str, latency: Optional[float] = None):
+        """
+        Увеличение счётчика и сохранение задержки попытки.
+
+        Args:
+            counter: Имя счётчика
+            latency: Длительность попытки в секундах
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            if latency is not None:
+                self._latencies.append(latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Текущие значения счётчиков.
+
+        Returns:
+            Dict[str, Any]: Запросы, попытки, повторы, ответы 429, ошибки,
+                отклонённые выключателем запросы и задержки p50/p95/p99 в мс
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'requests': self.requests,
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'throttled': self.throttled,
+                'failures': self.failures,
+                'rejected': self.rejected,
+            }
+
+        for q in (50, 95, 99):
+            value = latencies[min(len(latencies) - 1, int(len(latencies) * q / 100))] if latencies else 0.0
+            stats[f'p{q}_ms'] = round(value * 1000, 3)
+        return stats
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Разбор заголовка Retry-After.
+
+    Args:
+        value: Количество секунд или дата в формате HTTP
+
+    Returns:
+        Optional[float]: Время ожидания в секундах или None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryAdapter(BaseAdapter):
+    """
+    HTTP-адаптер с повторными попытками для идемпотентных запросов.
+
+    Ошибки соединения и ответы из RETRY_STATUSES повторяются с экспоненциальной
+    задержкой и случайным разбросом (full jitter), а при наличии Retry-After -
+    через указанное сервером время. Ответ 429 вдвое снижает частоту
+    ограничителя, каждый успешный ответ понемногу возвращает её к максимуму.
+    """
+
+    def __init__(self, inner: BaseAdapter, limiter: Optional[TokenBucket] = None,
+                 max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 breaker: Optional[CircuitBreaker] = None, stats: Optional[TransportStats] = None,
+                 min_rate: float = 0.5):
+        """
+        Инициализация адаптера.
+
+        Args:
+            inner: Адаптер, выполняющий запросы
+            limiter: Ограничитель частоты, который подстраивается по ответам 429
+            max_retries: Максимальное количество повторов одного запроса
+            backoff_base: Базовая задержка перед повтором в секундах
+            backoff_max: Максимальная задержка перед повтором в секундах
+            breaker: Автоматический выключатель
+            stats: Накопитель статистики запросов
+            min_rate: Нижняя граница частоты при снижении по ответам 429
+        """
+        super().__init__()
+        self.inner = inner
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = stats or TransportStats()
+        self.min_rate = min_rate
+        self.max_rate = limiter.rate if limiter else None
+        self._rate_lock = threading.Lock()
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        """Задержка перед повтором с учётом Retry-After."""
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _throttled(self):
+        """Мультипликативное снижение частоты после ответа 429."""
+        if self.limiter is None:
+            return
+        with self._rate_lock:
+            self.limiter.set_rate(max(self.min_rate, self.limiter.rate / 2))
+
+    def _succeeded(self):
+        """Аддитивное восстановление частоты после успешного ответа."""
+        if self.limiter is None or self.limiter.rate >= self.max_rate:
+            return
+        with self._rate_lock:
+            self.limiter.set_rate(min(self.max_rate, self.limiter.rate + 0.1))
+
+    def send(self, request, **kwargs):
+        self.stats.record('requests')
+        retryable = request.method in ('GET', 'HEAD', 'OPTIONS')
+        attempt = 0
+
+        while True:
+            if not self.breaker.allow():
+                self.stats.record('rejected')
+                raise CircuitOpenError('API временно недоступен: слишком много ошибок подряд',
+                                       request=request)
+
+            started = time.perf_counter()
+            try:
+                response = self.inner.send(request, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.stats.record('attempts', time.perf_counter() - started)
+                self.stats.record('failures')
+                self.breaker.record_failure()
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                response = None
+            else:
+                self.stats.record('attempts', time.perf_counter() - started)
+                if response.status_code == 429:
+                    self.stats.record('throttled')
+                    self._throttled()
+                    # Ограничение частоты - ни отказ, ни признак восстановления сервера
+                    self.breaker.release()
+                elif response.status_code >= 500:
+                    self.stats.record('failures')
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                    self._succeeded()
+
+                if (not retryable or response.status_code not in RETRY_STATUSES
+                        or attempt >= self.max_retries):
+                    return response
+
+            delay = self._backoff(attempt, response)
+            if response is not None:
+                response.close()
+            attempt += 1
+            self.stats.record('retries')
+            with span('backoff', attempt=attempt):
+                time.sleep(delay)
+
+    def close(self):
+        self.inner.close()
\ No newline at end of file
@@ -3,6 +3,8 @@
 """
 
 from typing import Dict, Any, List, Optional
+from src.currency import salary_rub
+from src.models import Employer, Vacancy
 
 
 def parse_salary(salary_data: Optional[Dict[str, Any]]) -> Optional[int]:
@@ -30,7 +32,7 @@ def parse_salary(salary_data: Optional[Dict[str, Any]]) -> Optional[int]:
     return None
 
 
-def prepare_employer_data(employer: Dict[str, Any]) -> Dict[str, Any]:
+def prepare_employer_data(employer: Dict[str, Any]) -> Employer:
     """
     Подготовка данных работодателя для сохранения в БД.
 
@@ -38,19 +40,19 @@ def prepare_employer_data(employer: Dict[str, Any]) -> Dict[str, Any]:
         employer: Данные работодателя из API
 
     Returns:
-        Dict[str, Any]: Подготовленные данные
+        Employer: Подготовленные данные
     """
-    return {
-        'id': employer['id'],
-        'name': employer['name'],
-        'description': employer.get('description', ''),
-        'site_url': employer.get('site_url', ''),
-        'alternate_url': employer.get('alternate_url', ''),
-        'open_vacancies': employer.get('open_vacancies', 0)
-    }
+    return Employer(
+        employer['id'],
+        employer['name'],
+        employer.get('description', ''),
+        employer.get('site_url', ''),
+        employer.get('alternate_url', ''),
+        employer.get('open_vacancies', 0)
+    )
 
 
-def prepare_vacancy_data(vacancy: Dict[str, Any], employer_id: int) -> Dict[str, Any]:
+def prepare_vacancy_data(vacancy: Dict[str, Any], employer_id: int) -> Vacancy:
     """
     Подготовка данных вакансии для сохранения в БД.
 
@@ -59,9 +61,12 @@ def prepare_vacancy_data(vacancy: Dict[str, Any], employer_id: int) -> Dict[str,
         employer_id: ID работодателя
 
     Returns:
-        Dict[str, Any]: Подготовленные данные
+        Vacancy: Подготовленные данные
     """
-    salary = parse_salary(vacancy.get('salary'))
+    salary_data = vacancy.get('salary') or {}
+    salary = parse_salary(salary_data)
+    currency = salary_data.get('currency')
+    gross = salary_data.get('gross')
 
     # Получаем описание из разных возможных полей
     description = ''
@@ -70,15 +75,20 @@ def prepare_vacancy_data(vacancy: Dict[str, Any], employer_id: int) -> Dict[str,
     elif vacancy.get('description'):
         description = vacancy['description']
 
-    return {
-        'id': vacancy['id'],
-        'employer_id': employer_id,
-        'name': vacancy['name'],
-        'description': description,
-        'salary': salary,
-        'url': vacancy.get('alternate_url', ''),
-        'published_at': vacancy.get('published_at', '')
-    }
+    return Vacancy(
+        vacancy['id'],
+        employer_id,
+        vacancy['name'],
+        description,
+        salary,
+        vacancy.get('alternate_url', ''),
+        vacancy.get('published_at', ''),
+        salary_data.get('from'),
+        salary_data.get('to'),
+        currency,
+        gross,
+        salary_rub(salary, currency, gross)
+    )
 
 
 # Актуальные ID компаний на hh.ru (проверенные)
@@ -112,7 +122,7 @@ def search_companies_by_name(api_client, company_names: List[str]) -> List[Dict]
     for name in company_names:
         try:
             response = api_client.session.get(
-                f'{api_client.BASE_URL}employers',
+                f'{api_client.base_url}employers',
                 params={'text': name, 'only_with_vacancies': True}
             )
 
@@ -0,0 +1,85 @@
+"""
+Тесты аналитики распределения зарплат на небольшом известном наборе.
+
+SQLite считает перцентили и гистограмму в src.analytics, поэтому
+проверяются оба варианта: с NumPy и на чистом Python.
+"""
+
+import pytest
+
+from src import analytics
+from src.config import Config
+from src.models import Employer, EmployerSalaryStats, SalaryHistogram, Vacancy
+from src.sqlite_manager import SQLiteDBManager
+
+PUBLISHED = '2024-01-01T00:00:00'
+
+SALARIES = {
+    1: [100000, 200000, 300000, 400000],
+    2: [500000, 900000],
+    3: [None],
+}
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def db_manager(request, monkeypatch):
+    """Менеджер SQLite в памяти с тремя работодателями; у третьего зарплата не указана."""
+    if request.param == 'python':
+        monkeypatch.setattr(analytics, 'numpy', None)
+    elif analytics.numpy is None:
+        pytest.skip('NumPy не установлен')
+
+    manager = SQLiteDBManager(Config(), ':memory:')
+    manager.create_tables()
+    manager.bulk_insert_employers([Employer(emp_id, f'Компания {emp_id}') for emp_id in SALARIES])
+    manager.bulk_insert_vacancies([
+        Vacancy(emp_id * 100 + index, emp_id, f'Вакансия {index}', published_at=PUBLISHED,
+                salary=salary, salary_rub=salary)
+        for emp_id, salaries in SALARIES.items()
+        for index, salary in enumerate(salaries)
+    ])
+    yield manager
+    manager.close()
+
+
+def test_salary_percentiles(db_manager):
+    """Перцентили интерполируются линейно, как percentile_cont."""
+    assert db_manager.get_salary_percentiles() == pytest.approx(
+        (150000, 225000, 350000, 475000, 700000))
+    assert db_manager.get_salary_percentiles((0, 1)) == (100000, 900000)
+
+
+def test_salary_histogram(db_manager):
+    """Максимальная зарплата попадает в последний интервал, вакансии без зарплаты - никуда."""
+    assert db_manager.get_salary_histogram(4) == SalaryHistogram(
+        (100000, 300000, 500000, 700000, 900000), (2, 2, 1, 1))
+    assert db_manager.get_salary_histogram(2, low=0, high=1000000) == SalaryHistogram(
+        (0, 500000, 1000000), (4, 2))
+    # Значения вне заданных границ не учитываются
+    assert db_manager.get_salary_histogram(2, low=250000, high=450000).counts == (1, 1)
+
+
+@pytest.mark.parametrize('buckets', [0, -1])
+def test_salary_histogram_rejects_bad_buckets(db_manager, buckets):
+    """Неположительное количество интервалов даёт пустую гистограмму, а не исключение."""
+    assert db_manager.get_salary_histogram(buckets) == SalaryHistogram((), ())
+
+
+def test_employer_salary_stats(db_manager):
+    """Медиана и 90-й перцентиль по работодателям с учётом минимума вакансий."""
+    assert db_manager.get_employer_salary_stats() == [
+        EmployerSalaryStats(2, 'Компания 2', 2, 700000, 860000),
+        EmployerSalaryStats(1, 'Компания 1', 4, 250000, pytest.approx(370000)),
+    ]
+    assert [row.employer_id for row in db_manager.get_employer_salary_stats(3)] == [1]
+
+
+def test_empty_table():
+    """Без зарплат перцентили равны None, гистограмма и статистика пусты."""
+    manager = SQLiteDBManager(Config(), ':memory:')
+    manager.create_tables()
+
+    assert manager.get_salary_percentiles((0.5, 0.9)) == (None, None)
+    assert manager.get_salary_histogram() == SalaryHistogram((), ())
+    assert manager.get_employer_salary_stats() == []
+    manager.close()
\ No newline at end of file
@@ -17,7 +17,7 @@ def test_api_connection():
     # Тест 1: Проверка доступности API
     print("\n1. Проверка доступности API...")
     try:
-        response = api.session.get("https://api.hh.ru/")
+        response = api.session.get(api.base_url)
         if response.status_code == 200:
             print("✅ API доступен")
             print(f"   Версия API: {response.json().get('hh', {}).get('version', 'Неизвестно')}")
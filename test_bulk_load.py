@@ -0,0 +1,53 @@
+"""
+Тесты массовой загрузки с отделением отклонённых строк.
+
+Деление пакета (DBManager._upsert_isolating) общее для всех хранилищ,
+поэтому проверяется на SQLite в памяти без сервера PostgreSQL.
+"""
+
+import pytest
+
+from src.config import Config
+from src.models import Employer, Vacancy
+from src.sqlite_manager import SQLiteDBManager
+
+PUBLISHED = '2024-01-01T00:00:00'
+
+
+@pytest.fixture
+def db_manager():
+    """Менеджер SQLite в памяти с одним работодателем."""
+    manager = SQLiteDBManager(Config(), ':memory:')
+    manager.create_tables()
+    manager.bulk_insert_employers([Employer(1, 'Компания')])
+    yield manager
+    manager.close()
+
+
+def test_rejected_rows_are_isolated_and_counted(db_manager):
+    """Повтор ключа, нарушение внешнего ключа и NOT NULL не искажают счётчики."""
+    rows = [Vacancy(i, 1, f'Вакансия {i}', published_at=PUBLISHED) for i in range(1, 9)]
+    rows.append(Vacancy(3, 1, 'Повтор', published_at=PUBLISHED))
+    rows.append(Vacancy(100, 999, 'Нет работодателя', published_at=PUBLISHED))
+    rows.append(Vacancy(101, 1, None, published_at=PUBLISHED))
+
+    stats = db_manager.bulk_insert_vacancies(rows)
+
+    assert stats['method'] == 'isolated'
+    assert stats['rows'] == db_manager.count_rows('vacancies') == 8
+    assert stats['failed'] == 2
+    assert {letter.record_id for letter in db_manager.get_dead_letters('vacancies')} == {100, 101}
+    # Из строк с одинаковым ключом записана последняя
+    assert db_manager.execute_query('SELECT name FROM vacancies WHERE id = 3') == [('Повтор',)]
+
+
+def test_clean_batch_counts_distinct_rows(db_manager):
+    """Пакет без ошибок записывается целиком, повторы ключа считаются один раз."""
+    rows = [Vacancy(i % 5, 1, f'Вакансия {i}', published_at=PUBLISHED) for i in range(10)]
+
+    stats = db_manager.bulk_insert_vacancies(rows)
+
+    assert stats['method'] == 'executemany'
+    assert stats['rows'] == db_manager.count_rows('vacancies') == 5
+    assert stats['failed'] == 0
+    assert db_manager.get_dead_letters() == []
\ No newline at end of file
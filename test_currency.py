@@ -0,0 +1,79 @@
+"""
+Тесты приведения зарплат к рублям на руки.
+"""
+
+import pytest
+
+from src import currency
+from src.currency import CurrencyRates, normalize_salary_columns, salary_rub
+
+# Сколько единиц валюты стоит один рубль (формат справочника hh.ru)
+RATES = CurrencyRates({'USD': 0.01, 'EUR': 0.008, 'KZT': 5.0})
+
+
+@pytest.mark.parametrize('salary, currency_code, gross, expected', [
+    (100000, 'RUR', False, 100000),
+    (100000, None, None, 100000),
+    (1500, 'USD', False, 150000),
+    (1000, 'EUR', None, 125000),
+    (500000, 'KZT', False, 100000),
+    # До вычета налогов: на руки остаётся 87%
+    (100000, 'RUR', True, 87000),
+    (1500, 'USD', True, 130500),
+    # Курс неизвестен или зарплаты нет
+    (1500, 'XXX', False, None),
+    (1500, 'XXX', True, None),
+    (None, 'USD', False, None),
+    (0, 'RUR', False, None),
+])
+def test_salary_rub(salary, currency_code, gross, expected):
+    """Перевод в рубли по курсу справочника и вычет НДФЛ для gross."""
+    assert salary_rub(salary, currency_code, gross, RATES) == expected
+
+
+def test_salary_rub_uses_current_rates(monkeypatch):
+    """Без явных курсов используются установленные set_rates."""
+    monkeypatch.setattr(currency, '_current', None)
+    currency.set_rates(RATES)
+    assert salary_rub(1500, 'USD', False) == 150000
+
+
+def test_unknown_rates_convert_only_rubles():
+    """Без справочника в рубли переводятся только рублёвые зарплаты."""
+    rates = CurrencyRates()
+    assert salary_rub(100000, 'RUR', True, rates) == 87000
+    assert salary_rub(1500, 'USD', False, rates) is None
+
+
+def test_normalize_salary_columns():
+    """Колонка salary_rub совпадает с salary_rub для каждой вакансии."""
+    columns = {
+        'salary': [100000, 1500, 1500, 1500, None, 2000, 0],
+        'currency': ['RUR', 'USD', 'USD', 'XXX', 'USD', 'USD', 'RUR'],
+        'gross': [True, False, True, False, False, False, None],
+    }
+
+    result = normalize_salary_columns(columns, RATES)
+
+    assert result == [87000, 150000, 130500, None, None, 200000, None]
+    assert columns['salary_rub'] is result
+    assert result == [salary_rub(*row, RATES) for row in
+                      zip(columns['salary'], columns['currency'], columns['gross'])]
+
+
+def test_rates_cache_file(tmp_path):
+    """Курсы из справочника сохраняются в файл и читаются обратно."""
+    path = str(tmp_path / 'rates.json')
+    parsed = CurrencyRates.parse_dictionaries({'currency': [
+        {'code': 'USD', 'rate': 0.01}, {'code': 'RUR', 'rate': 1}, {'code': 'BAD', 'rate': None}]})
+    assert parsed == {'USD': 0.01, 'RUR': 1.0}
+
+    CurrencyRates(parsed, 1000.0).save(path)
+    loaded = CurrencyRates.load(path)
+    assert loaded.rates == {'USD': 0.01, 'RUR': 1.0}
+    assert loaded.updated_at == 1000.0
+    assert loaded.is_stale()
+
+    assert CurrencyRates.load(str(tmp_path / 'missing.json')).rates == {'RUR': 1.0}
+    (tmp_path / 'broken.json').write_text('{', encoding='utf-8')
+    assert CurrencyRates.load(str(tmp_path / 'broken.json')).rates == {'RUR': 1.0}
\ No newline at end of file
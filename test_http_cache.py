@@ -0,0 +1,121 @@
+"""
+Тесты дискового кэша ответов: срок жизни, вытеснение по LRU
+и перепроверка устаревших записей ответом 304.
+
+Запросы идут к локальному MockHHServer, который отдаёт ETag.
+"""
+
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from benchmarks.mock_hh_server import MockHHServer
+from src.http_cache import CachingAdapter, ResponseCache
+
+
+@pytest.fixture
+def server():
+    """Тестовый сервер hh.ru с одним работодателем."""
+    with MockHHServer(employers=1, vacancies_per_employer=10) as mock:
+        yield mock
+
+
+def make_session(server: MockHHServer, cache: ResponseCache) -> requests.Session:
+    """Сессия, отвечающая на GET-запросы к серверу из кэша."""
+    session = requests.Session()
+    session.mount(server.base_url, CachingAdapter(HTTPAdapter(), cache))
+    return session
+
+
+def employer_url(server: MockHHServer) -> str:
+    """Адрес работодателя тестового сервера."""
+    return f'{server.base_url}employers/{server.employer_ids[0]}'
+
+
+def test_fresh_entry_served_without_request(server, tmp_path):
+    """В пределах TTL ответ берётся из кэша, сервер не запрашивается."""
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttl=60)
+    session = make_session(server, cache)
+
+    first = session.get(employer_url(server))
+    second = session.get(employer_url(server))
+
+    assert server.stats['requests'] == 1
+    assert not getattr(first, 'from_cache', False)
+    assert second.from_cache is True
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_expired_entry_revalidated_with_304(server, tmp_path):
+    """После TTL отправляется условный запрос; 304 возвращает тело из кэша."""
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttl=0.2)
+    session = make_session(server, cache)
+    first = session.get(employer_url(server))
+    assert first.headers['ETag']
+
+    time.sleep(0.25)
+    revalidated = session.get(employer_url(server))
+
+    assert server.stats['requests'] == 2
+    assert server.stats['not_modified'] == 1
+    assert revalidated.status_code == 200
+    assert revalidated.from_cache is True
+    assert revalidated.content == first.content
+    assert cache.stats()['revalidations'] == 1
+
+    # 304 продлевает срок жизни записи
+    assert session.get(employer_url(server)).from_cache is True
+    assert server.stats['requests'] == 2
+
+
+def test_changed_response_replaces_entry(server, tmp_path):
+    """Если ответ изменился, сервер отдаёт 200 и кэш обновляется."""
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttl=0.2)
+    session = make_session(server, cache)
+    session.get(employer_url(server))
+    server.employers[str(server.employer_ids[0])]['name'] = 'Новое название'
+
+    time.sleep(0.25)
+    changed = session.get(employer_url(server))
+
+    assert server.stats['not_modified'] == 0
+    assert not getattr(changed, 'from_cache', False)
+    assert changed.json()['name'] == 'Новое название'
+    assert session.get(employer_url(server)).json()['name'] == 'Новое название'
+    assert cache.stats()['misses'] == 2
+
+
+def test_lru_eviction(tmp_path):
+    """Сверх max_bytes вытесняются записи, к которым дольше всего не обращались."""
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_bytes=250)
+    cache.set('a', {}, b'a' * 100)
+    time.sleep(0.01)
+    cache.set('b', {}, b'b' * 100)
+    time.sleep(0.01)
+    assert cache.get('a') is not None
+    time.sleep(0.01)
+
+    cache.set('c', {}, b'c' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('a')[1] == b'a' * 100
+    assert cache.get('c')[1] == b'c' * 100
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 200
+
+
+def test_headers_stored_without_transport_fields(tmp_path):
+    """ETag и Last-Modified сохраняются, заголовки кодирования и длины - нет."""
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    cache.set('key', {'ETag': '"1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT',
+                      'Content-Encoding': 'gzip', 'Content-Length': '10'}, b'{}')
+
+    headers, body, etag, last_modified, _ = cache.get('key')
+
+    assert headers == {'ETag': '"1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert (body, etag, last_modified) == (b'{}', '"1"', 'Mon, 01 Jan 2024 00:00:00 GMT')
\ No newline at end of file
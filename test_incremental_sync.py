@@ -0,0 +1,87 @@
+"""
+Тесты инкрементального обновления: когда закрытые вакансии удаляются, а когда нет.
+
+Данные отдаёт локальный MockHHServer, вакансии пишутся в SQLite в памяти.
+"""
+
+import pytest
+
+from benchmarks.mock_hh_server import MockHHServer
+from src.api import HeadHunterAPI
+from src.config import Config
+from src.models import Employer, Vacancy
+from src.pipeline import run_incremental_sync
+from src.sqlite_manager import SQLiteDBManager
+
+PUBLISHED = '2024-01-01T00:00:00'
+MISSING_ID = 999
+
+
+@pytest.fixture
+def server():
+    """Сервер с двумя работодателями по 30 вакансий, из которых через пагинацию видно 20."""
+    with MockHHServer(employers=2, vacancies_per_employer=30, depth_limit=20) as mock:
+        yield mock
+
+
+@pytest.fixture
+def api(server):
+    """Клиент API тестового сервера с окном пагинации как у сервера."""
+    client = HeadHunterAPI(max_workers=2, requests_per_second=1000, base_url=server.base_url)
+    client.MAX_DEPTH = server.depth_limit
+    return client
+
+
+@pytest.fixture
+def db_manager(monkeypatch):
+    """Менеджер SQLite в памяти, запоминающий вызовы delete_stale_vacancies."""
+    manager = SQLiteDBManager(Config(), ':memory:')
+    manager.create_tables()
+    manager.deleted_for = []
+    delete = manager.delete_stale_vacancies
+
+    def delete_stale_vacancies(employer_id, actual_ids):
+        manager.deleted_for.append(employer_id)
+        return delete(employer_id, actual_ids)
+
+    monkeypatch.setattr(manager, 'delete_stale_vacancies', delete_stale_vacancies)
+    yield manager
+    manager.close()
+
+
+def stale_vacancy(vacancy_id: int, employer_id: int) -> Vacancy:
+    """Вакансия, которой уже нет в выдаче API."""
+    return Vacancy(vacancy_id, employer_id, 'Закрытая вакансия', published_at=PUBLISHED)
+
+
+def test_truncated_relist_keeps_vacancies(server, api, db_manager):
+    """Список, обрезанный окном пагинации, не считается полным; полный - считается."""
+    employers = api.get_employers(server.employer_ids)
+    truncated, complete = (int(emp['id']) for emp in employers)
+    # У второго работодателя открыто ровно столько вакансий, сколько видно через API
+    employers[1]['open_vacancies'] = server.depth_limit
+    db_manager.bulk_insert_employers([Employer(truncated, 'Обрезанный'), Employer(complete, 'Полный')])
+    db_manager.bulk_insert_vacancies([stale_vacancy(1, truncated), stale_vacancy(2, complete)])
+
+    stats = run_incremental_sync(api, db_manager, employers)
+
+    assert stats['failed'] == set()
+    assert db_manager.deleted_for == [complete]
+    assert stats['deleted'] == 1
+    assert db_manager.get_vacancy_counts([truncated, complete]) == {
+        truncated: server.depth_limit + 1, complete: server.depth_limit}
+
+
+def test_empty_relist_keeps_vacancies(api, db_manager):
+    """Пустой список вакансий от API не удаляет сохранённые вакансии."""
+    db_manager.bulk_insert_employers([Employer(MISSING_ID, 'Без вакансий в API')])
+    db_manager.bulk_insert_vacancies([stale_vacancy(1, MISSING_ID), stale_vacancy(2, MISSING_ID)])
+    db_manager.update_sync_state([MISSING_ID])
+    employers = [{'id': str(MISSING_ID), 'name': 'Без вакансий в API', 'open_vacancies': 0}]
+
+    stats = run_incremental_sync(api, db_manager, employers)
+
+    assert stats['reconciled'] == [MISSING_ID]
+    assert db_manager.deleted_for == []
+    assert stats['deleted'] == 0
+    assert db_manager.get_vacancy_counts([MISSING_ID]) == {MISSING_ID: 2}
\ No newline at end of file
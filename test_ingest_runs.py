@@ -0,0 +1,135 @@
+"""
+Тесты возобновляемой загрузки: продолжение по отметкам страниц,
+аренда выполняющегося запуска и очистка старых запусков.
+
+Проверяется на SQLite в памяти; страницы отдаёт локальный MockHHServer.
+"""
+
+import pytest
+import requests
+
+from benchmarks.mock_hh_server import MockHHServer
+from src.api import HeadHunterAPI
+from src.config import Config
+from src.models import Employer
+from src.pipeline import run_checkpointed_pipeline
+from src.sqlite_manager import SQLiteDBManager
+
+EMPLOYER_IDS = [1, 2]
+
+
+@pytest.fixture
+def db_manager():
+    """Менеджер SQLite в памяти."""
+    manager = SQLiteDBManager(Config(), ':memory:')
+    manager.create_tables()
+    yield manager
+    manager.close()
+
+
+def age_run(db_manager, run_id: int, interval: str):
+    """Сдвиг начала запуска и его отметок в прошлое (interval - модификатор datetime)."""
+    db_manager.execute_query("UPDATE ingest_runs SET started_at = datetime('now', ?) WHERE id = ?",
+                             (interval, run_id))
+    db_manager.execute_query("""
+        UPDATE ingest_checkpoints SET completed_at = datetime('now', ?) WHERE run_id = ?
+    """, (interval, run_id))
+
+
+def run_status(db_manager, run_id: int):
+    """Статус запуска или None, если запуск удалён."""
+    rows = db_manager.execute_query('SELECT status FROM ingest_runs WHERE id = ?', (run_id,))
+    return rows[0][0] if rows else None
+
+
+def test_resume_from_checkpointed_pages(db_manager, monkeypatch):
+    """Прерванный запуск продолжается без повторного запроса сохранённых страниц."""
+    with MockHHServer(employers=2, vacancies_per_employer=250) as server:
+        api = HeadHunterAPI(max_workers=2, requests_per_second=1000, base_url=server.base_url)
+        employer_ids = server.employer_ids
+        db_manager.bulk_insert_employers([Employer(emp_id, f'Компания {emp_id}')
+                                          for emp_id in employer_ids])
+        iter_pages = api.iter_vacancy_pages
+
+        def interrupted(*args, **kwargs):
+            for number, page in enumerate(iter_pages(*args, **kwargs)):
+                if number == 3:
+                    raise requests.exceptions.ConnectionError('Соединение прервано')
+                yield page
+
+        monkeypatch.setattr(api, 'iter_vacancy_pages', interrupted)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            run_checkpointed_pipeline(api, db_manager, employer_ids, concurrent=False)
+
+        run_id = db_manager.execute_query('SELECT MAX(id) FROM ingest_runs')[0][0]
+        assert run_status(db_manager, run_id) == 'failed'
+        saved = sum(len(pages) for _, pages in db_manager.get_ingest_checkpoints(run_id).values())
+        assert saved == 3
+
+        monkeypatch.setattr(api, 'iter_vacancy_pages', iter_pages)
+        requests_before = server.stats['requests']
+        stats = run_checkpointed_pipeline(api, db_manager, employer_ids, concurrent=False)
+
+        assert stats['run_id'] == run_id
+        assert stats['resumed'] is True
+        assert stats['skipped_pages'] == saved
+        assert stats['failed'] == set()
+        # По 3 страницы на работодателя, сохранённые не запрашиваются
+        assert server.stats['requests'] - requests_before == 6 - saved
+        assert run_status(db_manager, run_id) == 'completed'
+        assert db_manager.count_rows('vacancies') == 500
+
+
+def test_live_run_is_not_resumed(db_manager):
+    """Запуск, обновлявшийся в пределах аренды, не перехватывается другим процессом."""
+    run_id, resumed = db_manager.start_ingest_run(EMPLOYER_IDS)
+    assert resumed is False
+
+    other_id, resumed = db_manager.start_ingest_run(EMPLOYER_IDS)
+    assert other_id != run_id
+    assert resumed is False
+    assert run_status(db_manager, run_id) == 'running'
+
+
+def test_expired_lease_is_resumed(db_manager):
+    """Запуск упавшего процесса продолжается после истечения аренды."""
+    db_manager.bulk_insert_employers([Employer(emp_id, 'Компания') for emp_id in EMPLOYER_IDS])
+    run_id, _ = db_manager.start_ingest_run(EMPLOYER_IDS)
+    assert db_manager.save_vacancy_page(run_id, 1, 0, 2, [])
+    age_run(db_manager, run_id, f'-{db_manager.config.ingest_lease_minutes + 5} minutes')
+
+    assert db_manager.start_ingest_run(list(reversed(EMPLOYER_IDS))) == (run_id, True)
+    assert db_manager.get_ingest_checkpoints(run_id) == {1: (2, {0})}
+
+
+def test_run_outside_resume_window_is_abandoned(db_manager):
+    """Слишком старый незавершённый запуск не продолжается, а помечается брошенным."""
+    run_id, _ = db_manager.start_ingest_run(EMPLOYER_IDS)
+    db_manager.finish_ingest_run(run_id, 'failed')
+    age_run(db_manager, run_id, f'-{db_manager.config.ingest_resume_hours + 1} hours')
+
+    new_id, resumed = db_manager.start_ingest_run(EMPLOYER_IDS)
+
+    assert (new_id != run_id, resumed) == (True, False)
+    assert run_status(db_manager, run_id) == 'abandoned'
+
+
+def test_old_runs_are_pruned(db_manager):
+    """Запуски старше INGEST_KEEP_DAYS удаляются вместе с отметками, свежие остаются."""
+    db_manager.bulk_insert_employers([Employer(1, 'Компания')])
+    old_id, _ = db_manager.start_ingest_run([1])
+    db_manager.save_vacancy_page(old_id, 1, 0, 1, [])
+    db_manager.finish_ingest_run(old_id)
+    recent_id, _ = db_manager.start_ingest_run([2])
+    db_manager.finish_ingest_run(recent_id)
+    age_run(db_manager, old_id, f'-{db_manager.config.ingest_keep_days + 1} days')
+
+    db_manager.config.ingest_keep_days = 0
+    db_manager.start_ingest_run([3])
+    assert run_status(db_manager, old_id) == 'completed'
+
+    db_manager.config.ingest_keep_days = 30
+    db_manager.start_ingest_run([3])
+    assert run_status(db_manager, old_id) is None
+    assert db_manager.get_ingest_checkpoints(old_id) == {}
+    assert run_status(db_manager, recent_id) == 'completed'
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Тесты плана выполнения в журнале медленных запросов PostgreSQL.
+
+Нужен сервер, доступный по настройкам из окружения (DB_HOST, DB_USER, ...);
+без него тесты пропускаются.
+"""
+
+import psycopg2
+import pytest
+
+from src.config import Config
+from src.instrumentation import QueryMetrics, instrumented_connection
+
+
+@pytest.fixture
+def connection():
+    """Соединение, считающее медленным каждый запрос и получающее его план."""
+    metrics = QueryMetrics(slow_query_ms=1e-6, explain=True)
+    try:
+        conn = psycopg2.connect(connect_timeout=3, connection_factory=instrumented_connection(metrics),
+                                **Config().get_postgres_params())
+    except psycopg2.Error:
+        pytest.skip('PostgreSQL недоступен')
+    with conn.cursor() as cur:
+        # Временные таблицы: счётчик срабатываний триггера и таблица с последовательностью
+        cur.execute("""
+            CREATE TEMP TABLE fired (n INTEGER);
+            CREATE TEMP TABLE items (id SERIAL PRIMARY KEY, name TEXT);
+            CREATE FUNCTION pg_temp.count_insert() RETURNS trigger AS $$
+                BEGIN INSERT INTO fired VALUES (1); RETURN NEW; END $$ LANGUAGE plpgsql;
+            CREATE TRIGGER items_insert BEFORE INSERT ON items
+                FOR EACH ROW EXECUTE FUNCTION pg_temp.count_insert();
+        """)
+    metrics.reset()
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+def test_insert_plan_does_not_repeat_statement(connection):
+    """Для INSERT план берётся без ANALYZE: последовательность и триггер срабатывают один раз."""
+    with connection.cursor() as cur:
+        cur.execute('INSERT INTO items (name) VALUES (%s) RETURNING id', ('a',))
+        assert cur.fetchone()[0] == 1
+        cur.execute('INSERT INTO items (name) VALUES (%s) RETURNING id', ('b',))
+        assert cur.fetchone()[0] == 2
+        cur.execute('SELECT count(*) FROM fired')
+        assert cur.fetchone()[0] == 2
+
+    plans = {entry['operation']: entry['plan'] for entry in connection.metrics.slow_queries()}
+    assert 'Insert on items' in plans['insert']
+    assert 'actual time' not in plans['insert']
+
+
+def test_select_plan_is_analyzed(connection):
+    """Для SELECT план содержит фактическое время выполнения."""
+    with connection.cursor() as cur:
+        cur.execute('SELECT id FROM items WHERE name = %s', ('a',))
+
+    [entry] = connection.metrics.slow_queries()
+    assert entry['operation'] == 'select'
+    assert 'actual time' in entry['plan']
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Тесты пакетной нормализации страниц вакансий из сырых байтов ответа.
+"""
+
+import json
+
+import pytest
+
+from src import fast_json
+from src.normalize import (
+    COLUMNS, column_rows, iter_normalized_batches, normalize_items, normalize_page,
+    normalize_pages, page_count
+)
+from src.utils import prepare_vacancy_data
+
+EMPLOYER_ID = 1
+
+ITEMS = [
+    {'id': '1', 'name': 'Python разработчик', 'snippet': {'requirement': 'Django',
+                                                          'responsibility': 'Писать код'},
+     'salary': {'from': 100000, 'to': 200000, 'currency': 'RUR', 'gross': False},
+     'alternate_url': 'https://hh.ru/vacancy/1', 'published_at': '2024-01-01T10:00:00+0300'},
+    # Без зарплаты и ссылки, описание вместо snippet
+    {'id': '2', 'name': 'Аналитик', 'salary': None, 'description': 'Полное описание',
+     'published_at': '2024-01-02T10:00:00+0300'},
+    # Пустой snippet не заменяет описание
+    {'id': '3', 'name': 'Тестировщик', 'snippet': {}, 'description': 'Описание',
+     'salary': {'from': 1500, 'to': None, 'currency': 'USD', 'gross': True},
+     'alternate_url': 'https://hh.ru/vacancy/3', 'published_at': '2024-01-03T10:00:00+0300'},
+    # snippet без responsibility и зарплата только с верхней границей
+    {'id': '4', 'name': 'DevOps', 'snippet': {'requirement': 'Kubernetes'},
+     'salary': {'from': None, 'to': 300000, 'currency': 'RUR', 'gross': True},
+     'alternate_url': 'https://hh.ru/vacancy/4', 'published_at': '2024-01-04T10:00:00+0300'},
+    # responsibility равно null, валюта без курса
+    {'id': '5', 'name': 'Дизайнер', 'snippet': {'responsibility': None},
+     'salary': {'from': 5000, 'to': 6000, 'currency': 'XXX', 'gross': None},
+     'alternate_url': 'https://hh.ru/vacancy/5', 'published_at': '2024-01-05T10:00:00+0300'},
+]
+
+
+@pytest.fixture
+def raw_page() -> bytes:
+    """Сырой ответ /vacancies с лишними полями, как у hh.ru."""
+    items = [dict(item, address=None, professional_roles=[{'id': '96'}]) for item in ITEMS]
+    page = {'items': items, 'found': len(items), 'pages': 1, 'page': 0, 'per_page': 100}
+    return json.dumps(page, ensure_ascii=False).encode('utf-8')
+
+
+def test_typed_and_untyped_decoding_match(raw_page, monkeypatch):
+    """Типизированный разбор и разбор в словари дают одинаковые колонки."""
+    untyped = normalize_items(json.loads(raw_page)['items'], EMPLOYER_ID)
+    assert fast_json.decode_vacancy_columns(raw_page, EMPLOYER_ID) == untyped
+
+    monkeypatch.setattr(fast_json, 'msgspec', None)
+    assert fast_json.decode_vacancy_columns(raw_page, EMPLOYER_ID) == untyped
+
+
+def test_columns_match_prepare_vacancy_data(raw_page):
+    """Колонки совпадают с построчной подготовкой prepare_vacancy_data."""
+    columns = fast_json.decode_vacancy_columns(raw_page, EMPLOYER_ID)
+
+    assert set(columns) == set(COLUMNS)
+    assert column_rows(columns) == [tuple(prepare_vacancy_data(item, EMPLOYER_ID))
+                                    for item in ITEMS]
+
+def make_page(items, pages: int = 1, **extra) -> bytes:
+    """Сырой ответ /vacancies с заданным полем pages."""
+    page = dict(items=items, found=len(items), pages=pages, page=0, per_page=100, **extra)
+    return json.dumps(page, ensure_ascii=False).encode('utf-8')
+
+
+def test_page_count():
+    """Количество страниц читается из байтов; "pages" внутри строк не мешает."""
+    assert page_count(make_page(ITEMS, pages=7)) == 7
+    assert page_count(b'{"items": [], "pages" : 12}') == 12
+    # Поле pages в начале длинного ответа
+    long_page = json.dumps({'pages': 3, 'items': ITEMS * 20}, ensure_ascii=False).encode('utf-8')
+    assert len(long_page) > 512
+    assert page_count(long_page) == 3
+    quoted = [dict(ITEMS[0], description='"pages": 99')]
+    assert page_count(make_page(quoted, pages=2)) == 2
+    assert page_count(b'{"items": []}') == 0
+
+
+def test_normalize_page(raw_page):
+    """Страница из байтов превращается в колонки с рублёвой зарплатой."""
+    columns = normalize_page(raw_page, EMPLOYER_ID)
+
+    assert columns['id'] == ['1', '2', '3', '4', '5']
+    assert columns['employer_id'] == [EMPLOYER_ID] * 5
+    assert columns['description'] == ['Писать код', 'Полное описание', 'Описание', '', None]
+    assert columns['salary'] == [150000, None, 1500, 300000, 5500]
+    assert columns['salary_rub'][:2] == [150000, None]
+    # Зарплата до вычета налога пересчитывается на руки
+    assert columns['salary_rub'][3] == 261000
+    assert columns['salary_rub'][4] is None
+    assert normalize_page(make_page([]), EMPLOYER_ID) == {name: [] for name in COLUMNS}
+
+
+@pytest.mark.parametrize('processes', [0, 2])
+def test_normalize_pages_keeps_order(processes):
+    """Страницы выдаются в исходном порядке и собираются в пакеты."""
+    pages = [(emp_id, page, make_page([dict(item, id=f'{emp_id}{page}{item["id"]}')
+                                       for item in ITEMS], pages=2))
+             for emp_id in (1, 2) for page in (0, 1)]
+
+    result = list(normalize_pages(iter(pages), processes, in_flight=1))
+
+    assert [(emp_id, page) for emp_id, page, _ in result] == [(1, 0), (1, 1), (2, 0), (2, 1)]
+    assert result[3][2]['id'][0] == '211'
+
+    counts, seen = {}, {}
+    batches = list(iter_normalized_batches(iter(pages), 8, processes, counts, seen))
+    assert [len(batch['id']) for batch in batches] == [10, 10]
+    assert counts == {1: 10, 2: 10}
+    assert seen[2] == {int(f'2{page}{item["id"]}') for page in (0, 1) for item in ITEMS}
@@ -0,0 +1,102 @@
+"""
+Тесты постраничного чтения вакансий по ключу (keyset pagination).
+
+Проверяются оба хранилища: SQLite в памяти и PostgreSQL, если сервер
+доступен по настройкам из окружения (DB_HOST, DB_USER, ...); база
+для теста создаётся и удаляется.
+"""
+
+import psycopg2
+import pytest
+
+from src.config import Config
+from src.db_manager import DBManager
+from src.models import Employer, Vacancy
+from src.sqlite_manager import SQLiteDBManager
+
+PUBLISHED = '2024-01-01T00:00:00'
+TEST_DB_NAME = 'coursework_test_pagination'
+
+EMPLOYERS = [Employer(1, 'Альфа'), Employer(2, 'Бета'), Employer(3, 'Альфа'), Employer(4, 'Гамма')]
+
+# Повторяющиеся зарплаты и вакансии без зарплаты у каждой компании
+SALARIES = {
+    1: [100000, 100000, None, 250000, 100000, None],
+    2: [None, None, None],
+    3: [250000, 100000, None, 300000],
+    4: [50000],
+}
+
+
+def make_vacancies():
+    """Вакансии тестовых работодателей (URL совпадает с ID)."""
+    return [
+        Vacancy(emp_id * 100 + index, emp_id, f'Вакансия {emp_id}-{index}',
+                url=f'u{emp_id * 100 + index}', published_at=PUBLISHED,
+                salary=salary, salary_rub=salary)
+        for emp_id, salaries in SALARIES.items()
+        for index, salary in enumerate(salaries)
+    ]
+
+
+def postgres_manager() -> DBManager:
+    """Менеджер PostgreSQL с отдельной базой для теста (пропуск, если сервер недоступен)."""
+    config = Config()
+    try:
+        psycopg2.connect(connect_timeout=3, **config.get_postgres_params()).close()
+    except psycopg2.Error:
+        pytest.skip('PostgreSQL недоступен')
+    config.db_name = TEST_DB_NAME
+    manager = DBManager(config)
+    manager.drop_database()
+    return manager
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def db_manager(request):
+    """Менеджер с тестовыми данными в каждом из хранилищ."""
+    if request.param == 'sqlite':
+        manager = SQLiteDBManager(Config(), ':memory:')
+    else:
+        manager = postgres_manager()
+    manager.create_tables()
+    manager.bulk_insert_employers(EMPLOYERS)
+    manager.bulk_insert_vacancies(make_vacancies())
+    yield manager
+    if request.param == 'sqlite':
+        manager.close()
+    else:
+        manager.drop_database()
+
+
+def expected_order():
+    """Все вакансии в порядке компания, зарплата по убыванию (без зарплаты - в конце), ID."""
+    names = {emp.id: emp.name for emp in EMPLOYERS}
+    vacancies = sorted(make_vacancies(), key=lambda vac: (
+        names[vac.employer_id], -(vac.salary_rub if vac.salary_rub is not None else -1), vac.id))
+    return [vac.url for vac in vacancies]
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 4, 5, 100])
+def test_pages_have_no_gaps_or_repeats(db_manager, limit):
+    """Страницы вместе дают все вакансии ровно по одному разу в порядке ключа."""
+    urls, key, pages = [], None, 0
+    while True:
+        page, key = db_manager.get_vacancies_page(after=key, limit=limit)
+        assert len(page) <= limit
+        urls.extend(row.url for row in page)
+        pages += 1
+        if key is None:
+            break
+        assert pages <= len(expected_order())
+
+    assert urls == expected_order()
+    assert len(set(urls)) == len(urls)
+
+
+def test_last_full_page_ends_with_empty_page(db_manager):
+    """Если последняя страница заполнена, следующая пуста и ключа не возвращает."""
+    total = len(expected_order())
+    page, key = db_manager.get_vacancies_page(limit=total)
+    assert len(page) == total
+    assert db_manager.get_vacancies_page(after=key, limit=total) == ([], None)
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Тесты встроенного хранилища SQLite.
+
+Перевод запросов psycopg2 в sqlite3, разбор поисковых запросов для FTS5
+и полный цикл работы SQLiteDBManager в памяти.
+"""
+
+import pytest
+
+from src.config import Config
+from src.models import CompanyVacancies, Employer, Vacancy, VacancyInfo
+from src.sqlite_manager import SQLiteDBManager, _translate, fts_query
+
+PUBLISHED = '2024-01-01T00:00:00'
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('SELECT * FROM vacancies WHERE id = %s', 'SELECT * FROM vacancies WHERE id = ?'),
+    ('WHERE id = %s AND employer_id = %s', 'WHERE id = ? AND employer_id = ?'),
+    ('WHERE name = %(name)s OR id > %(id)s', 'WHERE name = :name OR id > :id'),
+    ("WHERE name LIKE '%%python%%'", "WHERE name LIKE '%python%'"),
+    ('SET completed_at = NOW()', 'SET completed_at = CURRENT_TIMESTAMP'),
+    ('SET completed_at = now()', 'SET completed_at = CURRENT_TIMESTAMP'),
+    ("VALUES (%s, '100%%', NOW())", "VALUES (?, '100%', CURRENT_TIMESTAMP)"),
+])
+def test_translate(query, expected):
+    """Параметры и функции PostgreSQL переводятся в синтаксис sqlite3."""
+    assert _translate(query) == expected
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('', None),
+    ('   ', None),
+    ('or', None),
+    ('OR', None),
+    ('-x', None),
+    ('-python -java', None),
+    ('python', '("python"*)'),
+    ('разработчики', '("разработчик"*)'),
+    ('"аналитик данных"', '("аналитик данных")'),
+    ('python or java', '(("python"*) OR ("java"*))'),
+    ('or python', '("python"*)'),
+    ('python -java', '(("python"*)) NOT ("java"*)'),
+    ('python -"java senior"', '(("python"*)) NOT ("java senior")'),
+])
+def test_fts_query(query, expected):
+    """Запрос websearch_to_tsquery переводится в FTS5; пустой - в None."""
+    assert fts_query(query) == expected
+
+
+@pytest.fixture
+def db_manager():
+    """Менеджер SQLite в памяти с двумя работодателями и четырьмя вакансиями."""
+    manager = SQLiteDBManager(Config(), ':memory:')
+    manager.create_tables()
+    manager.bulk_insert_employers([Employer(1, 'Альфа'), Employer(2, 'Бета')])
+    manager.bulk_insert_vacancies([
+        Vacancy(1, 1, 'Python разработчик', 'Пишем бэкенд на Django', 100000,
+                'u1', PUBLISHED, salary_rub=100000),
+        Vacancy(2, 1, 'Аналитик данных', 'SQL и Python', 150000,
+                'u2', PUBLISHED, salary_rub=150000),
+        Vacancy(3, 2, 'Тестировщик', 'Ручное тестирование', None, 'u3', PUBLISHED),
+        Vacancy(4, 2, 'Java разработчик', 'Spring', 200000,
+                'u4', PUBLISHED, salary_rub=200000),
+    ])
+    yield manager
+    manager.close()
+
+
+def test_pages_cover_all_vacancies(db_manager):
+    """Постраничное чтение идёт по ключу без пропусков; вакансии без зарплаты - в конце."""
+    first, key = db_manager.get_vacancies_page(limit=3)
+    assert [row.vacancy for row in first] == ['Аналитик данных', 'Python разработчик',
+                                              'Java разработчик']
+    assert key == ('Бета', 200000, 4)
+
+    second, key = db_manager.get_vacancies_page(after=key, limit=3)
+    assert second == [VacancyInfo('Бета', 'Тестировщик', None, 'u3')]
+    assert key is None
+
+
+def test_search(db_manager):
+    """Поиск по основе слова, фразе и с исключением; совпадение в названии выше."""
+    assert [row.vacancy for row in db_manager.search_vacancies('python')] == [
+        'Python разработчик', 'Аналитик данных']
+    assert [row.vacancy for row in db_manager.search_vacancies('разработчики -java')] == [
+        'Python разработчик']
+    assert [row.vacancy for row in db_manager.search_vacancies('"аналитик данных"')] == [
+        'Аналитик данных']
+    assert db_manager.search_vacancies('-python') == []
+    assert [row.vacancy for row in db_manager.search_vacancies('python', limit=1, offset=1)] == [
+        'Аналитик данных']
+
+
+def test_analytics(db_manager):
+    """Агрегаты по зарплатам учитывают только вакансии с зарплатой."""
+    assert db_manager.get_companies_and_vacancies_count() == [
+        CompanyVacancies('Альфа', 2), CompanyVacancies('Бета', 2)]
+    assert db_manager.get_avg_salary() == 150000
+    assert db_manager.get_vacancies_with_higher_salary() == [
+        VacancyInfo('Бета', 'Java разработчик', 200000, 'u4')]
+    assert db_manager.get_salary_percentiles((0.5,)) == (150000,)
+
+    histogram = db_manager.get_salary_histogram(buckets=2)
+    assert histogram.edges == (100000, 150000, 200000)
+    assert histogram.counts == (1, 2)
+
+
+def test_statistics_follow_writes(db_manager):
+    """Аналитика и поиск видят данные, записанные после первого чтения."""
+    assert db_manager.get_avg_salary() == 150000
+    db_manager.bulk_insert_vacancies([
+        Vacancy(5, 2, 'Python тимлид', '', 350000, 'u5', PUBLISHED, salary_rub=350000)])
+
+    assert db_manager.get_avg_salary() == 200000
+    assert dict(db_manager.get_companies_and_vacancies_count()) == {'Альфа': 2, 'Бета': 3}
+    assert 'Python тимлид' in [row.vacancy for row in db_manager.search_vacancies('тимлид')]
+
+    assert db_manager.delete_stale_vacancies(2, [3, 4]) == 1
+    assert db_manager.get_avg_salary() == 150000
+    assert db_manager.search_vacancies('тимлид') == []
\ No newline at end of file
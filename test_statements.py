@@ -0,0 +1,86 @@
+"""
+Тесты перевода параметров psycopg2 в параметры PREPARE и выполнения по имени.
+"""
+
+import pytest
+
+from src.statements import StatementCache, to_server_params
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('SELECT 1', ('SELECT 1', [])),
+    ('WHERE id = %s', ('WHERE id = $1', [0])),
+    ('VALUES (%s, %s, %s)', ('VALUES ($1, $2, $3)', [0, 1, 2])),
+    # Один и тот же именованный параметр - одна позиция
+    ('WHERE name > %(name)s OR (name = %(name)s AND id > %(id)s) LIMIT %(limit)s',
+     ('WHERE name > $1 OR (name = $1 AND id > $2) LIMIT $3', ['name', 'id', 'limit'])),
+    ('LIMIT %(limit)s) UNION ALL (SELECT 1 LIMIT %(limit)s)',
+     ('LIMIT $1) UNION ALL (SELECT 1 LIMIT $1)', ['limit'])),
+    # %% - литерал процента, а не параметр
+    ("WHERE name LIKE '%%python%%'", ("WHERE name LIKE '%python%'", [])),
+    ("WHERE name LIKE '%%s' AND id = %s", ("WHERE name LIKE '%s' AND id = $1", [0])),
+    ("SELECT '100%%', %s, '%%', %s", ("SELECT '100%', $1, '%', $2", [0, 1])),
+    ("WHERE a = %(a)s AND b LIKE '%%%(a)s'", ("WHERE a = $1 AND b LIKE '%$1'", ['a'])),
+])
+def test_to_server_params(query, expected):
+    """Параметры нумеруются по первому появлению, %% становится %."""
+    assert to_server_params(query) == expected
+
+
+class FakeCursor:
+    """Курсор, запоминающий выполненные команды."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 1
+        self.calls = []
+
+    def execute(self, query, params=None):
+        self.calls.append((query, params))
+
+
+class FakeConnection:
+    """Соединение, на котором кэш запоминает подготовленные выражения."""
+
+
+def test_execute_passes_named_params_in_prepare_order():
+    """EXECUTE получает значения в порядке позиций $n, повторяющиеся - один раз."""
+    cache = StatementCache()
+    cursor = FakeCursor(FakeConnection())
+    query = 'SELECT * FROM t WHERE a = %(a)s OR b = %(b)s OR c = %(a)s'
+
+    cache.execute(cursor, 'by_name', query, {'b': 2, 'a': 1, 'unused': 3})
+    cache.execute(cursor, 'by_name', query, {'a': 10, 'b': 20})
+
+    assert cursor.calls == [
+        ('SAVEPOINT prepare_statement', None),
+        ('PREPARE by_name AS SELECT * FROM t WHERE a = $1 OR b = $2 OR c = $1', None),
+        ('RELEASE SAVEPOINT prepare_statement', None),
+        ('EXECUTE by_name (%s, %s)', [1, 2]),
+        ('EXECUTE by_name (%s, %s)', [10, 20]),
+    ]
+    assert cache.stats()['by_name']['executions'] == 2
+
+
+def test_execute_positional_and_without_params():
+    """Позиционные параметры передаются как есть; запрос без параметров - без скобок."""
+    cache = StatementCache()
+    cursor = FakeCursor(FakeConnection())
+
+    cache.execute(cursor, 'positional', "SELECT %s, '%%', %s", (1, 2))
+    cache.execute(cursor, 'constant', 'SELECT 1')
+
+    assert ('EXECUTE positional (%s, %s)', [1, 2]) in cursor.calls
+    assert ("PREPARE positional AS SELECT $1, '%', $2", None) in cursor.calls
+    assert cursor.calls[-1] == ('EXECUTE constant', None)
+
+
+def test_execute_without_prepare():
+    """С отключённой подготовкой запрос выполняется как есть."""
+    cache = StatementCache(prepare=False)
+    cursor = FakeCursor(FakeConnection())
+
+    cache.execute(cursor, 'plain', 'SELECT %(a)s', {'a': 1})
+
+    assert cursor.calls == [('SELECT %(a)s', {'a': 1})]
+    assert cache.stats()['plain']['prepared'] is False
\ No newline at end of file
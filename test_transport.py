@@ -0,0 +1,244 @@
+"""
+Тесты транспортного слоя: повторы, Retry-After, выключатель и подстройка частоты.
+
+Запросы идут к локальному MockHHServer, поэтому доступ к сети не нужен.
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from benchmarks.mock_hh_server import MockHHServer, _Throttle
+from src.transport import (
+    CircuitBreaker, CircuitOpenError, RateLimitedAdapter, RetryAdapter, TokenBucket,
+    parse_retry_after
+)
+
+
+@pytest.fixture
+def server():
+    """Тестовый сервер hh.ru без задержек."""
+    with MockHHServer(employers=1, vacancies_per_employer=10) as mock:
+        yield mock
+
+
+def make_session(server: MockHHServer, limiter: TokenBucket = None, **kwargs):
+    """Сессия с теми же адаптерами, что у HeadHunterAPI, без пауз между повторами."""
+    limiter = limiter or TokenBucket(1000)
+    kwargs.setdefault('backoff_base', 0)
+    adapter = RetryAdapter(RateLimitedAdapter(limiter), limiter, **kwargs)
+    session = requests.Session()
+    session.mount(server.base_url, adapter)
+    return session, adapter
+
+
+def test_parse_retry_after():
+    """Retry-After в секундах и в формате даты HTTP."""
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('не число') is None
+    moment = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(moment) <= 30
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(minutes=5), usegmt=True)
+    assert parse_retry_after(past) == 0.0
+
+
+def test_5xx_retried_until_limit(server):
+    """Ответ 503 повторяется max_retries раз, затем возвращается вызывающему."""
+    server.error_rate = 1.0
+    session, adapter = make_session(server, max_retries=3,
+                                    breaker=CircuitBreaker(failure_threshold=100))
+
+    response = session.get(f'{server.base_url}vacancies')
+
+    assert response.status_code == 503
+    assert server.stats['requests'] == 4
+    stats = adapter.stats.snapshot()
+    assert stats['requests'] == 1
+    assert stats['attempts'] == 4
+    assert stats['retries'] == 3
+    assert stats['failures'] == 4
+
+
+def test_5xx_retry_recovers(server):
+    """После случайных ошибок 503 запрос всё же завершается успешно."""
+    server.error_rate = 0.5
+    session, adapter = make_session(server, max_retries=20,
+                                    breaker=CircuitBreaker(failure_threshold=100))
+
+    for _ in range(5):
+        assert session.get(f'{server.base_url}employers/{server.employer_ids[0]}').status_code == 200
+
+    assert server.stats['errors'] > 0
+    assert adapter.stats.snapshot()['retries'] == server.stats['errors']
+
+
+def test_429_honours_retry_after(server):
+    """Ответ 429 повторяется через время из Retry-After, а не сразу."""
+    server._throttle = _Throttle(1)
+    server.retry_after = 1
+    session, adapter = make_session(server, max_retries=3)
+    url = f'{server.base_url}employers/{server.employer_ids[0]}'
+
+    assert session.get(url).status_code == 200
+    started = time.monotonic()
+    response = session.get(url)
+    elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    assert elapsed >= 0.9
+    assert server.stats['throttled'] == 1
+    assert adapter.stats.snapshot()['throttled'] == 1
+    assert adapter.stats.snapshot()['retries'] == 1
+
+
+def test_non_get_not_retried(server):
+    """Неидемпотентный запрос не повторяется даже при ответе 503."""
+    server.error_rate = 1.0
+    session, adapter = make_session(server, max_retries=5)
+
+    response = session.post(f'{server.base_url}vacancies', data=b'{}')
+
+    assert response.status_code == 503
+    assert server.stats['requests'] == 1
+    assert adapter.stats.snapshot()['retries'] == 0
+
+
+def test_breaker_opens_and_rejects_without_request(server):
+    """После серии ошибок запросы отклоняются сразу, не доходя до сервера."""
+    server.error_rate = 1.0
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    session, adapter = make_session(server, max_retries=0, breaker=breaker)
+    url = f'{server.base_url}vacancies'
+
+    for _ in range(3):
+        assert session.get(url).status_code == 503
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened == 1
+
+    with pytest.raises(CircuitOpenError):
+        session.get(url)
+    assert server.stats['requests'] == 3
+    assert adapter.stats.snapshot()['rejected'] == 1
+
+
+def test_breaker_half_open_single_trial(server):
+    """После reset_timeout пропускается один пробный запрос; успех замыкает выключатель."""
+    server.error_rate = 1.0
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    session, _ = make_session(server, max_retries=0, breaker=breaker)
+    url = f'{server.base_url}employers/{server.employer_ids[0]}'
+
+    for _ in range(2):
+        session.get(url)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.25)
+    # Пока пробный запрос не завершён, остальные отклоняются
+    assert breaker.allow() is True
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is False
+
+    # Неудачная проба снова размыкает выключатель
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened == 2
+    with pytest.raises(CircuitOpenError):
+        session.get(url)
+
+    time.sleep(0.25)
+    server.error_rate = 0.0
+    assert session.get(url).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_429_does_not_close_half_open_breaker(server):
+    """Ответ 429 на пробный запрос не замыкает выключатель, но позволяет новую пробу."""
+    server.error_rate = 1.0
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    session, _ = make_session(server, max_retries=0, breaker=breaker)
+    url = f'{server.base_url}employers/{server.employer_ids[0]}'
+    for _ in range(2):
+        session.get(url)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.25)
+    server.error_rate = 0.0
+    server._throttle = _Throttle(1)
+    server._throttle.allow()
+    assert session.get(url).status_code == 429
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.failures == 2
+
+    server._throttle = None
+    assert session.get(url).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_429_does_not_reset_failure_count(server):
+    """Ответ 429 между ошибками не прерывает их серию."""
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    session, _ = make_session(server, max_retries=0, breaker=breaker)
+    url = f'{server.base_url}employers/{server.employer_ids[0]}'
+
+    server.error_rate = 1.0
+    for _ in range(2):
+        assert session.get(url).status_code == 503
+    server.error_rate = 0.0
+    server._throttle = _Throttle(1)
+    server._throttle.allow()
+    assert session.get(url).status_code == 429
+    assert breaker.failures == 2
+
+    server._throttle = None
+    server.error_rate = 1.0
+    assert session.get(url).status_code == 503
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_429_halves_rate_and_success_restores_it(server):
+    """Каждый ответ 429 вдвое снижает частоту, успешные ответы возвращают её к максимуму."""
+    server._throttle = _Throttle(1)
+    server.retry_after = 0
+    limiter = TokenBucket(40)
+    session, _ = make_session(server, limiter, max_retries=0, min_rate=8)
+    url = f'{server.base_url}employers/{server.employer_ids[0]}'
+
+    assert session.get(url).status_code == 200
+    assert limiter.rate == 40
+    assert session.get(url).status_code == 429
+    assert limiter.rate == 20
+    assert session.get(url).status_code == 429
+    assert limiter.rate == 10
+    assert session.get(url).status_code == 429
+    # Частота не опускается ниже min_rate
+    assert limiter.rate == 8
+
+    server._throttle = None
+    for _ in range(10):
+        assert session.get(url).status_code == 200
+    assert limiter.rate == pytest.approx(9.0)
+
+    # Восстановление останавливается на исходной частоте
+    limiter.set_rate(39.85)
+    for _ in range(3):
+        assert session.get(url).status_code == 200
+    assert limiter.rate == 40
+
+
+def test_token_bucket_limits_rate():
+    """Ограничитель выдерживает заданную частоту после исчерпания запаса."""
+    limiter = TokenBucket(20, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - started >= 5 / 20 * 0.9
+
+    with pytest.raises(ValueError):
+        TokenBucket(0)
\ No newline at end of file